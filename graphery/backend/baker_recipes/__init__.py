@@ -1,5 +1,11 @@
 from __future__ import annotations
 
+from model_bakery import generators, random_gen
+
+from ..models import GrapheryJSONField
+
+generators.add(GrapheryJSONField, random_gen.gen_json)
+
 from .user_recipe import *
 from .tag_recipe import *
 from .tutorial_recipe import *
@@ -0,0 +1,602 @@
+from __future__ import annotations
+
+import random
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Type
+from uuid import UUID
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import models, transaction
+
+from . import EMAIL_SUFFIX, USER_PASSWORD
+from ..graph_format import encode_compact, normalize_graph_json
+from ..models import (
+    Code,
+    ExecutionResult,
+    ExecutionResultSegment,
+    Graph,
+    GraphAnchor,
+    GraphDescription,
+    LangCode,
+    OrderedAnchorTable,
+    PublishedGraphDescription,
+    PublishedTutorial,
+    Status,
+    Tag,
+    TagAnchor,
+    Tutorial,
+    TutorialAnchor,
+    User,
+    UserRoles,
+    make_delta,
+)
+from ..models.version_storage import DeltaType, delta_size
+
+__all__ = [
+    "anchor_rank",
+    "free_anchor_ranks",
+    "random_graph_json",
+    "random_execution_steps",
+    "make_scale_example",
+]
+
+_RANK_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+# most of the users are readers, like on the site
+_ROLE_WEIGHTS = {
+    UserRoles.READER: 80,
+    UserRoles.VISITOR: 5,
+    UserRoles.TRANSLATOR: 5,
+    UserRoles.AUTHOR: 7,
+    UserRoles.EDITOR: 2,
+    UserRoles.ADMINISTRATOR: 1,
+}
+_CODE_TEMPLATE = """\
+def {name}(graph):
+    visited = set()
+    for node in graph.nodes:
+        if node not in visited:
+            visited.add(node)
+            for edge in graph.edges_of(node):
+                print(edge)
+    return len(visited) * {factor}
+"""
+
+
+def anchor_rank(index: int) -> str:
+    """
+    the rank of the anchor at an index, which keeps the order of the indices
+    :param index: less than 36 ** 3
+    :return:
+    """
+    return "".join(_RANK_DIGITS[index // 36**i % 36] for i in reversed(range(3)))
+
+
+def random_graph_json(
+    rand: random.Random, node_count: int, edge_count: int
+) -> Dict[str, Any]:
+    """
+    an undirected graph in the graphology format the frontend exports
+    :param rand:
+    :param node_count:
+    :param edge_count: the most edges, fewer are made when the graph is full
+    :return:
+    """
+    nodes = [f"v_{i}" for i in range(node_count)]
+    edges = {
+        tuple(sorted(rand.sample(nodes, 2)))
+        for _ in range(edge_count)
+        if node_count > 1
+    }
+    return {
+        "attributes": {},
+        "options": {"allowSelfLoops": True, "type": "undirected", "multi": False},
+        "nodes": [
+            {
+                "key": node,
+                "attributes": {
+                    "id": node,
+                    "name": node,
+                    "displayed": {},
+                    "x": rand.uniform(-1, 1),
+                    "y": rand.uniform(-1, 1),
+                    "size": 10,
+                },
+            }
+            for node in nodes
+        ],
+        "edges": [
+            {
+                "key": f"{source}->{target}",
+                "source": source,
+                "target": target,
+                "attributes": {
+                    "id": f"e_{i}",
+                    "name": f"{source}-{target}",
+                    "source": source,
+                    "target": target,
+                    "displayed": {},
+                },
+            }
+            for i, (source, target) in enumerate(sorted(edges))
+        ],
+    }
+
+
+def random_execution_steps(
+    rand: random.Random, nodes: Sequence[str], step_count: int
+) -> List[Dict[str, Any]]:
+    """
+    a synthetic trace of the executor, which visits the nodes of a graph
+    :param rand:
+    :param nodes: the keys of the nodes of the graph
+    :param step_count:
+    :return:
+    """
+    return [
+        {
+            "line": rand.randint(1, 8),
+            "variables": {
+                "node": {"type": "Node", "repr": rand.choice(nodes) if nodes else ""},
+                "visited": {"type": "Number", "repr": str(step)},
+            },
+            "accesses": None,
+            "stdout": None,
+        }
+        for step in range(step_count)
+    ]
+
+
+def _markdown(rand: random.Random, paragraphs: int) -> str:
+    return "\n\n".join(
+        f"## section {i}\n\n"
+        + " ".join(f"word{rand.randint(0, 999)}" for _ in range(rand.randint(40, 120)))
+        for i in range(paragraphs)
+    )
+
+
+def _edited_markdown(rand: random.Random, markdown: str) -> str:
+    """
+    the markdown with the words of one of its sections written again
+    """
+    lines = markdown.split("\n")
+    paragraph = rand.choice(
+        [i for i, line in enumerate(lines) if line and not line.startswith("## ")]
+    )
+    lines[paragraph] = " ".join(
+        f"word{rand.randint(0, 999)}" for _ in range(rand.randint(40, 120))
+    )
+    return "\n".join(lines)
+
+
+def _compacted_versions(
+    texts: Sequence[Dict[str, str]]
+) -> Dict[int, Dict[str, DeltaType]]:
+    """
+    the deltas of the versions of a chain which editing would have compacted.
+    like `compact_version_chain`, the head, the version behind it
+    and a snapshot every GRAPHERY_VERSION_SNAPSHOT_INTERVAL versions stay full,
+    and a version is only compacted when its delta is smaller than its text
+    :param texts: the full texts of the versions, newest first
+    :return: the deltas by the index of the version
+    """
+    interval = settings.GRAPHERY_VERSION_SNAPSHOT_INTERVAL
+    deltas = {}
+    run_length = 0
+    # the oldest version is compacted first, like editing does
+    for index in reversed(range(2, len(texts))):
+        delta = {
+            field_name: make_delta(texts[index - 1][field_name], text)
+            for field_name, text in texts[index].items()
+        }
+        if run_length + 1 < interval and delta_size(delta) < sum(
+            map(len, texts[index].values())
+        ):
+            deltas[index] = delta
+            run_length += 1
+        else:
+            run_length = 0
+    return deltas
+
+
+def _bulk_create(
+    model_cls: Type[models.Model], objects: Iterable[models.Model], batch_size: int
+) -> int:
+    """
+    create the objects in batches, without holding more than a batch in memory
+    :return: the number of objects created
+    """
+    count = 0
+    objects = iter(objects)
+    while batch := list(islice(objects, batch_size)):
+        model_cls.objects.bulk_create(batch)
+        count += len(batch)
+    return count
+
+
+def free_anchor_ranks(count: int) -> Iterator[str]:
+    """
+    ranks no tutorial anchor has, in order
+    :param count: the number of ranks
+    :return:
+    :raise ValueError: when there are not so many free ranks
+    """
+    used = set(TutorialAnchor.objects.values_list("rank", flat=True))
+    ranks = (
+        rank for index in range(36**3) if (rank := anchor_rank(index)) not in used
+    )
+    ranks = list(islice(ranks, count))
+    if len(ranks) < count:
+        raise ValueError("there are not enough free ranks for the tutorial anchors")
+    return iter(ranks)
+
+
+@transaction.atomic
+def make_scale_example(
+    *,
+    prefix: str = "scale",
+    seed: int = 0,
+    users: int = 100,
+    tag_anchors: int = 30,
+    tutorial_anchors: int = 200,
+    graph_anchors: int = 300,
+    langs: Sequence[str] = (LangCode.EN, LangCode.ZH_HANS),
+    versions: int = 5,
+    nodes: int = 200,
+    edges: int = 600,
+    steps: int = 200,
+    batch_size: int = 500,
+) -> Dict[str, int]:
+    """
+    make data at the scale of the site with bulk_create and no executor.
+    the same seed makes the same data, other than the times.
+    every tutorial anchor has a version chain in every language,
+    and a code with synthetic results on the graphs of the tutorial.
+    :param prefix: the names and urls start with it
+    :param seed: the seed of the random data
+    :param users:
+    :param tag_anchors:
+    :param tutorial_anchors:
+    :param graph_anchors:
+    :param langs: the languages of the tags, tutorials and graph descriptions
+    :param versions: the versions of the tutorial chains
+    :param nodes: the most nodes in a graph
+    :param edges: the most edges in a graph
+    :param steps: the most steps in a result
+    :param batch_size: the rows in a bulk insert
+    :return: the number of rows made of each model
+    """
+    rand = random.Random(seed)
+    # the ids are drawn apart from the data, so that the same data
+    # can be made again with another prefix
+    id_rand = random.Random(f"{prefix}-{seed}")
+    counts: Dict[str, int] = {}
+
+    def new_id() -> UUID:
+        return UUID(int=id_rand.getrandbits(128), version=4)
+
+    def create(model_cls: Type[models.Model], objects: Iterable[models.Model]):
+        counts[model_cls.__name__] = counts.get(model_cls.__name__, 0) + _bulk_create(
+            model_cls, objects, batch_size
+        )
+
+    # the hash is made once, since hashing a password on purpose takes long
+    password = make_password(USER_PASSWORD)
+    roles, weights = zip(*_ROLE_WEIGHTS.items())
+    user_ids = [new_id() for _ in range(users)]
+    create(
+        User,
+        (
+            User(
+                id=user_id,
+                username=f"{prefix}_user_{i}",
+                email=f"{prefix}_user_{i}{EMAIL_SUFFIX}",
+                password=password,
+                displayed_name=f"{prefix} user {i}",
+                role=rand.choices(roles, weights)[0],
+                verification_key=None,
+            )
+            for i, user_id in enumerate(user_ids)
+        ),
+    )
+    writer_ids = user_ids[: max(users // 5, 1)]
+
+    tag_anchor_ids = [new_id() for _ in range(tag_anchors)]
+    create(
+        TagAnchor,
+        (
+            TagAnchor(
+                id=tag_anchor_id,
+                anchor_name=f"{prefix} tag {i}",
+                item_status=Status.PUBLISHED,
+            )
+            for i, tag_anchor_id in enumerate(tag_anchor_ids)
+        ),
+    )
+    create(
+        Tag,
+        (
+            Tag(
+                id=new_id(),
+                tag_anchor_id=tag_anchor_id,
+                lang_code=lang,
+                name=f"{prefix} tag {i} {lang}",
+                item_status=Status.PUBLISHED,
+            )
+            for i, tag_anchor_id in enumerate(tag_anchor_ids)
+            for lang in langs
+        ),
+    )
+
+    def tag_rows(through: Type[models.Model], field_name: str, anchor_ids):
+        return (
+            through(**{f"{field_name}_id": anchor_id, "taganchor_id": tag_anchor_id})
+            for anchor_id in anchor_ids
+            for tag_anchor_id in rand.sample(tag_anchor_ids, min(2, tag_anchors))
+        )
+
+    ranks = free_anchor_ranks(tutorial_anchors)
+    tutorial_anchor_ids = [new_id() for _ in range(tutorial_anchors)]
+    create(
+        TutorialAnchor,
+        (
+            TutorialAnchor(
+                id=tutorial_anchor_id,
+                url=f"{prefix}-tutorial-{i}",
+                anchor_name=f"{prefix} tutorial {i}",
+                rank=next(ranks),
+                item_status=Status.PUBLISHED if rand.random() < 0.9 else Status.DRAFT,
+            )
+            for i, tutorial_anchor_id in enumerate(tutorial_anchor_ids)
+        ),
+    )
+    create(
+        TutorialAnchor.tag_anchors.through,
+        tag_rows(
+            TutorialAnchor.tag_anchors.through, "tutorialanchor", tutorial_anchor_ids
+        ),
+    )
+
+    # the chains are newest first, with a draft on top of some of them
+    # and the newest version under the draft published
+    published_tutorials: List[Tutorial] = []
+    tutorial_authors = []
+
+    def tutorial_chains() -> Iterator[Tutorial]:
+        for i, tutorial_anchor_id in enumerate(tutorial_anchor_ids):
+            for lang in langs:
+                has_draft = versions > 1 and rand.random() < 0.3
+                published_index = 1 if has_draft else 0
+                ids = [new_id() for _ in range(versions)]
+                # every older version is an edit of the one in front of it
+                texts = [
+                    {
+                        "title": f"{prefix} tutorial {i} in {lang}",
+                        "abstract": _markdown(rand, 1),
+                        "content_markdown": _markdown(rand, rand.randint(4, 12)),
+                    }
+                ]
+                for _ in range(versions - 1):
+                    texts.append(
+                        {
+                            **texts[-1],
+                            "content_markdown": _edited_markdown(
+                                rand, texts[-1]["content_markdown"]
+                            ),
+                        }
+                    )
+                compacted = _compacted_versions(texts)
+
+                for index, tutorial_id in enumerate(ids):
+                    if has_draft and index == 0:
+                        status = Status.DRAFT
+                    elif index == published_index:
+                        status = Status.PUBLISHED
+                    else:
+                        status = Status.CLOSED
+                    tutorial = Tutorial(
+                        id=tutorial_id,
+                        tutorial_anchor_id=tutorial_anchor_id,
+                        lang_code=lang,
+                        back_id=ids[index + 1] if index + 1 < versions else None,
+                        edited_by_id=rand.choice(writer_ids),
+                        item_status=status,
+                        version_delta=compacted.get(index),
+                        **(
+                            dict.fromkeys(texts[index], "")
+                            if index in compacted
+                            else texts[index]
+                        ),
+                    )
+                    if status == Status.PUBLISHED:
+                        published_tutorials.append(tutorial)
+                    tutorial_authors.append(
+                        Tutorial.authors.through(
+                            tutorial_id=tutorial.id, user_id=tutorial.edited_by_id
+                        )
+                    )
+                    yield tutorial
+
+    create(Tutorial, tutorial_chains())
+    create(Tutorial.authors.through, tutorial_authors)
+    create(
+        PublishedTutorial,
+        (
+            PublishedTutorial(
+                id=new_id(),
+                tutorial_anchor_id=tutorial.tutorial_anchor_id,
+                tutorial_id=tutorial.id,
+                lang_code=tutorial.lang_code,
+                title=tutorial.title,
+                abstract=tutorial.abstract,
+                content_markdown=tutorial.content_markdown,
+            )
+            for tutorial in published_tutorials
+        ),
+    )
+
+    code_ids = [new_id() for _ in range(tutorial_anchors)]
+    create(
+        Code,
+        (
+            Code(
+                id=code_id,
+                tutorial_anchor_id=tutorial_anchor_id,
+                name=f"{prefix}-code-{i}",
+                code=_CODE_TEMPLATE.format(name=f"tutorial_{i}", factor=i),
+            )
+            for i, (code_id, tutorial_anchor_id) in enumerate(
+                zip(code_ids, tutorial_anchor_ids)
+            )
+        ),
+    )
+
+    graph_anchor_ids = [new_id() for _ in range(graph_anchors)]
+    create(
+        GraphAnchor,
+        (
+            GraphAnchor(
+                id=graph_anchor_id,
+                url=f"{prefix}-graph-{i}",
+                anchor_name=f"{prefix} graph {i}",
+                item_status=Status.PUBLISHED,
+            )
+            for i, graph_anchor_id in enumerate(graph_anchor_ids)
+        ),
+    )
+    create(
+        GraphAnchor.tag_anchors.through,
+        tag_rows(GraphAnchor.tag_anchors.through, "graphanchor", graph_anchor_ids),
+    )
+
+    # the graphs of every tutorial, which its code has results on
+    tutorial_graphs = {
+        tutorial_anchor_id: rand.sample(
+            graph_anchor_ids, min(rand.randint(1, 3), graph_anchors)
+        )
+        for tutorial_anchor_id in tutorial_anchor_ids
+    }
+    create(
+        OrderedAnchorTable,
+        (
+            OrderedAnchorTable(
+                id=new_id(),
+                tutorial_anchor_id=tutorial_anchor_id,
+                graph_anchor_id=graph_anchor_id,
+                order=order,
+            )
+            for tutorial_anchor_id, graph_ids in tutorial_graphs.items()
+            for order, graph_anchor_id in enumerate(graph_ids)
+        ),
+    )
+
+    graph_nodes: Dict[UUID, List[str]] = {}
+    graph_makers = []
+
+    def graphs() -> Iterator[Graph]:
+        for graph_anchor_id in graph_anchor_ids:
+            graph_json, graph_meta = normalize_graph_json(
+                random_graph_json(
+                    rand,
+                    node_count=rand.randint(max(nodes // 10, 2), max(nodes, 2)),
+                    edge_count=rand.randint(edges // 10, edges),
+                )
+            )
+            graph_nodes[graph_anchor_id] = [node["key"] for node in graph_json["nodes"]]
+            graph = Graph(
+                id=new_id(),
+                graph_anchor_id=graph_anchor_id,
+                graph_meta=graph_meta,
+                item_status=Status.PUBLISHED,
+            )
+            if graph_meta["node_count"] >= settings.GRAPHERY_GRAPH_COMPACT_MIN_NODES:
+                graph.graph_compact = encode_compact(graph_json)
+            else:
+                graph.graph_json = graph_json
+            graph_makers.append(
+                Graph.makers.through(graph_id=graph.id, user_id=rand.choice(writer_ids))
+            )
+            yield graph
+
+    create(Graph, graphs())
+    create(Graph.makers.through, graph_makers)
+
+    published_descriptions: List[GraphDescription] = []
+
+    def graph_descriptions() -> Iterator[GraphDescription]:
+        for i, graph_anchor_id in enumerate(graph_anchor_ids):
+            for lang in langs:
+                description = GraphDescription(
+                    id=new_id(),
+                    graph_anchor_id=graph_anchor_id,
+                    lang_code=lang,
+                    edited_by_id=rand.choice(writer_ids),
+                    title=f"{prefix} graph {i} in {lang}",
+                    description_markdown=_markdown(rand, 2),
+                    item_status=Status.PUBLISHED,
+                )
+                published_descriptions.append(description)
+                yield description
+
+    create(GraphDescription, graph_descriptions())
+    create(
+        GraphDescription.authors.through,
+        (
+            GraphDescription.authors.through(
+                graphdescription_id=description.id, user_id=description.edited_by_id
+            )
+            for description in published_descriptions
+        ),
+    )
+    create(
+        PublishedGraphDescription,
+        (
+            PublishedGraphDescription(
+                id=new_id(),
+                graph_anchor_id=description.graph_anchor_id,
+                graph_description_id=description.id,
+                lang_code=description.lang_code,
+                title=description.title,
+                description_markdown=description.description_markdown,
+            )
+            for description in published_descriptions
+        ),
+    )
+
+    # the results are made with their segments a batch at a time,
+    # since the steps are the bulk of the data
+    segment_size = settings.GRAPHERY_EXECUTION_RESULT_SEGMENT_STEPS
+    pairs = (
+        (code_id, graph_anchor_id)
+        for code_id, tutorial_anchor_id in zip(code_ids, tutorial_anchor_ids)
+        for graph_anchor_id in tutorial_graphs[tutorial_anchor_id]
+    )
+    while batch := list(islice(pairs, batch_size)):
+        results, segments = [], []
+        for code_id, graph_anchor_id in batch:
+            result_steps = random_execution_steps(
+                rand, graph_nodes[graph_anchor_id], rand.randint(1, max(steps, 1))
+            )
+            result = ExecutionResult(
+                id=new_id(),
+                code_id=code_id,
+                graph_anchor_id=graph_anchor_id,
+                result_json={},
+                result_json_meta={"version": "synthetic"},
+                step_count=len(result_steps),
+            )
+            results.append(result)
+            segments.extend(
+                ExecutionResultSegment(
+                    id=new_id(),
+                    execution_result_id=result.id,
+                    start_step=start,
+                    step_count=len(result_steps[start : start + segment_size]),
+                    steps=result_steps[start : start + segment_size],
+                )
+                for start in range(0, len(result_steps), segment_size)
+            )
+        create(ExecutionResult, results)
+        create(ExecutionResultSegment, segments)
+
+    return counts
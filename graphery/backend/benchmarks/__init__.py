@@ -0,0 +1,367 @@
+from __future__ import annotations
+
+import json
+import math
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from importlib import import_module
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+from strawberry.django.context import StrawberryDjangoContext
+
+from .seed import *
+from .stand_in_executor import *
+from ..models import LangCode, Status, User
+from ..schema import schema
+from ..types import OperationType
+
+__all__ = [
+    "BenchmarkData",
+    "BENCHMARK_PASSWORD",
+    "Scenario",
+    "ScenarioResult",
+    "SCENARIOS",
+    "random_graph_json",
+    "seed_benchmark_data",
+    "stand_in_executor",
+    "run_scenario",
+    "run_benchmarks",
+    "compare_results",
+]
+
+PERCENTILES = (50, 90, 99)
+
+
+@dataclass
+class Scenario:
+    """
+    an operation run against the seeded data
+    """
+
+    name: str
+    query: str
+    # the variables of a run, picked from the seeded data
+    variables: Callable[
+        [BenchmarkData, random.Random], Dict[str, Any]
+    ] = lambda data, rand: {}
+    # the editor reads the drafts and can mutate, the reader can't
+    as_editor: bool = False
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    iterations: int
+    # min, mean, max and the percentiles in milliseconds
+    latency_ms: Dict[str, float] = field(default_factory=dict)
+    # the most queries a run made
+    queries: int = 0
+    # the most memory allocated while running the operation once
+    peak_memory_kb: float = 0.0
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario(
+        "tutorial_anchors",
+        """
+        query TutorialAnchors {
+            tutorialAnchors {
+                url
+                anchorName
+                tutorial(lang: ZH_HANS) {
+                    title
+                    abstract
+                }
+            }
+        }
+        """,
+    ),
+    Scenario(
+        "graph_anchors",
+        """
+        query GraphAnchors {
+            graphAnchors {
+                url
+                anchorName
+                graphDescription(lang: EN) {
+                    title
+                }
+            }
+        }
+        """,
+    ),
+    Scenario(
+        "tutorial_content",
+        """
+        query TutorialContent($url: String!) {
+            tutorialContent(url: $url, lang: ZH_HANS) {
+                title
+                contentMarkdown
+            }
+        }
+        """,
+        lambda data, rand: {"url": rand.choice(data.tutorial_urls)},
+    ),
+    Scenario(
+        "tutorial_content_draft",
+        """
+        query TutorialContent($url: String!) {
+            tutorialContent(url: $url, lang: ZH_HANS) {
+                title
+                contentMarkdown
+            }
+        }
+        """,
+        lambda data, rand: {"url": rand.choice(data.tutorial_urls)},
+        as_editor=True,
+    ),
+    Scenario(
+        "graph_content",
+        """
+        query GraphContent($url: String!) {
+            graphContent(url: $url, lang: EN) {
+                title
+                descriptionMarkdown
+            }
+        }
+        """,
+        lambda data, rand: {"url": rand.choice(data.graph_urls)},
+    ),
+    Scenario(
+        "graph",
+        """
+        query Graph($anchorId: UUID!) {
+            graph(anchorId: $anchorId) {
+                graphJson
+            }
+        }
+        """,
+        lambda data, rand: {"anchorId": str(rand.choice(data.graph_anchor_ids))},
+    ),
+    Scenario(
+        "execution_result",
+        """
+        query ExecutionResult($codeId: UUID!, $graphAnchorId: UUID!) {
+            code(codeId: $codeId) {
+                executionResult(graphAnchorId: $graphAnchorId) {
+                    stepCount
+                    steps(offset: 0, limit: 100)
+                }
+            }
+        }
+        """,
+        lambda data, rand: dict(
+            zip(
+                ("codeId", "graphAnchorId"), map(str, rand.choice(data.execution_pairs))
+            )
+        ),
+    ),
+    Scenario(
+        "mutate_tutorial",
+        """
+        mutation MutateTutorial($data: TutorialMutationType!) {
+            mutateTutorial(data: $data, op: %s) {
+                id
+            }
+        }
+        """
+        % OperationType.UPDATE.name,
+        lambda data, rand: {
+            "data": {
+                "tutorialAnchor": {"id": str(rand.choice(data.tutorial_anchor_ids))},
+                "title": "benchmark title",
+                "abstract": "benchmark abstract",
+                "contentMarkdown": f"# benchmark {rand.random()}",
+                "itemStatus": Status.AUTOSAVE.name,
+                "langCode": LangCode.EN.name,
+            }
+        },
+        as_editor=True,
+    ),
+    Scenario(
+        "login",
+        """
+        mutation Login($username: String!, $password: String!) {
+            login(username: $username, password: $password) {
+                id
+            }
+        }
+        """,
+        lambda data, rand: {
+            "username": data.reader.username,
+            "password": BENCHMARK_PASSWORD,
+        },
+    ),
+    Scenario(
+        "execution_request",
+        """
+        mutation ExecutionRequest($code: String!, $graph: String!) {
+            executionRequest(
+                request: {code: $code, graph: $graph, version: "benchmark"}
+            ) {
+                info {
+                    result
+                }
+            }
+        }
+        """,
+        lambda data, rand: {
+            "code": "def test_code(ele):\n    print(ele)\n",
+            "graph": json.dumps(random_graph_json(rand, 30, 60)),
+        },
+    ),
+]
+
+
+def _make_context(user: User) -> StrawberryDjangoContext:
+    # a new session every run, so the executor requests are not throttled
+    request = RequestFactory().post(
+        "/graphql/sync", data=None, content_type="application/json"
+    )
+    request.user = user
+    request.session = import_module(settings.SESSION_ENGINE).SessionStore()
+    return StrawberryDjangoContext(request, HttpResponse())
+
+
+def _percentile(ordered: List[float], percentile: float) -> float:
+    index = max(math.ceil(percentile / 100 * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+def run_scenario(
+    scenario: Scenario,
+    data: BenchmarkData,
+    iterations: int,
+    warmup: int = 1,
+    seed: int = 0,
+) -> ScenarioResult:
+    """
+    run the operation of a scenario through the schema
+    :param scenario:
+    :param data: the seeded data
+    :param iterations: the runs measured
+    :param warmup: the runs before the measured ones, which are not measured
+    :param seed: the seed of the variables
+    :return:
+    """
+    rand = random.Random(seed)
+    user = data.editor if scenario.as_editor else data.reader
+    query_count = 0
+
+    def count_query(execute, sql, params, many, context):
+        nonlocal query_count
+        query_count += 1
+        return execute(sql, params, many, context)
+
+    def run() -> float:
+        context = _make_context(user)
+        variables = scenario.variables(data, rand)
+        start_time = time.perf_counter()
+        result = schema.execute_sync(
+            scenario.query, variable_values=variables, context_value=context
+        )
+        elapsed = time.perf_counter() - start_time
+        if result.errors:
+            raise RuntimeError(
+                f"scenario {scenario.name} failed: "
+                + "; ".join(error.message for error in result.errors)
+            )
+        return elapsed
+
+    for _ in range(warmup):
+        run()
+
+    timings, most_queries = [], 0
+    with connection.execute_wrapper(count_query):
+        for _ in range(iterations):
+            query_count = 0
+            timings.append(run())
+            most_queries = max(most_queries, query_count)
+
+    # the allocations are traced in a run of their own, which tracing slows down
+    tracemalloc.start()
+    try:
+        run()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    ordered = sorted(timings)
+    latency = {
+        "min": ordered[0],
+        "mean": sum(ordered) / len(ordered),
+        **{f"p{p}": _percentile(ordered, p) for p in PERCENTILES},
+        "max": ordered[-1],
+    }
+    return ScenarioResult(
+        name=scenario.name,
+        iterations=iterations,
+        latency_ms={key: round(value * 1000, 3) for key, value in latency.items()},
+        queries=most_queries,
+        peak_memory_kb=round(peak_memory / 1024, 1),
+    )
+
+
+def run_benchmarks(
+    data: BenchmarkData,
+    iterations: int,
+    warmup: int = 1,
+    seed: int = 0,
+    names: Optional[Iterable[str]] = None,
+) -> List[ScenarioResult]:
+    """
+    run the scenarios one after another
+    :param data: the seeded data
+    :param iterations:
+    :param warmup:
+    :param seed:
+    :param names: the names of the scenarios to run, all of them when not given
+    :return:
+    """
+    names = set(names or ())
+    unknown = names - {scenario.name for scenario in SCENARIOS}
+    if unknown:
+        raise ValueError(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    return [
+        run_scenario(scenario, data, iterations, warmup, seed)
+        for scenario in SCENARIOS
+        if not names or scenario.name in names
+    ]
+
+
+def compare_results(
+    baseline: Dict[str, Any], current: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    compare two reports of the benchmark command scenario by scenario
+    :param baseline:
+    :param current:
+    :return: the p50 latencies, the query counts and the peak memory of both,
+             and the change of the p50 latency as a ratio
+    """
+    baseline_results = {result["name"]: result for result in baseline["results"]}
+    comparison = []
+    for result in current["results"]:
+        if (before := baseline_results.get(result["name"])) is None:
+            continue
+
+        before_p50, after_p50 = before["latency_ms"]["p50"], result["latency_ms"]["p50"]
+        comparison.append(
+            {
+                "name": result["name"],
+                "p50_ms": [before_p50, after_p50],
+                "p50_change": round(after_p50 / before_p50 - 1, 3)
+                if before_p50
+                else None,
+                "queries": [before["queries"], result["queries"]],
+                "peak_memory_kb": [before["peak_memory_kb"], result["peak_memory_kb"]],
+            }
+        )
+    return comparison
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from typing import List, Tuple
+from uuid import UUID
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+from ..baker_recipes.make_scale_examples import (
+    free_anchor_ranks,
+    random_execution_steps,
+    random_graph_json,
+)
+from ..baker_recipes import (
+    code_recipe,
+    execution_result_recipe,
+    graph_anchor_recipe,
+    graph_description_recipe,
+    graph_recipe,
+    tag_anchor_recipe,
+    tutorial_anchor_recipe,
+    tutorial_recipe,
+    user_recipe,
+)
+from ..models import LangCode, Status, User, UserRoles
+
+__all__ = [
+    "BenchmarkData",
+    "BENCHMARK_PASSWORD",
+    "random_graph_json",
+    "seed_benchmark_data",
+]
+
+BENCHMARK_PREFIX = "benchmark"
+# the password of the reader, who logs in with the password hasher in the settings
+BENCHMARK_PASSWORD = "benchmark password"
+AUTHOR_COUNT = 10
+TAG_COUNT = 20
+# the graph anchors each code has results on
+RESULTS_PER_CODE = 2
+
+
+@dataclass
+class BenchmarkData:
+    """
+    what the scenarios look up in the seeded data
+    """
+
+    reader: User
+    editor: User
+    tutorial_urls: List[str] = field(default_factory=list)
+    tutorial_anchor_ids: List[UUID] = field(default_factory=list)
+    graph_urls: List[str] = field(default_factory=list)
+    graph_anchor_ids: List[UUID] = field(default_factory=list)
+    # the code and graph anchor ids of the execution results
+    execution_pairs: List[Tuple[UUID, UUID]] = field(default_factory=list)
+
+
+def _markdown(rand: random.Random, paragraphs: int) -> str:
+    return "\n\n".join(
+        f"## section {i}\n\n"
+        + " ".join(f"word{rand.randint(0, 999)}" for _ in range(rand.randint(40, 120)))
+        for i in range(paragraphs)
+    )
+
+
+def seed_benchmark_data(scale: int, seed: int = 0) -> BenchmarkData:
+    """
+    make the data the benchmarks run on with the baker recipes.
+    every tutorial anchor has a published tutorial in English and Chinese
+    with a draft on top, a code, and a graph anchor with its graph and
+    description, and every code has results on two graph anchors.
+    :param scale: the number of tutorial anchors
+    :param seed: the seed of the random texts, graphs and traces
+    :return:
+    """
+    rand = random.Random(seed)
+    authors = [
+        user_recipe.make(
+            username=f"{BENCHMARK_PREFIX}_author_{i}", role=UserRoles.AUTHOR
+        )
+        for i in range(AUTHOR_COUNT)
+    ]
+    tag_anchors = tag_anchor_recipe.make(_quantity=TAG_COUNT)
+    data = BenchmarkData(
+        reader=user_recipe.make(
+            username=f"{BENCHMARK_PREFIX}_reader",
+            role=UserRoles.READER,
+            password=make_password(BENCHMARK_PASSWORD),
+        ),
+        editor=user_recipe.make(
+            username=f"{BENCHMARK_PREFIX}_editor", role=UserRoles.EDITOR
+        ),
+    )
+
+    codes, graph_anchors = [], []
+    ranks = free_anchor_ranks(scale)
+    for i in range(scale):
+        tutorial_anchor = tutorial_anchor_recipe.make(
+            url=f"{BENCHMARK_PREFIX}-tutorial-{i}",
+            anchor_name=f"{BENCHMARK_PREFIX} tutorial {i}",
+            rank=next(ranks),
+            item_status=Status.PUBLISHED,
+            tag_anchors=rand.sample(tag_anchors, 2),
+        )
+        for lang_code in (LangCode.EN, LangCode.ZH_HANS):
+            published = tutorial_recipe.make(
+                tutorial_anchor=tutorial_anchor,
+                lang_code=lang_code,
+                title=f"tutorial {i} in {lang_code}",
+                abstract=_markdown(rand, 1),
+                content_markdown=_markdown(rand, 8),
+                item_status=Status.PUBLISHED,
+                authors=rand.sample(authors, 2),
+            )
+        tutorial_recipe.make(
+            tutorial_anchor=tutorial_anchor,
+            lang_code=LangCode.ZH_HANS,
+            title=f"tutorial {i} draft",
+            abstract=published.abstract,
+            content_markdown=published.content_markdown + _markdown(rand, 1),
+            item_status=Status.DRAFT,
+            authors=rand.sample(authors, 1),
+            back=published,
+        )
+        codes.append(
+            code_recipe.make(tutorial_anchor=tutorial_anchor, name=tutorial_anchor.url)
+        )
+
+        graph_json = random_graph_json(
+            rand, node_count=rand.randint(10, 60), edge_count=rand.randint(10, 150)
+        )
+        graph_anchor = graph_anchor_recipe.make(
+            url=f"{BENCHMARK_PREFIX}-graph-{i}",
+            anchor_name=f"{BENCHMARK_PREFIX} graph {i}",
+            item_status=Status.PUBLISHED,
+            tag_anchors=rand.sample(tag_anchors, 2),
+            tutorial_anchors=[tutorial_anchor],
+        )
+        graph_recipe.make(
+            graph_anchor=graph_anchor,
+            graph_json=graph_json,
+            item_status=Status.PUBLISHED,
+            makers=rand.sample(authors, 1),
+        )
+        graph_description_recipe.make(
+            graph_anchor=graph_anchor,
+            lang_code=LangCode.EN,
+            description_markdown=_markdown(rand, 2),
+            item_status=Status.PUBLISHED,
+            authors=rand.sample(authors, 1),
+        )
+
+        graph_anchors.append(graph_anchor)
+        data.tutorial_urls.append(tutorial_anchor.url)
+        data.tutorial_anchor_ids.append(tutorial_anchor.id)
+        data.graph_urls.append(graph_anchor.url)
+        data.graph_anchor_ids.append(graph_anchor.id)
+
+    for i, code in enumerate(codes):
+        for graph_anchor in dict.fromkeys(
+            graph_anchors[(i + offset) % scale] for offset in range(RESULTS_PER_CODE)
+        ):
+            execution_result = execution_result_recipe.make(
+                code=code,
+                graph_anchor=graph_anchor,
+                result_json={},
+                result_json_meta={"version": BENCHMARK_PREFIX},
+            )
+            execution_result.replace_steps(
+                random_execution_steps(
+                    rand, [f"v_{k}" for k in range(10)], rand.randint(50, 300)
+                ),
+                settings.GRAPHERY_EXECUTION_RESULT_SEGMENT_STEPS,
+            )
+            data.execution_pairs.append((code.id, graph_anchor.id))
+
+    return data
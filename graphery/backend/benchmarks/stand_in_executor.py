@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+__all__ = ["STAND_IN_RESULT", "stand_in_executor"]
+
+# what the stand-in executor answers every request with
+STAND_IN_RESULT = {
+    "errors": None,
+    "info": {
+        "result": [
+            {"line": line, "variables": {"count": {"type": "Number", "repr": line}}}
+            for line in range(100)
+        ]
+    },
+}
+
+
+@contextmanager
+def stand_in_executor(latency: float = 0.0) -> Iterator[str]:
+    """
+    serve a stand-in of the executor on a free local port, which answers
+    every request with the same result after the latency
+    :param latency: the seconds each execution takes
+    :return: the url to set as GRAPHERY_EXECUTOR_URL
+    """
+    body = json.dumps(STAND_IN_RESULT).encode()
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/run"
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
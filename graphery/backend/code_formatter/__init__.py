@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+import threading
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+from typing import Optional, Final
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+
+__all__ = [
+    "black_format_str",
+    "format_code",
+    "shutdown_code_formatter",
+]
+
+_FORMATTED_KEY_PREFIX: Final[str] = "graphery:black"
+
+_formatter_pool: Optional[ProcessPoolExecutor] = None
+_formatter_pool_lock = threading.Lock()
+
+
+def black_format_str(code: str) -> str:
+    """
+    format the code with black in the current process
+    :param code:
+    :return: the formatted code
+    """
+    # black is only imported where the formatting happens,
+    # which is usually a formatter process
+    import black
+
+    return black.format_str(
+        code,
+        mode=black.Mode(
+            target_versions={black.TargetVersion.PY310},
+            line_length=120,
+        ),
+    )
+
+
+def _get_formatter_pool() -> Optional[ProcessPoolExecutor]:
+    global _formatter_pool
+
+    if settings.GRAPHERY_CODE_FORMAT_WORKERS <= 0:
+        return None
+
+    if _formatter_pool is None:
+        with _formatter_pool_lock:
+            if _formatter_pool is None:
+                # the formatter processes are spawned instead of forked,
+                # so that they do not inherit database connections and threads
+                _formatter_pool = ProcessPoolExecutor(
+                    max_workers=settings.GRAPHERY_CODE_FORMAT_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+
+    return _formatter_pool
+
+
+def shutdown_code_formatter(wait: bool = True) -> None:
+    """
+    shut down the formatter processes, a new pool is made on the next call
+    :param wait: if waiting for the running formatting to finish
+    :return:
+    """
+    global _formatter_pool
+
+    with _formatter_pool_lock:
+        if _formatter_pool is not None:
+            _formatter_pool.shutdown(wait=wait)
+            _formatter_pool = None
+
+
+def _formatted_key(code: str) -> str:
+    return f"{_FORMATTED_KEY_PREFIX}:{hashlib.sha256(code.encode()).hexdigest()}"
+
+
+def format_code(code: str) -> str:
+    """
+    format the code with black in a formatter process.
+    the results are memoized in the cache by the hash of the code,
+    so unchanged code is never formatted again.
+    :param code:
+    :return: the formatted code
+    :raise ValidationError: when the code can't be formatted in time
+    """
+    key = _formatted_key(code)
+    if (formatted := cache.get(key)) is not None:
+        return formatted
+
+    pool = _get_formatter_pool()
+    try:
+        if pool is None:
+            formatted = black_format_str(code)
+        else:
+            future = pool.submit(black_format_str, code)
+            try:
+                formatted = future.result(timeout=settings.GRAPHERY_CODE_FORMAT_TIMEOUT)
+            finally:
+                future.cancel()
+    except TimeoutError:
+        raise ValidationError("Formatting the code took too long.")
+    except (ValueError, BrokenExecutor) as e:
+        # black raises a ValueError when the code can't be parsed
+        raise ValidationError(f"The code can't be formatted: {e}")
+
+    timeout = settings.GRAPHERY_CODE_FORMAT_CACHE_TIMEOUT
+    # formatting is idempotent, so the formatted code maps to itself
+    cache.set_many({key: formatted, _formatted_key(formatted): formatted}, timeout)
+
+    return formatted
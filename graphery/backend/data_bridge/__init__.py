@@ -5,3 +5,4 @@ from .tutorial_bridge import *
 from .graph_bridge import *
 from .code_bridge import *
 from .execution_result_bridge import *
+from .bridge_executor import *
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from typing import Optional, Dict, Final, Tuple
+from uuid import UUID
+
+from django.core.cache import cache
+from django.http import HttpRequest
+from strawberry import UNSET
+
+from ..jobs import enqueue_job
+from ..models import User, Tutorial, Status
+from ..types import TutorialMutationType, TutorialAnchorMutationType
+
+__all__ = [
+    "AUTOSAVE_STAGED_TIMEOUT",
+    "AUTOSAVE_STAGED_FIELDS",
+    "AutosaveBuffer",
+    "flush_staged_autosave",
+]
+
+# staged content is kept for a day, so that an editor who closes the tab
+# without an explicit save can still get the content back on the next read
+AUTOSAVE_STAGED_TIMEOUT: Final[int] = 60 * 60 * 24
+AUTOSAVE_STAGED_FIELDS: Final[Tuple[str, ...]] = (
+    "title",
+    "abstract",
+    "content_markdown",
+)
+
+_AUTOSAVE_KEY_PREFIX: Final[str] = "graphery:autosave"
+
+
+class AutosaveBuffer:
+    """
+    A staging area in the django cache absorbing frequent autosaves of
+    one editor on one tutorial in one language.
+    Staged content is flushed to the database at most once per merge window,
+    when the editor saves explicitly, or by a job when the window ends.
+    """
+
+    __slots__ = ("_user_id", "_tutorial_anchor_id", "_lang_code")
+
+    def __init__(
+        self, user_id: UUID | str, tutorial_anchor_id: UUID | str, lang_code: str
+    ) -> None:
+        self._user_id = str(user_id)
+        self._tutorial_anchor_id = str(tutorial_anchor_id)
+        self._lang_code = str(lang_code)
+
+    @classmethod
+    def from_request(
+        cls,
+        request: Optional[HttpRequest],
+        tutorial_anchor_id: UUID | str | None,
+        lang_code: str,
+    ) -> Optional[AutosaveBuffer]:
+        """
+        get the buffer for the user in the request
+        :param request:
+        :param tutorial_anchor_id:
+        :param lang_code:
+        :return: None if the request is anonymous or the anchor is unknown
+        """
+        if request is None or tutorial_anchor_id is None:
+            return None
+
+        user: User = getattr(request, "user", None)
+        if user is None or not user.is_authenticated:
+            return None
+
+        return cls(user.id, tutorial_anchor_id, lang_code)
+
+    @property
+    def _ident(self) -> str:
+        return f"{self._user_id}:{self._tutorial_anchor_id}:{self._lang_code}"
+
+    @property
+    def staged_key(self) -> str:
+        return f"{_AUTOSAVE_KEY_PREFIX}:staged:{self._ident}"
+
+    @property
+    def flush_key(self) -> str:
+        return f"{_AUTOSAVE_KEY_PREFIX}:flushed:{self._ident}"
+
+    @property
+    def scheduled_key(self) -> str:
+        return f"{_AUTOSAVE_KEY_PREFIX}:scheduled:{self._ident}"
+
+    def staged(self) -> Optional[Dict[str, str]]:
+        """
+        :return: the staged content or None if nothing is staged
+        """
+        return cache.get(self.staged_key)
+
+    @staticmethod
+    def is_stale(staged: Dict[str, str], tutorial: Optional[Tutorial]) -> bool:
+        """
+        if the tutorial has been saved since the staged content started,
+        in which case the staged content doesn't build on it
+        :param staged:
+        :param tutorial: the head of the tutorial
+        :return:
+        """
+        if tutorial is None or tutorial.modified_time is None:
+            return False
+        return tutorial.modified_time.timestamp() > staged.get("base_time", 0)
+
+    def stage(self, model_info, head: Optional[Tutorial] = None) -> Dict[str, str]:
+        """
+        merge the text fields of the model info into the staged content,
+        which starts over when the head has been saved since it started
+        :param model_info: the tutorial mutation info
+        :param head: the head of the tutorial
+        :return: the merged staged content
+        """
+        staged = self.staged()
+        if staged is None or self.is_stale(staged, head):
+            staged = {"base_time": time.time()}
+        for field_name in AUTOSAVE_STAGED_FIELDS:
+            if (value := getattr(model_info, field_name, UNSET)) is not UNSET:
+                staged[field_name] = value
+        staged["staged_time"] = time.time()
+
+        cache.set(self.staged_key, staged, timeout=AUTOSAVE_STAGED_TIMEOUT)
+        return staged
+
+    def flushed(self) -> bool:
+        """
+        if the staged content has been flushed in the current merge window
+        :return:
+        """
+        return cache.get(self.flush_key) is not None
+
+    def end_flush(self, merge_time: int) -> None:
+        """
+        start a merge window and drop the flushed content,
+        which is called once the flush is committed
+        :param merge_time: the length of the merge window in seconds
+        :return:
+        """
+        cache.add(self.flush_key, time.time(), timeout=merge_time)
+        self.clear_staged()
+
+    def schedule_flush(self, merge_time: int) -> None:
+        """
+        queue a job writing the staged content through when the merge window
+        ends, once per window
+        :param merge_time: the length of the merge window in seconds
+        :return:
+        """
+        window_end = (cache.get(self.flush_key) or time.time()) + merge_time
+        if not cache.add(
+            self.scheduled_key, True, timeout=max(int(window_end - time.time()), 1)
+        ):
+            return
+
+        enqueue_job(
+            flush_staged_autosave,
+            dedup_key=f"autosave:{self._ident}",
+            run_after=datetime.fromtimestamp(window_end, tz=timezone.utc),
+            user_id=self._user_id,
+            tutorial_anchor_id=self._tutorial_anchor_id,
+            lang_code=self._lang_code,
+        )
+
+    def fill_model_info(self, model_info):
+        """
+        fill the text fields the model info does not carry with the staged content
+        :param model_info:
+        :return: the model info
+        """
+        if staged := self.staged():
+            for field_name in AUTOSAVE_STAGED_FIELDS:
+                if (
+                    getattr(model_info, field_name, UNSET) is UNSET
+                    and field_name in staged
+                ):
+                    setattr(model_info, field_name, staged[field_name])
+
+        return model_info
+
+    def overlay(self, tutorial: Tutorial) -> Tutorial:
+        """
+        put the staged content on a tutorial instance without saving it.
+        the staged content is dropped when the tutorial has been saved since
+        :param tutorial:
+        :return: the same tutorial instance
+        """
+        if (staged := self.staged()) and self.is_stale(staged, tutorial):
+            self.clear_staged()
+        elif staged:
+            for field_name in AUTOSAVE_STAGED_FIELDS:
+                if field_name in staged:
+                    setattr(tutorial, field_name, staged[field_name])
+
+        return tutorial
+
+    def clear_staged(self) -> None:
+        cache.delete_many([self.staged_key, self.scheduled_key])
+
+    def discard(self) -> None:
+        """
+        drop the staged content and the flush record,
+        which is done when the editor saves explicitly
+        :return:
+        """
+        cache.delete_many([self.staged_key, self.scheduled_key, self.flush_key])
+
+
+def flush_staged_autosave(user_id: str, tutorial_anchor_id: str, lang_code: str):
+    """
+    the job writing the staged content of an editor into the head when the merge
+    window ends. the content is dropped when the head has been saved since
+    the content was staged
+    :param user_id:
+    :param tutorial_anchor_id:
+    :param lang_code:
+    :return:
+    """
+    autosave_buffer = AutosaveBuffer(user_id, tutorial_anchor_id, lang_code)
+    if not (staged := autosave_buffer.staged()):
+        return
+
+    # imported here since the tutorial bridge stages the autosaves with this module
+    from .tutorial_bridge import TutorialBridge
+
+    head = Tutorial.objects.filter(
+        tutorial_anchor_id=tutorial_anchor_id, lang_code=lang_code, front=None
+    ).first()
+    user = User.objects.filter(id=user_id).first()
+    try:
+        if head is None or user is None or autosave_buffer.is_stale(staged, head):
+            return
+
+        # the content is written as the autosave of the editor who staged it,
+        # with the permissions and the status transitions of the editor
+        request = HttpRequest()
+        request.user = user
+        TutorialBridge.write_autosave(
+            TutorialMutationType(
+                tutorial_anchor=TutorialAnchorMutationType(id=UUID(tutorial_anchor_id)),
+                lang_code=lang_code,
+                item_status=Status.AUTOSAVE,
+                **{
+                    field_name: staged[field_name]
+                    for field_name in AUTOSAVE_STAGED_FIELDS
+                    if field_name in staged
+                },
+            ),
+            request=request,
+        )
+    finally:
+        autosave_buffer.clear_staged()
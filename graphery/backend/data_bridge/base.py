@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 from functools import wraps
 
 from django.core.exceptions import ValidationError as _ValidationError
@@ -8,6 +7,7 @@ from django.db import transaction
 from django.db.models.fields.related import RelatedField
 from django.db.transaction import Atomic
 from django.http import HttpRequest
+from django.utils import timezone
 from strawberry import UNSET
 from uuid import UUID
 
@@ -32,6 +32,7 @@ from typing import (
 from django.db.models import Model, Field, ForeignObjectRel
 from strawberry.types import Info
 
+from ..json_codec import to_json_object, JSONDecodeError, JSONEncodeError
 from ..models import (
     LangCode,
     Status,
@@ -43,7 +44,6 @@ from ..models import (
     User,
     WRITER_ALLOWED_STATUS,
     VersionMixin,
-    CLOSE_OLD_STATUS,
 )
 from ..types import OperationType
 
@@ -54,6 +54,8 @@ _T = TypeVar("_T")
 
 __all__ = [
     "ValidationError",
+    "VersionConflictError",
+    "check_status_permission",
     "text_processing_wrapper",
     "json_validation_wrapper",
     "DataBridgeProtocol",
@@ -67,6 +69,13 @@ __all__ = [
 ValidationError = _ValidationError
 
 
+class VersionConflictError(ValidationError):
+    """
+    raised when the instance has been changed since the version
+    the requested change is based on
+    """
+
+
 def basic_permission_validator_wrapper(perm_error_txt: str = None) -> Callable:
     """
     a wrapper validates the basic permission before passing it to the function
@@ -93,6 +102,29 @@ def basic_permission_validator_wrapper(perm_error_txt: str = None) -> Callable:
     return _wrapper_helper
 
 
+def check_status_permission(
+    item_status: Status, request: Optional[HttpRequest]
+) -> None:
+    """
+    check if the user of the request can set the item status
+    :param item_status:
+    :param request:
+    :return:
+    :raise ValidationError: when the user can't set the status
+    """
+    user: User = request.user if request else None
+
+    if user and user.role >= UserRoles.EDITOR:
+        pass
+    elif user and user.role >= UserRoles.TRANSLATOR:
+        if item_status not in WRITER_ALLOWED_STATUS:
+            raise ValidationError(
+                f"You don't have the permission to set '{item_status}' status."
+            )
+    else:
+        raise ValidationError("You don't have the permission to edit item status")
+
+
 def bridges_uuid_mixin(cls: Type[DATA_BRIDGE_TYPE]) -> Type[DATA_BRIDGE_TYPE]:
     def _bridges_id(*_, **__) -> None:
         """
@@ -126,25 +158,10 @@ def bridges_status_mixin(cls: Type[DATA_BRIDGE_TYPE]) -> Type[DATA_BRIDGE_TYPE]:
             raise ValueError(f"{status} is not a valid status.")
 
         # some item status cannot be set by every one
-        user: User = request.user if request else None
-
-        if user and user.role >= UserRoles.EDITOR:
-            pass
-        elif user and user.role >= UserRoles.TRANSLATOR:
-            if item_status not in WRITER_ALLOWED_STATUS:
-                raise ValidationError(
-                    f"You don't have the permission to set '{item_status}' status."
-                )
-        else:
-            raise ValidationError("You don't have the permission to edit item status")
-
-        if item_status in CLOSE_OLD_STATUS and hasattr(self._model_instance, "back"):
-            for obj in cls.bridged_model_cls.objects.filter(
-                item_status__in=CLOSE_OLD_STATUS
-            ):
-                obj.item_status = Status.CLOSED
-                obj.save()
+        check_status_permission(item_status, request)
 
+        # the older published or private versions of the same anchor and language
+        # are closed when the version is saved, see `backend.models.published`
         self._model_instance.item_status = item_status
 
     setattr(cls, "_bridges_item_status", _bridges_item_status)
@@ -248,7 +265,9 @@ def text_processing_wrapper(*, arg_num: int = 1) -> Callable[[Callable], Callabl
 
 def json_validation_wrapper(fn: Callable) -> Callable:
     """
-    a wrapper validates the JSON data before passing it to the function
+    a wrapper validates the JSON data before passing it to the function.
+    JSON text is parsed and a dict is serialized, only once, and the text is kept
+    with the parsed object so that it's not serialized again when saving.
     :param fn: the bridge function
     :return: the wrapped bridge function
     """
@@ -258,14 +277,15 @@ def json_validation_wrapper(fn: Callable) -> Callable:
         json_content, *args = args
 
         try:
-            if isinstance(json_content, str):
-                json_content = json.loads(json_content)
-            elif isinstance(json_content, Dict):
-                json.dumps(json_content)
-        except json.JSONDecodeError:
+            json_content = to_json_object(json_content)
+        except JSONDecodeError:
             raise ValidationError(
                 f"result_json is not valid JSON, but got {json_content}"
             )
+        except JSONEncodeError:
+            raise ValidationError(
+                f"result_json is not serializable to JSON, but got {json_content}"
+            )
 
         return fn(self, json_content, *args, **kwargs)
 
@@ -718,12 +738,40 @@ class DataBridgeBase(DataBridgeProtocol, Generic[MODEL_TYPE, DATA_TYPE]):
         if cls.bridged_model_cls.objects.filter(
             id=bridge_instance.model_instance.id
         ).exists():
+            cls._claim_version(bridge_instance, model_info)
             bridge_instance.bridges_model_info(model_info, request=request, **kwargs)
         else:
             raise ValidationError(
                 f"{cls.bridged_model_cls.__name__} Model does not exist and cannot be updated."
             )
 
+    @classmethod
+    def _claim_version(
+        cls, bridge_instance: DATA_BRIDGE_TYPE, model_info: DATA_TYPE
+    ) -> None:
+        """
+        If the model info carries the modified time of the version it is based on,
+        the row is bumped with a conditional update matching that modified time.
+        When no row matches, someone else has changed the instance in between,
+        and the change is rejected instead of overwriting theirs.
+        :param bridge_instance:
+        :param model_info:
+        :return:
+        """
+        expected_time = getattr(model_info, "modified_time", UNSET)
+        if expected_time is UNSET or expected_time is None:
+            return
+
+        claimed = cls.bridged_model_cls.objects.filter(
+            id=bridge_instance.model_instance.id, modified_time=expected_time
+        ).update(modified_time=timezone.now())
+
+        if not claimed:
+            raise VersionConflictError(
+                f"{cls.bridged_model_cls.__name__} has been changed by someone else "
+                f"since {expected_time.isoformat()}. Please reload and try again."
+            )
+
     @classmethod
     def bridges_from_mutation(
         cls,
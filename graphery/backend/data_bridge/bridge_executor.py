@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar, Optional, Awaitable
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from ..profiling import capture_profiled_queries
+
+__all__ = ["run_in_bridge_executor", "bridge_resolver", "shutdown_bridge_executor"]
+
+_T = TypeVar("_T")
+
+_bridge_executor: Optional[ThreadPoolExecutor] = None
+_bridge_executor_lock = threading.Lock()
+
+
+def _get_bridge_executor() -> ThreadPoolExecutor:
+    global _bridge_executor
+
+    if _bridge_executor is None:
+        with _bridge_executor_lock:
+            if _bridge_executor is None:
+                _bridge_executor = ThreadPoolExecutor(
+                    max_workers=settings.GRAPHERY_BRIDGE_MAX_WORKERS,
+                    thread_name_prefix="graphery-bridge",
+                )
+
+    return _bridge_executor
+
+
+def shutdown_bridge_executor(wait: bool = True) -> None:
+    """
+    shut down the worker threads, a new pool is made on the next call
+    :param wait: if waiting for the running calls to finish
+    :return:
+    """
+    global _bridge_executor
+
+    with _bridge_executor_lock:
+        if _bridge_executor is not None:
+            _bridge_executor.shutdown(wait=wait)
+            _bridge_executor = None
+
+
+def _run_with_connection(fn: Callable[..., _T], *args, **kwargs) -> _T:
+    """
+    run the function in a worker thread. every worker keeps its own connection,
+    which is reused across calls unless it's broken or older than CONN_MAX_AGE.
+    the queries are counted for the profiled operation running the function
+    """
+    close_old_connections()
+    try:
+        with capture_profiled_queries():
+            return fn(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+def run_in_bridge_executor(fn: Callable[..., _T], *args, **kwargs) -> Awaitable[_T]:
+    """
+    run a blocking function, such as `bridges_from_mutation`,
+    in the bridge thread pool without blocking the event loop.
+    the pool is separated from the thread `sync_to_async` uses,
+    so long transactions in mutations do not hold up queries.
+    :param fn:
+    :param args:
+    :param kwargs:
+    :return: an awaitable of the result
+    """
+    context = contextvars.copy_context()
+    return asyncio.get_running_loop().run_in_executor(
+        _get_bridge_executor(),
+        functools.partial(context.run, _run_with_connection, fn, *args, **kwargs),
+    )
+
+
+def bridge_resolver(resolver: Callable[..., _T]) -> Callable[..., _T]:
+    """
+    make a blocking resolver usable in both endpoints. in the async endpoint
+    it runs in the bridge thread pool, and in the sync endpoint it runs as is.
+    :param resolver:
+    :return:
+    """
+
+    @functools.wraps(resolver)
+    def wrapper(*args, **kwargs):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return resolver(*args, **kwargs)
+
+        return run_in_bridge_executor(resolver, *args, **kwargs)
+
+    return wrapper
@@ -1,28 +1,23 @@
 from __future__ import annotations
 
-from functools import partial
+from typing import Optional
 
-import black
 from strawberry import UNSET
+from strawberry.types import Info
 
 from . import ValidationError
+from ..code_formatter import black_format_str, format_code
 from ..data_bridge import DataBridgeBase, text_processing_wrapper
+from ..execution_precompute import schedule_execution_results
 from ..models import Code, UserRoles, TutorialAnchor
 from ..types import (
     CodeMutationType,
     TutorialAnchorMutationType,
+    OperationType,
 )
 
 __all__ = ["black_format_str", "CodeBridge"]
 
-black_format_str = partial(
-    black.format_str,
-    mode=black.Mode(
-        target_versions={black.TargetVersion.PY310},
-        line_length=120,
-    ),
-)
-
 
 class CodeBridge(DataBridgeBase[Code, CodeMutationType]):
     __slots__ = ()
@@ -36,9 +31,18 @@ class CodeBridge(DataBridgeBase[Code, CodeMutationType]):
     def _bridges_name(self, name: str, *_, **__) -> None:
         self._model_instance.name = name
 
-    def _bridges_code(self, code: str, *_, **__) -> None:
-        # black code before saving
-        self._model_instance.code = black_format_str(code)
+    def _bridges_code(
+        self,
+        code: str,
+        *_,
+        code_formatted: bool = False,
+        autosave: bool = False,
+        **__,
+    ) -> None:
+        # black code before saving, unless it's done before the transaction
+        self._model_instance.code = code if code_formatted else format_code(code)
+        if not autosave:
+            schedule_execution_results(code_ids=[self._model_instance.id])
 
     def _bridges_tutorial_anchor(
         self,
@@ -53,3 +57,34 @@ class CodeBridge(DataBridgeBase[Code, CodeMutationType]):
         self._model_instance.tutorial_anchor = TutorialAnchor.objects.get(
             id=tutorial_anchor.id
         )
+
+    @classmethod
+    def bridges_from_mutation(
+        cls,
+        op: OperationType,
+        model_info: CodeMutationType,
+        *,
+        info: Info | None = None,
+        autosave: bool = False,
+        **kwargs,
+    ) -> Optional[Code]:
+        """
+        Format the code before the transaction starts, so that the transaction
+        is not held while black is running. The code is only formatted
+        for the users who can edit it.
+        :param op:
+        :param model_info:
+        :param info: strawberry info
+        :param autosave: the code is stored as is when it's an autosave
+        :return:
+        """
+        if op is not OperationType.DELETE and model_info.code is not UNSET:
+            cls(model_info.id)._has_basic_permission(
+                info.context.request if info else None
+            )
+            if not autosave:
+                model_info.code = format_code(model_info.code)
+            kwargs["code_formatted"] = True
+            kwargs["autosave"] = autosave
+
+        return super().bridges_from_mutation(op, model_info, info=info, **kwargs)
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, List, Any, Optional
+from uuid import UUID
 
+from django.conf import settings
 from strawberry import UNSET
 
 from . import ValidationError
 from .base import json_validation_wrapper
 from ..data_bridge import DataBridgeBase
-from ..models import ExecutionResult, UserRoles, Code, GraphAnchor
+from ..models import (
+    ExecutionResult,
+    UserRoles,
+    Code,
+    GraphAnchor,
+    split_execution_steps,
+)
 from ..types import (
     ExecutionResultMutationType,
     CodeMutationType,
@@ -20,13 +28,26 @@ __all__ = ["ExecutionResultBridge"]
 class ExecutionResultBridge(
     DataBridgeBase[ExecutionResult, ExecutionResultMutationType]
 ):
-    __slots__ = ()
+    # the steps split from the result json, which are stored after the result
+    __slots__ = ("_steps",)
 
     _bridged_model_cls = ExecutionResult
     _require_edit_authentication = True
     _minimal_edit_user_role = UserRoles.AUTHOR
     _attaching_to = ("code", "graph_anchor")
 
+    def __init__(self, ident: str | UUID | UNSET) -> None:
+        super().__init__(ident)
+        self._steps: Optional[List[Any]] = None
+
+    def save(self):
+        super().save()
+        if self._model_instance and self._steps is not None:
+            self._model_instance.replace_steps(
+                self._steps, settings.GRAPHERY_EXECUTION_RESULT_SEGMENT_STEPS
+            )
+            self._steps = None
+
     def _bridges_code(self, code: CodeMutationType, *_, **__) -> None:
         """
         This is a special case
@@ -71,7 +92,9 @@ class ExecutionResultBridge(
                 f"result_json has to be a dict or a string of dict, but got {result_json}"
             )
 
-        self._model_instance.result_json = result_json
+        self._model_instance.result_json, self._steps = split_execution_steps(
+            result_json
+        )
 
     @json_validation_wrapper
     def _bridges_result_json_meta(self, result_json_meta: Dict, *_, **__) -> None:
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import base64
+import binascii
 from typing import List, Dict
 from uuid import UUID
 
+from django.conf import settings
 from django.core.validators import validate_slug
 from django.db.models import Q
 from django.http import HttpRequest
@@ -15,6 +18,9 @@ from .base import (
     json_validation_wrapper,
 )
 from ..data_bridge import DataBridgeBase
+from ..graph_format import normalize_graph_json, encode_compact, decode_compact
+from ..execution_precompute import schedule_execution_results
+from ..graph_layout import schedule_graph_layouts
 from ..models import (
     GraphAnchor,
     UserRoles,
@@ -128,6 +134,8 @@ class GraphAnchorBridge(DataBridgeBase[GraphAnchor, GraphAnchorMutationType]):
             binding.order = ordered_anchor_info.order
             binding.save()
 
+        schedule_execution_results(graph_anchor_ids=[self._model_instance.id])
+
 
 class GraphBridge(DataBridgeBase[Graph, GraphMutationType]):
     __slots__ = ()
@@ -137,6 +145,19 @@ class GraphBridge(DataBridgeBase[Graph, GraphMutationType]):
     _minimal_edit_user_role = UserRoles.AUTHOR
     _attaching_to = "graph_anchor"
 
+    def bridges_model_info(
+        self, model_info: GraphMutationType, **kwargs
+    ) -> GraphBridge[Graph, GraphMutationType]:
+        # the graph is either in json or compact, and neither one wins silently
+        if model_info.graph_json not in (UNSET, None) and (
+            model_info.graph_compact not in (UNSET, None)
+        ):
+            raise ValidationError(
+                "Graph json and compact graph can't be set at the same time."
+            )
+
+        return super().bridges_model_info(model_info, **kwargs)
+
     def _bridges_graph_anchor(
         self,
         graph_anchor: GraphAnchorMutationType,
@@ -160,7 +181,35 @@ class GraphBridge(DataBridgeBase[Graph, GraphMutationType]):
                 "Graph json must be either a dictionary or a string of dictionary."
             )
 
-        self._model_instance.graph_json = graph_json
+        self._store_graph(graph_json)
+
+    def _bridges_graph_compact(self, graph_compact: str, *_, **__) -> None:
+        try:
+            graph_json = decode_compact(base64.b64decode(graph_compact, validate=True))
+        except binascii.Error:
+            raise ValidationError("Compact graph must be encoded in base64.")
+
+        self._store_graph(graph_json)
+
+    def _store_graph(self, graph_json: Dict) -> None:
+        """
+        normalize the graph and store it, in the compact form if it's large
+        :param graph_json:
+        :return:
+        """
+        graph_json, graph_meta = normalize_graph_json(graph_json)
+        if graph_meta["node_count"] >= settings.GRAPHERY_GRAPH_COMPACT_MIN_NODES:
+            self._model_instance.graph_json = None
+            self._model_instance.graph_compact = encode_compact(graph_json)
+        else:
+            self._model_instance.graph_json = graph_json
+            self._model_instance.graph_compact = None
+        self._model_instance.graph_meta = graph_meta
+        schedule_graph_layouts(self._model_instance.id)
+        if self._model_instance.graph_anchor_id is not None:
+            schedule_execution_results(
+                graph_anchor_ids=[self._model_instance.graph_anchor_id]
+            )
 
     def _bridges_makers(self, makers: List[UserMutationType], *_, **__) -> None:
         makers = User.objects.filter(id__in=[maker.id for maker in makers])
@@ -1,19 +1,30 @@
 from __future__ import annotations
 
+from functools import partial
 from uuid import UUID
 
+from django.db import transaction
 from django.db.models import Q
 from strawberry import UNSET
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 from django.core.validators import validate_slug
 from django.http import HttpRequest
 
-from . import ValidationError, TagAnchorBridge, text_processing_wrapper
+from . import (
+    ValidationError,
+    TagAnchorBridge,
+    text_processing_wrapper,
+    check_status_permission,
+)
+from .autosave_buffer import AutosaveBuffer
 from .version_handlers import (
     version_update_handler,
+    checked_new_version,
+    AUTO_SAVE_MERGE_TIME,
 )
 from ..data_bridge import DataBridgeBase
+from ..execution_precompute import schedule_execution_results
 from ..models import (
     TutorialAnchor,
     UserRoles,
@@ -21,6 +32,7 @@ from ..models import (
     Tutorial,
     GraphAnchor,
     OrderedAnchorTable,
+    Status,
 )
 from ..types import (
     TutorialAnchorMutationType,
@@ -100,6 +112,8 @@ class TutorialAnchorBridge(DataBridgeBase[TutorialAnchor, TutorialAnchorMutation
             binding.order = ordered_anchor_info.order
             binding.save()
 
+        schedule_execution_results(tutorial_anchor_ids=[self._model_instance.id])
+
 
 class TutorialBridge(DataBridgeBase[Tutorial, TutorialMutationType]):
     __slots__ = ()
@@ -163,23 +177,139 @@ class TutorialBridge(DataBridgeBase[Tutorial, TutorialMutationType]):
     ):
         raise RuntimeError("Tutorials cannot be created by create operation.")
 
+    @staticmethod
+    def _get_tutorial_anchor_id(model_info: TutorialMutationType) -> Optional[UUID]:
+        """
+        find the id of the tutorial anchor the model info points to
+        :param model_info:
+        :return: None if the anchor can not be found
+        """
+        tutorial_anchor_info = model_info.tutorial_anchor
+        if tutorial_anchor_info is UNSET or tutorial_anchor_info is None:
+            return None
+
+        if tutorial_anchor_info.id not in (UNSET, None):
+            return tutorial_anchor_info.id
+
+        if tutorial_anchor_info.url not in (UNSET, None):
+            return (
+                TutorialAnchor.objects.filter(url=tutorial_anchor_info.url)
+                .values_list("id", flat=True)
+                .first()
+            )
+
+        return None
+
+    @staticmethod
+    def _head_query(model_info: TutorialMutationType) -> Q:
+        return (
+            (
+                Q(tutorial_anchor__url=model_info.tutorial_anchor.url)
+                | Q(tutorial_anchor__id=model_info.tutorial_anchor.id)
+            )
+            & Q(front=None)
+            & Q(lang_code=model_info.lang_code)
+        )
+
+    @classmethod
+    def _check_autosave(
+        cls,
+        bridge_instance: TutorialBridge,
+        head_object: Optional[Tutorial],
+        model_info: TutorialMutationType,
+        request: HttpRequest,
+    ) -> None:
+        """
+        check an autosave the way it's checked when it's written,
+        since a staged autosave is written later without the editor
+        :param bridge_instance:
+        :param head_object:
+        :param model_info:
+        :param request:
+        :return:
+        """
+        bridge_instance._has_basic_permission(request)
+        check_status_permission(Status.AUTOSAVE, request)
+        if head_object is not None:
+            checked_new_version(head_object, bridge_instance, request, model_info)
+
+    @classmethod
+    def write_autosave(
+        cls, model_info: TutorialMutationType, *, request: HttpRequest
+    ) -> Optional[Tutorial]:
+        """
+        write an autosave into the version chain without staging it,
+        which is how the staged content is written through
+        :param model_info:
+        :param request: the request of the editor who staged the content
+        :return:
+        """
+        with cls(model_info.id) as bridge_instance:  # type: TutorialBridge
+            version_update_handler(
+                cls._head_query(model_info),
+                bridge_instance,
+                model_info,
+                request=request,
+            )
+
+        return bridge_instance.model_instance
+
     @classmethod
     def _update_op(
         cls,
         bridge_instance: TutorialBridge,
         model_info: TutorialMutationType,
+        *,
+        request: HttpRequest = None,
         **kwargs,
     ):
-        version_update_handler(
-            (
-                (
-                    Q(tutorial_anchor__url=model_info.tutorial_anchor.url)
-                    | Q(tutorial_anchor__id=model_info.tutorial_anchor.id)
+        head_obj_query = cls._head_query(model_info)
+
+        tutorial_anchor_id = cls._get_tutorial_anchor_id(model_info)
+        autosave_buffer = AutosaveBuffer.from_request(
+            request, tutorial_anchor_id, model_info.lang_code
+        )
+
+        if autosave_buffer is not None:
+            if model_info.item_status == Status.AUTOSAVE:
+                head_object = cls.bridged_model_cls.objects.filter(
+                    head_obj_query
+                ).first()
+                cls._check_autosave(bridge_instance, head_object, model_info, request)
+                autosave_buffer.stage(model_info, head_object)
+
+                if autosave_buffer.flushed():
+                    # the content has been flushed in this merge window,
+                    # so it stays in the buffer until a job writes it through
+                    # when the window ends, and a preview is returned
+                    transaction.on_commit(
+                        partial(autosave_buffer.schedule_flush, AUTO_SAVE_MERGE_TIME)
+                    )
+                    bridge_instance._model_instance = autosave_buffer.overlay(
+                        head_object
+                        or Tutorial(
+                            tutorial_anchor_id=tutorial_anchor_id,
+                            lang_code=model_info.lang_code,
+                            item_status=Status.AUTOSAVE,
+                            edited_by=request.user,
+                        )
+                    )
+                    return
+
+                autosave_buffer.fill_model_info(model_info)
+                # the merge window only starts when the flush is committed
+                transaction.on_commit(
+                    partial(autosave_buffer.end_flush, AUTO_SAVE_MERGE_TIME)
                 )
-                & Q(front=None)
-                & Q(lang_code=model_info.lang_code)
-            ),
+            else:
+                # explicit saves carry the staged content and end the merge window
+                autosave_buffer.fill_model_info(model_info)
+                transaction.on_commit(autosave_buffer.discard)
+
+        version_update_handler(
+            head_obj_query,
             bridge_instance,
             model_info,
+            request=request,
             **kwargs,
         )
@@ -120,6 +120,31 @@ class UserBridge(DataBridgeBase[User, UserMutationType]):
         r"^(?=.{8,20}$)(?![\d_])(?!.*[_]{2})[\w]+(?<![_])$"
     )
 
+    @classmethod
+    def validate_new_user(cls, model_info: UserMutationType) -> User:
+        """
+        check the fields of a user to register without saving it,
+        so that it doesn't need a transaction
+        :param model_info:
+        :return: the unsaved user
+        :raise ValidationError: when a field is not valid or is taken
+        """
+        fields = {
+            field_name: value
+            for field_name in ("username", "email", "displayed_name", "in_mailing_list")
+            if (value := getattr(model_info, field_name, UNSET)) is not UNSET
+        }
+        if not cls.__username_regex.match(fields.get("username", "")):
+            raise ValidationError("Username is not valid")
+
+        user = User(**fields)
+        user.full_clean(
+            exclude=[
+                field.name for field in User._meta.fields if field.name not in fields
+            ]
+        )
+        return user
+
     @text_processing_wrapper()
     def _bridges_username(self, username: str, *_, **__) -> None:
         """
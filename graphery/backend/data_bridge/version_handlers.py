@@ -7,12 +7,17 @@ from django.utils import timezone
 from django.http import HttpRequest
 
 from . import DataBridgeBase
-from ..models import Status, User, VersionMixin
+from ..models import Status, User, VersionMixin, compact_previous_version
 
 _MODEL_INSTANCE = TypeVar("_MODEL_INSTANCE", bound=VersionMixin)
 _MODEL_INFO = TypeVar("_MODEL_INFO")
 
-__all__ = ["should_create_new_version", "IMPOSSIBLE", "version_update_handler"]
+__all__ = [
+    "should_create_new_version",
+    "IMPOSSIBLE",
+    "checked_new_version",
+    "version_update_handler",
+]
 
 
 class _Impossible:
@@ -218,6 +223,36 @@ def should_create_new_version(
     return result
 
 
+def checked_new_version(
+    head_object: _MODEL_INSTANCE,
+    bridge_instance: DataBridgeBase,
+    request: Optional[HttpRequest],
+    model_info: _MODEL_INFO,
+) -> Optional[Status]:
+    """
+    the result of `should_create_new_version`, which is raised
+    when the change is impossible
+    :param head_object: The head object of the current version
+    :param bridge_instance:
+    :param request:
+    :param model_info: The model info of requested change
+    :return: None or the status of the new version
+    """
+    new_version_status = should_create_new_version(head_object, request, model_info)
+
+    if new_version_status is IMPOSSIBLE:
+        raise RuntimeError(
+            f"{bridge_instance.__class__.__name__} cannot create "
+            f"new version for '{model_info}' "
+            f"based on the current state and the request. \n"
+            f"head status: {head_object.item_status}\n"
+            f"request status: {model_info.item_status}\n"
+            f"request is empty? {request is None}"
+        )
+
+    return new_version_status
+
+
 def version_update_handler(
     head_obj_query: Q,
     bridge_instance: DataBridgeBase,
@@ -253,18 +288,11 @@ def version_update_handler(
         # if there is one head, then we check if we need to create a new head
         # or update it
         head_object = head_objects.first()
-        new_version_status = should_create_new_version(head_object, request, model_info)
-
-        if new_version_status is IMPOSSIBLE:
-            raise RuntimeError(
-                f"{bridge_instance.__class__.__name__} cannot create "
-                f"new version for '{model_info}' "
-                f"based on the current state and the request. \n"
-                f"head status: {head_object.item_status}\n"
-                f"request status: {model_info.item_status}\n"
-                f"request is empty? {request is None}"
-            )
-        elif new_version_status is None:
+        new_version_status = checked_new_version(
+            head_object, bridge_instance, request, model_info
+        )
+
+        if new_version_status is None:
             bridge_instance.reset_instance(ident=head_object.id).bridges_model_info(
                 model_info, request=request, **kwargs
             )
@@ -274,6 +302,9 @@ def version_update_handler(
                 .bridges_model_info(model_info, request=request, **kwargs)
                 .bridges_field("back", head_object, request=request)
             )
+            # the old head stays in full, and the version behind it
+            # is stored as a delta against it
+            compact_previous_version(head_object)
 
     elif head_count == 0:
         # if there is no head, that means there is nothing here
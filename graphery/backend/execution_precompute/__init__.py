@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+
+from ..graph_format import decode_compact
+from ..http_client import lazy_requests
+from ..jobs import enqueue_job
+from ..json_codec import dumps, to_json_text
+from ..models import (
+    Code,
+    ExecutionResult,
+    Graph,
+    OrderedAnchorTable,
+    raw_json_value,
+    split_execution_steps,
+)
+
+__all__ = [
+    "PrecomputeStatus",
+    "execution_pairs",
+    "compute_execution_result",
+    "precompute_execution_results",
+    "run_execution_pair",
+    "enqueue_execution_pairs",
+    "schedule_execution_results",
+]
+
+logger = logging.getLogger(__name__)
+
+ExecutionPair = Tuple[UUID, UUID]
+
+
+class PrecomputeStatus(str, Enum):
+    STORED = "stored"
+    UNCHANGED = "unchanged"
+    FAILED = "failed"
+    MISSING = "missing"
+
+
+def execution_pairs(
+    *,
+    code_ids: Iterable[UUID] = (),
+    graph_anchor_ids: Iterable[UUID] = (),
+    tutorial_anchor_ids: Iterable[UUID] = (),
+    everything: bool = False,
+) -> List[ExecutionPair]:
+    """
+    find the (code, graph anchor) pairs which have execution results,
+    that is the code of a tutorial and the graphs bound to the tutorial.
+    :param code_ids: the pairs of the codes
+    :param graph_anchor_ids: the pairs of the graph anchors
+    :param tutorial_anchor_ids: the pairs of the tutorial anchors
+    :param everything: all the pairs, regardless of the ids
+    :return: the (code id, graph anchor id) pairs
+    """
+    bindings = OrderedAnchorTable.objects.filter(
+        tutorial_anchor__code__isnull=False, graph_anchor__graph__isnull=False
+    )
+    if not everything:
+        bindings = bindings.filter(
+            Q(tutorial_anchor__code__in=list(code_ids))
+            | Q(graph_anchor__in=list(graph_anchor_ids))
+            | Q(tutorial_anchor__in=list(tutorial_anchor_ids))
+        )
+
+    return list(
+        bindings.values_list("tutorial_anchor__code__id", "graph_anchor__id")
+        .order_by("tutorial_anchor__code__id", "graph_anchor__id")
+        .distinct()
+    )
+
+
+def _executor_version() -> str:
+    from executor import SERVER_VERSION
+
+    return SERVER_VERSION
+
+
+def _run_executor(code: str, graph_json_text: str, version: str) -> Dict:
+    """
+    run the code on the graph in the executor
+    :return: the info of the result
+    :raise ValueError: when the execution fails
+    """
+    response = lazy_requests().post(
+        settings.GRAPHERY_EXECUTOR_URL,
+        json={"code": code, "graph": graph_json_text, "version": version},
+        timeout=settings.GRAPHERY_EXECUTOR_TIMEOUT,
+    )
+    response.raise_for_status()
+    result = response.json()
+
+    if result["errors"]:
+        raise ValueError(result["errors"][0]["message"])
+
+    return result["info"]
+
+
+def _source_hash(code: str, graph_json_text: str, version: str) -> str:
+    source = hashlib.sha256()
+    for part in (version, code, graph_json_text):
+        source.update(part.encode())
+        source.update(b"\0")
+    return source.hexdigest()
+
+
+def compute_execution_result(
+    code_id: UUID, graph_anchor_id: UUID, *, force: bool = False
+) -> PrecomputeStatus:
+    """
+    run the code on the graph and store the result.
+    results computed from the same code and graph are not computed again,
+    so this can be called any number of times.
+    :param code_id:
+    :param graph_anchor_id:
+    :param force: compute the result even if it's up to date
+    :return: a `PrecomputeStatus`
+    """
+    code = Code.objects.filter(id=code_id).only("id", "code").first()
+    graph = (
+        Graph.objects.with_raw_json("graph_json")
+        .filter(graph_anchor_id=graph_anchor_id)
+        .first()
+    )
+    if code is None or graph is None:
+        return PrecomputeStatus.MISSING
+
+    if graph.graph_compact is not None:
+        graph_json_text = dumps(decode_compact(graph.graph_compact))
+    else:
+        graph_json_text = to_json_text(raw_json_value(graph, "graph_json"))
+
+    version = _executor_version()
+    source_hash = _source_hash(code.code, graph_json_text, version)
+    if (
+        not force
+        and ExecutionResult.objects.filter(
+            code_id=code_id, graph_anchor_id=graph_anchor_id, source_hash=source_hash
+        ).exists()
+    ):
+        return PrecomputeStatus.UNCHANGED
+
+    try:
+        info = _run_executor(code.code, graph_json_text, version)
+    except (lazy_requests().RequestException, ValueError, KeyError) as e:
+        logger.warning(
+            "failed to execute code %s on graph anchor %s: %s",
+            code_id,
+            graph_anchor_id,
+            e,
+        )
+        return PrecomputeStatus.FAILED
+
+    result_json, steps = split_execution_steps(info)
+    with transaction.atomic():
+        execution_result, _ = ExecutionResult.objects.update_or_create(
+            code_id=code_id,
+            graph_anchor_id=graph_anchor_id,
+            defaults={
+                "result_json": result_json,
+                "result_json_meta": {"version": version},
+                "source_hash": source_hash,
+            },
+        )
+        execution_result.replace_steps(
+            steps, settings.GRAPHERY_EXECUTION_RESULT_SEGMENT_STEPS
+        )
+
+    return PrecomputeStatus.STORED
+
+
+def _compute_with_connection(
+    pair: ExecutionPair, force: bool = False
+) -> PrecomputeStatus:
+    close_old_connections()
+    try:
+        return compute_execution_result(*pair, force=force)
+    finally:
+        close_old_connections()
+
+
+def precompute_execution_results(
+    pairs: Iterable[ExecutionPair],
+    *,
+    force: bool = False,
+    max_workers: Optional[int] = None,
+) -> Counter:
+    """
+    compute the results of the pairs, with at most `max_workers` executions
+    running at the same time, and wait for them to finish
+    :param pairs:
+    :param force: compute the results even if they are up to date
+    :param max_workers: GRAPHERY_EXECUTION_PRECOMPUTE_WORKERS by default
+    :return: the count of every `PrecomputeStatus`
+    """
+    with ThreadPoolExecutor(
+        max_workers=max_workers or settings.GRAPHERY_EXECUTION_PRECOMPUTE_WORKERS,
+        thread_name_prefix="graphery-precompute",
+    ) as pool:
+        return Counter(
+            pool.map(functools.partial(_compute_with_connection, force=force), pairs)
+        )
+
+
+def run_execution_pair(code_id: UUID | str, graph_anchor_id: UUID | str) -> None:
+    """
+    the job computing the result of a pair, which fails when the execution
+    fails, so that the job is retried
+    :param code_id:
+    :param graph_anchor_id:
+    :return:
+    """
+    status = compute_execution_result(code_id, graph_anchor_id)
+    if status is PrecomputeStatus.FAILED:
+        raise RuntimeError(
+            f"failed to execute code {code_id} on graph anchor {graph_anchor_id}"
+        )
+
+
+def enqueue_execution_pairs(pairs: Iterable[ExecutionPair]) -> int:
+    """
+    queue a job for every pair, and a pair waiting for its result is queued once
+    :param pairs:
+    :return: the number of pairs
+    """
+    count = 0
+    for code_id, graph_anchor_id in pairs:
+        enqueue_job(
+            run_execution_pair,
+            dedup_key=f"execution_result:{code_id}:{graph_anchor_id}",
+            code_id=str(code_id),
+            graph_anchor_id=str(graph_anchor_id),
+        )
+        count += 1
+    return count
+
+
+def schedule_execution_results(
+    *,
+    code_ids: Iterable[UUID] = (),
+    graph_anchor_ids: Iterable[UUID] = (),
+    tutorial_anchor_ids: Iterable[UUID] = (),
+) -> None:
+    """
+    queue jobs computing the results affected by a change
+    once the change is committed, since the pairs are found through
+    the saved codes, graphs and bindings.
+    nothing is done unless GRAPHERY_EXECUTION_PRECOMPUTE is on.
+    :param code_ids: the changed codes
+    :param graph_anchor_ids: the changed graph anchors
+    :param tutorial_anchor_ids: the changed tutorial anchors
+    :return:
+    """
+    if not settings.GRAPHERY_EXECUTION_PRECOMPUTE:
+        return
+
+    transaction.on_commit(
+        functools.partial(
+            _enqueue_changed_pairs,
+            code_ids=list(code_ids),
+            graph_anchor_ids=list(graph_anchor_ids),
+            tutorial_anchor_ids=list(tutorial_anchor_ids),
+        )
+    )
+
+
+def _enqueue_changed_pairs(**ids) -> None:
+    enqueue_execution_pairs(execution_pairs(**ids))
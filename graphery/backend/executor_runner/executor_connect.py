@@ -2,14 +2,16 @@ from __future__ import annotations
 
 import time
 
-import requests
 from django.http import HttpRequest
 from strawberry.types import Info
 from django.conf import settings
 import dataclasses
 
 from .types import RequestType, ResponseType, RequestTypeJSON, ErrorType, InfoType
+from ..data_bridge import bridge_resolver
+from ..http_client import lazy_requests
 from ..models import User, UserRoles
+from ..profiling import track_executor
 
 GRAPHERY_EXECUTOR_ACCESS_TIME_SESSION_NAME = "graphery_executor_access_time"
 
@@ -23,9 +25,16 @@ def request_type_to_json(request_type: RequestType) -> RequestTypeJSON:
 
 def make_request(request_obj: RequestType) -> ResponseType:
     request_json = request_type_to_json(request_obj)
-    result_json = requests.post(
-        settings.GRAPHERY_EXECUTOR_URL, json=request_json
-    ).json()
+    with track_executor():
+        result_json = (
+            lazy_requests()
+            .post(
+                settings.GRAPHERY_EXECUTOR_URL,
+                json=request_json,
+                timeout=settings.GRAPHERY_EXECUTOR_TIMEOUT,
+            )
+            .json()
+        )
 
     errors = result_json["errors"]
     info = result_json["info"]
@@ -66,6 +75,7 @@ def set_session_access_time(request: HttpRequest) -> None:
     request.session.modified = True
 
 
+@bridge_resolver
 def handle_executor_request(info: Info, request: RequestType) -> ResponseType:
     http_request: HttpRequest = info.context.request
     check_session_access_time(http_request)
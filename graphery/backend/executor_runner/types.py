@@ -9,9 +9,9 @@ from ..types.django_types import JSONType
 
 @strawberry.input
 class RequestOptionType:
-    rand_seed: Optional[int]
-    float_precision: Optional[int]
-    input_list: Optional[List[str]]
+    rand_seed: Optional[int] = None
+    float_precision: Optional[int] = None
+    input_list: Optional[List[str]] = None
 
 
 @strawberry.input
@@ -19,7 +19,7 @@ class RequestType:
     code: str
     graph: str
     version: str
-    options: Optional[RequestOptionType]
+    options: Optional[RequestOptionType] = None
 
 
 class RequestOptionTypeJSON(TypedDict):
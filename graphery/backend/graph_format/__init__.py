@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Final, List, Mapping, Set, Tuple, TypedDict
+
+from django.core.exceptions import ValidationError
+
+from ..json_codec import JSONObject
+
+__all__ = [
+    "GRAPH_TYPES",
+    "DegreeSummary",
+    "GraphMeta",
+    "normalize_graph_json",
+    "COMPACT_MAGIC",
+    "encode_compact",
+    "decode_compact",
+    "compute_graph_layouts",
+    "compute_stored_graph_layouts",
+]
+
+# the graphology serialization format, https://graphology.github.io/serialization
+GRAPH_TYPES: Final[Set[str]] = {"mixed", "directed", "undirected"}
+_DEFAULT_OPTIONS: Final[Mapping[str, Any]] = {
+    "type": "mixed",
+    "multi": False,
+    "allowSelfLoops": True,
+}
+
+
+class DegreeSummary(TypedDict):
+    min: int
+    max: int
+    mean: float
+
+
+class GraphMeta(TypedDict):
+    node_count: int
+    edge_count: int
+    type: str
+    directed: bool
+    multi: bool
+    self_loop_count: int
+    degree: DegreeSummary
+
+
+def _key_of(value: Any, where: str) -> str:
+    # graphology keys are strings, numbers are taken and turned into strings
+    if isinstance(value, str):
+        return value
+    if isinstance(value, int) and not isinstance(value, bool):
+        return str(value)
+    raise ValidationError(f"{where} must be a string or an integer, but got {value!r}")
+
+
+def _attributes_of(item: Mapping, where: str) -> Dict:
+    attributes = item.get("attributes", {})
+    if not isinstance(attributes, dict):
+        raise ValidationError(f"attributes of {where} must be an object")
+    return attributes
+
+
+def _options_of(graph_json: Mapping) -> Dict[str, Any]:
+    options = graph_json.get("options", {})
+    if not isinstance(options, dict):
+        raise ValidationError("options of the graph must be an object")
+
+    options = {**_DEFAULT_OPTIONS, **options}
+    if options["type"] not in GRAPH_TYPES:
+        raise ValidationError(
+            f"graph type must be one of {sorted(GRAPH_TYPES)}, but got {options['type']!r}"
+        )
+    for flag in ("multi", "allowSelfLoops"):
+        if not isinstance(options[flag], bool):
+            raise ValidationError(f"graph option {flag} must be a boolean")
+
+    return options
+
+
+def _list_of(graph_json: Mapping, name: str) -> List:
+    items = graph_json.get(name, [])
+    if not isinstance(items, list):
+        raise ValidationError(f"{name} of the graph must be a list")
+    return items
+
+
+def normalize_graph_json(graph_json: Mapping) -> Tuple[Dict, GraphMeta]:
+    """
+    validate a graph in the graphology serialization format and normalize it,
+    in one pass over the nodes and one over the edges.
+    node keys are indexed to check duplicated nodes and dangling edges.
+    keys are turned into strings and missing attributes are filled in,
+    while missing sections of the graph are left out as they are.
+    :param graph_json: the parsed graph json
+    :return: the normalized graph json and the graph meta data
+    :raise ValidationError: when the graph is malformed
+    """
+    if not isinstance(graph_json, Mapping):
+        raise ValidationError("Graph json must be an object.")
+
+    changed = False
+    normalized: Dict[str, Any] = dict(graph_json)
+
+    if "attributes" in graph_json:
+        _attributes_of(graph_json, "the graph")
+
+    options = _options_of(graph_json)
+    graph_type = options["type"]
+
+    degrees: Dict[str, int] = {}
+    if "nodes" in graph_json:
+        nodes = []
+        for index, node in enumerate(_list_of(graph_json, "nodes")):
+            if not isinstance(node, dict) or "key" not in node:
+                raise ValidationError(f"node {index} must be an object with a key")
+
+            key = _key_of(node["key"], f"key of node {index}")
+            if key in degrees:
+                raise ValidationError(f"node key {key!r} is duplicated")
+            degrees[key] = 0
+
+            attributes = _attributes_of(node, f"node {key!r}")
+            if key != node["key"] or "attributes" not in node:
+                changed = True
+                node = {**node, "key": key, "attributes": attributes}
+            nodes.append(node)
+        normalized["nodes"] = nodes
+
+    self_loop_count = 0
+    edge_count = 0
+    if "edges" in graph_json:
+        edges = []
+        edge_keys: Set[str] = set()
+        endpoints: Set[Tuple[bool, str, str]] = set()
+        for index, edge in enumerate(_list_of(graph_json, "edges")):
+            if (
+                not isinstance(edge, dict)
+                or "source" not in edge
+                or "target" not in edge
+            ):
+                raise ValidationError(
+                    f"edge {index} must be an object with a source and a target"
+                )
+
+            source = _key_of(edge["source"], f"source of edge {index}")
+            target = _key_of(edge["target"], f"target of edge {index}")
+            for end in (source, target):
+                if end not in degrees:
+                    raise ValidationError(
+                        f"edge {index} refers to unknown node {end!r}"
+                    )
+
+            if "key" in edge:
+                key = _key_of(edge["key"], f"key of edge {index}")
+                if key in edge_keys:
+                    raise ValidationError(f"edge key {key!r} is duplicated")
+                edge_keys.add(key)
+            else:
+                key = None
+
+            undirected = edge.get("undirected", graph_type == "undirected")
+            if not isinstance(undirected, bool):
+                raise ValidationError(f"undirected of edge {index} must be a boolean")
+            if graph_type == "directed" and undirected:
+                raise ValidationError(f"edge {index} is undirected in a directed graph")
+            if graph_type == "undirected" and not undirected:
+                raise ValidationError(
+                    f"edge {index} is directed in an undirected graph"
+                )
+
+            if source == target:
+                if not options["allowSelfLoops"]:
+                    raise ValidationError(
+                        f"edge {index} is a self loop, which the graph does not allow"
+                    )
+                self_loop_count += 1
+
+            if not options["multi"]:
+                pair = (
+                    (min(source, target), max(source, target))
+                    if undirected
+                    else (source, target)
+                )
+                if (undirected, *pair) in endpoints:
+                    raise ValidationError(
+                        f"edge {index} duplicates the edge between {source!r} and {target!r}"
+                    )
+                endpoints.add((undirected, *pair))
+
+            degrees[source] += 1
+            degrees[target] += 1
+            edge_count += 1
+
+            attributes = _attributes_of(edge, f"edge {index}")
+            if (
+                source != edge["source"]
+                or target != edge["target"]
+                or (key is not None and key != edge["key"])
+                or "attributes" not in edge
+            ):
+                changed = True
+                edge = {
+                    **edge,
+                    "source": source,
+                    "target": target,
+                    "attributes": attributes,
+                }
+                if key is not None:
+                    edge["key"] = key
+            edges.append(edge)
+        normalized["edges"] = edges
+
+    if not changed and isinstance(graph_json, JSONObject):
+        # nothing is changed, so the text of the graph can still be used
+        normalized = graph_json
+
+    return normalized, _graph_meta(degrees, edge_count, self_loop_count, options)
+
+
+def _graph_meta(
+    degrees: Mapping[str, int],
+    edge_count: int,
+    self_loop_count: int,
+    options: Mapping[str, Any],
+) -> GraphMeta:
+    node_count = len(degrees)
+    return {
+        "node_count": node_count,
+        "edge_count": edge_count,
+        "type": options["type"],
+        "directed": options["type"] == "directed",
+        "multi": options["multi"],
+        "self_loop_count": self_loop_count,
+        "degree": {
+            "min": min(degrees.values(), default=0),
+            "max": max(degrees.values(), default=0),
+            "mean": (sum(degrees.values()) / node_count) if node_count else 0.0,
+        },
+    }
+
+
+from .compact import *
+from .layout import *
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import struct
+import sys
+import zlib
+from array import array
+from typing import Any, Dict, Final, List, Mapping, Optional
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+from ..json_codec import dumps, loads
+
+__all__ = ["COMPACT_MAGIC", "encode_compact", "decode_compact"]
+
+# the compact format is
+#   magic | zlib( header length (uint32) | header json | column arrays )
+# nodes and edges are stored as columns, one per field and attribute name,
+# so the names are stored once instead of once per node or edge.
+# columns of numbers are packed as little endian arrays,
+# edge endpoints are packed as indexes into the node keys,
+# and other columns are kept as json lists in the header.
+COMPACT_MAGIC: Final[bytes] = b"GRC1"
+_HEADER_LENGTH: Final[struct.Struct] = struct.Struct("<I")
+_INT64_RANGE: Final[range] = range(-(2**63), 2**63)
+
+
+class _Missing:
+    pass
+
+
+_MISSING: Final = _Missing()
+
+
+def _pack_array(typecode: str, values: List, blobs: bytearray) -> Dict[str, Any]:
+    packed = array(typecode, values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+
+    column = {"array": typecode, "offset": len(blobs), "count": len(values)}
+    blobs += packed.tobytes()
+    return column
+
+
+def _unpack_array(column: Mapping[str, Any], blobs: memoryview) -> List:
+    packed = array(column["array"])
+    start = column["offset"]
+    packed.frombytes(blobs[start : start + column["count"] * packed.itemsize])
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tolist()
+
+
+def _pack_column(values: List[Any], blobs: bytearray) -> Dict[str, Any]:
+    missing = [index for index, value in enumerate(values) if value is _MISSING]
+    present = [value for value in values if value is not _MISSING]
+
+    # bool is not taken as int, so that it's not turned into a number
+    if present and all(type(value) is float for value in present):
+        column = _pack_array("d", present, blobs)
+    elif present and all(
+        type(value) is int and value in _INT64_RANGE for value in present
+    ):
+        column = _pack_array("q", present, blobs)
+    else:
+        column = {"json": present}
+
+    if missing:
+        column["missing"] = missing
+    return column
+
+
+def _unpack_column(
+    column: Mapping[str, Any], length: int, blobs: memoryview
+) -> List[Any]:
+    present = column["json"] if "json" in column else _unpack_array(column, blobs)
+    if not (missing := column.get("missing")):
+        return present
+
+    values: List[Any] = [_MISSING] * length
+    missing_set = set(missing)
+    present_iter = iter(present)
+    for index in range(length):
+        if index not in missing_set:
+            values[index] = next(present_iter)
+    return values
+
+
+def _pack_items(
+    items: List[Mapping], fixed_fields: tuple, blobs: bytearray
+) -> Dict[str, Any]:
+    """
+    pack nodes or edges as columns of their fields and of their attributes
+    """
+    field_names: Dict[str, None] = {}
+    attribute_names: Dict[str, None] = {}
+    for item in items:
+        field_names.update(dict.fromkeys(item))
+        attribute_names.update(dict.fromkeys(item.get("attributes", ())))
+
+    for name in (*fixed_fields, "attributes"):
+        field_names.pop(name, None)
+
+    return {
+        "fields": {
+            name: _pack_column([item.get(name, _MISSING) for item in items], blobs)
+            for name in field_names
+        },
+        "attributes": {
+            name: _pack_column(
+                [item.get("attributes", {}).get(name, _MISSING) for item in items],
+                blobs,
+            )
+            for name in attribute_names
+        },
+        "without_attributes": [
+            index for index, item in enumerate(items) if "attributes" not in item
+        ],
+    }
+
+
+def _unpack_items(
+    packed: Mapping[str, Any], items: List[Dict], blobs: memoryview
+) -> List[Dict]:
+    length = len(items)
+    without_attributes = set(packed["without_attributes"])
+    attributes = [
+        None if index in without_attributes else {} for index in range(length)
+    ]
+
+    for name, column in packed["fields"].items():
+        for item, value in zip(items, _unpack_column(column, length, blobs)):
+            if value is not _MISSING:
+                item[name] = value
+
+    for name, column in packed["attributes"].items():
+        for item_attributes, value in zip(
+            attributes, _unpack_column(column, length, blobs)
+        ):
+            if value is not _MISSING:
+                item_attributes[name] = value
+
+    for item, item_attributes in zip(items, attributes):
+        if item_attributes is not None:
+            item["attributes"] = item_attributes
+
+    return items
+
+
+def encode_compact(graph_json: Mapping) -> bytes:
+    """
+    encode a normalized graph in the graphology serialization format
+    to the compact format
+    :param graph_json: the graph normalized by `normalize_graph_json`
+    :return: the compact form
+    """
+    nodes: List[Mapping] = graph_json.get("nodes", [])
+    edges: List[Mapping] = graph_json.get("edges", [])
+    node_index = {node["key"]: index for index, node in enumerate(nodes)}
+
+    blobs = bytearray()
+    header = {
+        "graph": {
+            name: value
+            for name, value in graph_json.items()
+            if name not in ("nodes", "edges")
+        },
+        "sections": [name for name in ("nodes", "edges") if name in graph_json],
+        "node_count": len(nodes),
+        "edge_count": len(edges),
+        "node_keys": [node["key"] for node in nodes],
+        "nodes": _pack_items(nodes, ("key",), blobs),
+        "sources": _pack_array(
+            "I", [node_index[edge["source"]] for edge in edges], blobs
+        ),
+        "targets": _pack_array(
+            "I", [node_index[edge["target"]] for edge in edges], blobs
+        ),
+        "edges": _pack_items(edges, ("source", "target"), blobs),
+    }
+
+    header_text = dumps(header).encode()
+    return COMPACT_MAGIC + zlib.compress(
+        _HEADER_LENGTH.pack(len(header_text)) + header_text + bytes(blobs)
+    )
+
+
+def decode_compact(
+    compact: bytes | memoryview, max_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    decode the compact format back to the graphology serialization format
+    :param compact: the compact form
+    :param max_size: the most bytes the compact form decompresses to,
+                     GRAPHERY_GRAPH_COMPACT_MAX_SIZE by default
+    :return: the graph json
+    :raise ValidationError: when the compact form is malformed or too large
+    """
+    compact = bytes(compact)
+    if not compact.startswith(COMPACT_MAGIC):
+        raise ValidationError("compact graph has an unknown format")
+
+    max_size = max_size or settings.GRAPHERY_GRAPH_COMPACT_MAX_SIZE
+    decompressor = zlib.decompressobj()
+    try:
+        payload = decompressor.decompress(compact[len(COMPACT_MAGIC) :], max_size)
+    except zlib.error:
+        raise ValidationError("compact graph is corrupted")
+    if decompressor.unconsumed_tail:
+        raise ValidationError(
+            f"compact graph is larger than {max_size} bytes when decompressed"
+        )
+    if not decompressor.eof:
+        raise ValidationError("compact graph is corrupted")
+
+    try:
+        return _decode_payload(memoryview(payload))
+    except (
+        struct.error,
+        KeyError,
+        IndexError,
+        TypeError,
+        ValueError,
+        AttributeError,
+    ):
+        raise ValidationError("compact graph is malformed")
+
+
+def _decode_payload(payload: memoryview) -> Dict[str, Any]:
+    (header_length,) = _HEADER_LENGTH.unpack_from(payload)
+    header_end = _HEADER_LENGTH.size + header_length
+    header = loads(bytes(payload[_HEADER_LENGTH.size : header_end]))
+    blobs = payload[header_end:]
+
+    node_keys = header["node_keys"]
+    nodes = _unpack_items(header["nodes"], [{"key": key} for key in node_keys], blobs)
+    edges = _unpack_items(
+        header["edges"],
+        [
+            {"source": node_keys[source], "target": node_keys[target]}
+            for source, target in zip(
+                _unpack_array(header["sources"], blobs),
+                _unpack_array(header["targets"], blobs),
+            )
+        ],
+        blobs,
+    )
+
+    graph_json = dict(header["graph"])
+    if "nodes" in header["sections"]:
+        graph_json["nodes"] = nodes
+    if "edges" in header["sections"]:
+        graph_json["edges"] = edges
+    return graph_json
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Final, List, Mapping, Optional, Sequence, Tuple
+
+from .compact import decode_compact
+from ..json_codec import loads
+
+__all__ = ["compute_graph_layouts", "compute_stored_graph_layouts"]
+
+# attributes of a node which are kept in the layout besides the position
+_DISPLAY_ATTRIBUTES: Final[Tuple[str, ...]] = ("label", "name", "size", "color")
+
+
+def _positions_of(nodes: Sequence[Mapping]) -> List[Tuple[float, float]]:
+    """
+    read the positions of the nodes, and nodes without one are put on a circle
+    """
+    positions: List[Tuple[float, float] | None] = []
+    unplaced = []
+    for index, node in enumerate(nodes):
+        attributes = node.get("attributes", {})
+        x, y = attributes.get("x"), attributes.get("y")
+        if isinstance(x, (int, float)) and isinstance(y, (int, float)):
+            positions.append((float(x), float(y)))
+        else:
+            positions.append(None)
+            unplaced.append(index)
+
+    for order, index in enumerate(unplaced):
+        angle = 2 * math.pi * order / len(unplaced)
+        positions[index] = (math.cos(angle), math.sin(angle))
+
+    return positions
+
+
+def _normalize_positions(
+    positions: List[Tuple[float, float]], precision: int
+) -> Tuple[List[Tuple[float, float]], List[float]]:
+    """
+    scale the positions into the unit square, keeping the aspect ratio,
+    and round them to the precision
+    """
+    if not positions:
+        return [], [0.0, 0.0, 0.0, 0.0]
+
+    min_x = min(x for x, _ in positions)
+    min_y = min(y for _, y in positions)
+    max_x = max(x for x, _ in positions)
+    max_y = max(y for _, y in positions)
+    scale = max(max_x - min_x, max_y - min_y) or 1.0
+
+    return [
+        (round((x - min_x) / scale, precision), round((y - min_y) / scale, precision))
+        for x, y in positions
+    ], [min_x, min_y, max_x, max_y]
+
+
+def _detail_layout(
+    graph_json: Mapping,
+    positions: List[Tuple[float, float]],
+    bounding_box: List[float],
+    options: Mapping[str, Any],
+) -> Dict[str, Any]:
+    nodes = []
+    for node, (x, y) in zip(graph_json.get("nodes", []), positions):
+        attributes = node.get("attributes", {})
+        nodes.append(
+            {
+                "key": node["key"],
+                "attributes": {
+                    "x": x,
+                    "y": y,
+                    **{
+                        name: attributes[name]
+                        for name in _DISPLAY_ATTRIBUTES
+                        if name in attributes
+                    },
+                },
+            }
+        )
+
+    edges = []
+    for edge in graph_json.get("edges", []):
+        # only what's needed to draw an edge is kept
+        layout_edge = {"source": edge["source"], "target": edge["target"]}
+        if "key" in edge:
+            layout_edge["key"] = edge["key"]
+        if "undirected" in edge:
+            layout_edge["undirected"] = edge["undirected"]
+        edges.append(layout_edge)
+
+    return {
+        "attributes": {"level": 0, "boundingBox": bounding_box},
+        "options": dict(options),
+        "nodes": nodes,
+        "edges": edges,
+    }
+
+
+def _clustered_layout(
+    graph_json: Mapping,
+    positions: List[Tuple[float, float]],
+    bounding_box: List[float],
+    options: Mapping[str, Any],
+    level: int,
+    grid_size: int,
+    precision: int,
+) -> Dict[str, Any]:
+    """
+    summarize the graph by putting the nodes in the cells of a grid.
+    a cell becomes a node at the center of its nodes,
+    and the edges between two cells become one edge with the count as weight.
+    """
+    directed = options.get("type") == "directed"
+
+    cluster_of: Dict[str, str] = {}
+    clusters: Dict[str, List[float]] = {}
+    for node, (x, y) in zip(graph_json.get("nodes", []), positions):
+        column = min(int(x * grid_size), grid_size - 1)
+        row = min(int(y * grid_size), grid_size - 1)
+        cluster_key = f"{column}:{row}"
+        cluster_of[node["key"]] = cluster_key
+        cluster = clusters.setdefault(cluster_key, [0.0, 0.0, 0])
+        cluster[0] += x
+        cluster[1] += y
+        cluster[2] += 1
+
+    weights: Dict[Tuple[str, str], int] = {}
+    for edge in graph_json.get("edges", []):
+        source, target = cluster_of[edge["source"]], cluster_of[edge["target"]]
+        if source == target:
+            continue
+        if not directed and source > target:
+            source, target = target, source
+        weights[(source, target)] = weights.get((source, target), 0) + 1
+
+    return {
+        "attributes": {
+            "level": level,
+            "boundingBox": bounding_box,
+            "gridSize": grid_size,
+        },
+        "options": {
+            "type": "directed" if directed else "undirected",
+            "multi": False,
+            "allowSelfLoops": False,
+        },
+        "nodes": [
+            {
+                "key": cluster_key,
+                "attributes": {
+                    "x": round(sum_x / count, precision),
+                    "y": round(sum_y / count, precision),
+                    "size": count,
+                },
+            }
+            for cluster_key, (sum_x, sum_y, count) in clusters.items()
+        ],
+        "edges": [
+            {"source": source, "target": target, "attributes": {"weight": weight}}
+            for (source, target), weight in weights.items()
+        ],
+    }
+
+
+def compute_graph_layouts(
+    graph_json: Mapping,
+    *,
+    grid_sizes: Sequence[int],
+    min_clustered_nodes: int,
+    precision: int,
+) -> List[Dict[str, Any]]:
+    """
+    compute the layouts of a graph from the most detailed to the coarsest.
+    level 0 has every node, with the position scaled into the unit square
+    and rounded to the precision, and without the other attributes.
+    the next levels cluster the nodes on the grids, from the finest grid,
+    and a level is only kept when it has fewer nodes than the level before.
+    this only depends on its arguments, so it can run in a worker process.
+    :param graph_json: the graph normalized by `normalize_graph_json`
+    :param grid_sizes: the numbers of cells on a side of the grids
+    :param min_clustered_nodes: graphs with fewer nodes only get level 0
+    :param precision: the number of digits the positions are rounded to
+    :return: the layouts in the graphology serialization format
+    """
+    nodes = graph_json.get("nodes", [])
+    options = graph_json.get("options", {})
+    positions, bounding_box = _normalize_positions(_positions_of(nodes), precision)
+
+    layouts = [_detail_layout(graph_json, positions, bounding_box, options)]
+    if len(nodes) < min_clustered_nodes:
+        return layouts
+
+    for grid_size in sorted(grid_sizes, reverse=True):
+        layout = _clustered_layout(
+            graph_json,
+            positions,
+            bounding_box,
+            options,
+            len(layouts),
+            grid_size,
+            precision,
+        )
+        if len(layout["nodes"]) < len(layouts[-1]["nodes"]):
+            layouts.append(layout)
+
+    return layouts
+
+
+def compute_stored_graph_layouts(
+    graph_compact: Optional[bytes], graph_json_text: Optional[str], **kwargs
+) -> List[Dict[str, Any]]:
+    """
+    compute the layouts of a graph from the form it's stored in
+    :param graph_compact: the compact form of the graph if it's stored so
+    :param graph_json_text: the graph json text otherwise
+    :param kwargs: the arguments of `compute_graph_layouts`
+    :return: the layouts
+    """
+    if graph_compact is not None:
+        graph_json = decode_compact(graph_compact)
+    elif graph_json_text is not None:
+        graph_json = loads(graph_json_text)
+    else:
+        graph_json = {}
+
+    return compute_graph_layouts(graph_json, **kwargs)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, List
+from uuid import UUID
+
+from django.conf import settings
+from django.db import transaction
+
+from ..graph_format import compute_stored_graph_layouts
+from ..jobs import enqueue_job
+from ..models import Graph, GraphLayout, raw_json_value
+
+__all__ = ["schedule_graph_layouts", "update_graph_layouts"]
+
+
+def _layout_arguments() -> Dict[str, Any]:
+    return {
+        "grid_sizes": settings.GRAPHERY_GRAPH_LAYOUT_GRID_SIZES,
+        "min_clustered_nodes": settings.GRAPHERY_GRAPH_LAYOUT_MIN_CLUSTERED_NODES,
+        "precision": settings.GRAPHERY_GRAPH_LAYOUT_PRECISION,
+    }
+
+
+def _store_layouts(
+    graph_id: UUID | str, source_modified_time: datetime, layouts: List[Dict]
+) -> bool:
+    with transaction.atomic():
+        graph = (
+            Graph.objects.select_for_update()
+            .only("id", "modified_time")
+            .filter(id=graph_id)
+            .first()
+        )
+        # the graph is changed or deleted while the layouts are computed,
+        # and the layouts of the newer graph are computed by another call
+        if graph is None or graph.modified_time != source_modified_time:
+            return False
+
+        GraphLayout.objects.filter(graph=graph).delete()
+        GraphLayout.objects.bulk_create(
+            GraphLayout(
+                graph=graph,
+                level=layout["attributes"]["level"],
+                layout_json=layout,
+                node_count=len(layout["nodes"]),
+                edge_count=len(layout["edges"]),
+                source_modified_time=source_modified_time,
+            )
+            for layout in layouts
+        )
+
+    return True
+
+
+def update_graph_layouts(graph_id: UUID | str) -> bool:
+    """
+    compute the layouts of a graph and replace the stored ones
+    :param graph_id:
+    :return: if the layouts are stored, which is not the case when the graph
+             is changed or deleted in the meantime
+    """
+    graph = Graph.objects.with_raw_json("graph_json").filter(id=graph_id).first()
+    if graph is None:
+        return False
+
+    layouts = compute_stored_graph_layouts(
+        None if graph.graph_compact is None else bytes(graph.graph_compact),
+        raw_json_value(graph, "graph_json"),
+        **_layout_arguments(),
+    )
+
+    return _store_layouts(graph_id, graph.modified_time, layouts)
+
+
+def schedule_graph_layouts(graph_id: UUID) -> None:
+    """
+    queue a job computing the layouts of a graph. the job is committed
+    with the graph, and a graph waiting for its layouts is queued once.
+    :param graph_id:
+    :return:
+    """
+    enqueue_job(
+        update_graph_layouts,
+        dedup_key=f"graph_layouts:{graph_id}",
+        graph_id=str(graph_id),
+    )
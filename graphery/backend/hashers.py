@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import hashlib
+from importlib.util import find_spec
+from typing import List
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+# no model is imported here, since the settings build the hasher list with it
+
+__all__ = [
+    "GrapheryArgon2PasswordHasher",
+    "GrapheryScryptPasswordHasher",
+    "GrapheryPBKDF2PasswordHasher",
+    "HASHERS",
+    "available_hashers",
+    "password_hashers",
+]
+
+
+class GrapheryArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    argon2 with the costs in the settings, which needs argon2-cffi
+    """
+
+    @property
+    def time_cost(self) -> int:
+        return settings.GRAPHERY_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self) -> int:
+        return settings.GRAPHERY_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self) -> int:
+        return settings.GRAPHERY_ARGON2_PARALLELISM
+
+
+class GrapheryScryptPasswordHasher(ScryptPasswordHasher):
+    @property
+    def work_factor(self) -> int:
+        return settings.GRAPHERY_SCRYPT_WORK_FACTOR
+
+
+class GrapheryPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    @property
+    def iterations(self) -> int:
+        return settings.GRAPHERY_PBKDF2_ITERATIONS
+
+
+HASHERS = {
+    "argon2": f"{__name__}.GrapheryArgon2PasswordHasher",
+    "scrypt": f"{__name__}.GrapheryScryptPasswordHasher",
+    "pbkdf2": f"{__name__}.GrapheryPBKDF2PasswordHasher",
+}
+# the other default hashers of django, which only check the older passwords
+_LEGACY_HASHERS = [
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+]
+
+
+def available_hashers() -> List[str]:
+    """
+    the hashers which can run here, in the order they are preferred
+    :return:
+    """
+    return [
+        name
+        for name, available in (
+            ("argon2", find_spec("argon2") is not None),
+            ("scrypt", hasattr(hashlib, "scrypt")),
+            ("pbkdf2", True),
+        )
+        if available
+    ]
+
+
+def password_hashers(preferred: str) -> List[str]:
+    """
+    the PASSWORD_HASHERS setting, whose first hasher hashes the new passwords.
+    the passwords hashed by the others, or with other costs, are hashed again
+    when the users log in
+    :param preferred: argon2, scrypt or pbkdf2. argon2 falls back to the next
+                      available one when argon2-cffi isn't installed
+    :return:
+    """
+    if preferred not in HASHERS:
+        raise ValueError(
+            f"{preferred} is not a password hasher, use one of {', '.join(HASHERS)}"
+        )
+
+    available = available_hashers()
+    if preferred not in available:
+        preferred = available[0]
+
+    # the hashers which aren't available still identify the hashes made by them
+    return (
+        [HASHERS[preferred]]
+        + [path for name, path in HASHERS.items() if name != preferred]
+        + _LEGACY_HASHERS
+    )
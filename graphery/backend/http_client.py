@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from types import ModuleType
+
+# requests is imported the first time a request is made,
+# since importing it takes long for the processes that never make one
+
+__all__ = ["lazy_requests"]
+
+
+@lru_cache(maxsize=None)
+def lazy_requests() -> ModuleType:
+    """
+    the requests module, imported on the first call
+    :return:
+    """
+    import requests
+
+    return requests
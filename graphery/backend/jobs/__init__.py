@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import os
+import socket
+import traceback
+from datetime import timedelta
+from typing import Callable, Collection, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from ..models import Job, JobStatus
+
+__all__ = [
+    "task_path",
+    "enqueue_job",
+    "claim_job",
+    "run_job",
+    "run_next_job",
+    "run_pending_jobs",
+    "requeue_stale_jobs",
+    "delete_finished_jobs",
+    "worker_name",
+]
+
+
+def task_path(task: Callable) -> str:
+    """
+    the import path of a task, which has to be a function at a module level
+    :param task:
+    :return:
+    """
+    path = f"{task.__module__}.{task.__qualname__}"
+    if "<" in path:
+        raise ValueError(f"task {path} can't be imported by the job workers")
+    return path
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue_job(
+    task: Callable,
+    *,
+    priority: int = 0,
+    dedup_key: Optional[str] = None,
+    max_attempts: Optional[int] = None,
+    run_after=None,
+    **kwargs,
+) -> Job:
+    """
+    queue a call of the task for the job workers.
+    the job is a row in the current transaction,
+    so it's only seen by the workers once the transaction is committed.
+    when a job with the same dedup key is queued, that job is returned instead,
+    with the higher of the priorities.
+    :param task: a function at a module level
+    :param priority: jobs with higher priorities run first
+    :param dedup_key: the key of the work the job does
+    :param max_attempts: GRAPHERY_JOB_MAX_ATTEMPTS by default
+    :param run_after: the earliest time the job runs, now by default
+    :param kwargs: the keyword arguments of the task, which have to be JSON
+    :return: the queued job
+    """
+    job = Job(
+        task=task_path(task),
+        kwargs=kwargs,
+        priority=priority,
+        dedup_key=dedup_key,
+        max_attempts=max_attempts or settings.GRAPHERY_JOB_MAX_ATTEMPTS,
+        run_after=run_after or timezone.now(),
+    )
+
+    if dedup_key is None:
+        job.save()
+        return job
+
+    while True:
+        try:
+            with transaction.atomic():
+                job.save()
+            return job
+        except IntegrityError:
+            pass
+
+        try:
+            queued = Job.objects.get(dedup_key=dedup_key, status=JobStatus.QUEUED)
+        except Job.DoesNotExist:
+            # the queued job was claimed after the insert failed,
+            # so the key is free again
+            continue
+
+        if priority > queued.priority:
+            Job.objects.filter(id=queued.id).update(priority=priority)
+            queued.priority = priority
+        return queued
+
+
+def _queued_jobs(task_paths: Optional[Collection[str]]):
+    jobs = Job.objects.filter(
+        status=JobStatus.QUEUED, run_after__lte=timezone.now()
+    ).order_by("-priority", "run_after")
+    if task_paths:
+        jobs = jobs.filter(task__in=task_paths)
+    return jobs
+
+
+def claim_job(
+    worker: str, task_paths: Optional[Collection[str]] = None
+) -> Optional[Job]:
+    """
+    take the next queued job for a worker.
+    in PostgreSQL the job is locked with SKIP LOCKED, so the workers
+    never wait for each other. other databases, like SQLite in tests,
+    take the job by updating it only when it's still queued.
+    :param worker: the name of the worker
+    :param task_paths: only the jobs of these tasks, all tasks by default
+    :return: the job, or None when there is no job to run
+    """
+    claim = {
+        "status": JobStatus.RUNNING,
+        "attempts": F("attempts") + 1,
+        "locked_by": worker,
+        "locked_time": timezone.now(),
+    }
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            job = (
+                _queued_jobs(task_paths)
+                .select_for_update(skip_locked=True)
+                .only("id")
+                .first()
+            )
+            if job is None:
+                return None
+            Job.objects.filter(id=job.id).update(**claim)
+    else:
+        while True:
+            job = _queued_jobs(task_paths).only("id").first()
+            if job is None:
+                return None
+            if Job.objects.filter(id=job.id, status=JobStatus.QUEUED).update(**claim):
+                break
+
+    return Job.objects.get(id=job.id)
+
+
+def run_job(job: Job) -> JobStatus:
+    """
+    run a claimed job, the attempts of which are counted when it's claimed.
+    a failed job is queued again after a delay,
+    which doubles with every attempt, until it runs out of attempts.
+    :param job:
+    :return: the status of the job after running it
+    """
+    try:
+        import_string(job.task)(**job.kwargs)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            job.status = JobStatus.QUEUED
+            job.run_after = timezone.now() + timedelta(
+                seconds=settings.GRAPHERY_JOB_RETRY_DELAY * 2 ** (job.attempts - 1)
+            )
+        else:
+            job.status = JobStatus.FAILED
+    else:
+        job.status = JobStatus.DONE
+
+    job.locked_by, job.locked_time = "", None
+    try:
+        with transaction.atomic():
+            job.save()
+    except IntegrityError:
+        # the same work is queued again while the job was running,
+        # and the queued job does it instead
+        job.status = JobStatus.DONE
+        job.save()
+
+    return job.status
+
+
+def run_next_job(
+    worker: Optional[str] = None, task_paths: Optional[Collection[str]] = None
+) -> Optional[JobStatus]:
+    """
+    claim and run the next job
+    :param worker: the name of the worker, the host and the process by default
+    :param task_paths: only the jobs of these tasks, all tasks by default
+    :return: the status of the job, or None when there is no job to run
+    """
+    job = claim_job(worker or worker_name(), task_paths)
+    if job is None:
+        return None
+    return run_job(job)
+
+
+def run_pending_jobs(
+    task_paths: Optional[Collection[str]] = None, limit: Optional[int] = None
+) -> int:
+    """
+    run the jobs which can run now one by one, until there is none
+    :param task_paths: only the jobs of these tasks, all tasks by default
+    :param limit: the most jobs to run
+    :return: the number of jobs run
+    """
+    count = 0
+    while limit is None or count < limit:
+        if run_next_job(task_paths=task_paths) is None:
+            break
+        count += 1
+    return count
+
+
+def requeue_stale_jobs() -> int:
+    """
+    queue the running jobs again whose workers have not finished them
+    in GRAPHERY_JOB_TIMEOUT seconds, since the workers are likely gone
+    :return: the number of jobs queued again
+    """
+    stale_time = timezone.now() - timedelta(seconds=settings.GRAPHERY_JOB_TIMEOUT)
+    count = 0
+    for job in Job.objects.filter(status=JobStatus.RUNNING, locked_time__lt=stale_time):
+        job.locked_by, job.locked_time = "", None
+        job.status = (
+            JobStatus.QUEUED if job.attempts < job.max_attempts else JobStatus.FAILED
+        )
+        job.last_error = "the worker did not finish the job in time"
+        try:
+            with transaction.atomic():
+                job.save()
+        except IntegrityError:
+            job.status = JobStatus.DONE
+            job.save()
+        count += job.status == JobStatus.QUEUED
+
+    return count
+
+
+def delete_finished_jobs() -> int:
+    """
+    delete the done and failed jobs finished GRAPHERY_JOB_RETENTION seconds ago
+    :return: the number of jobs deleted
+    """
+    finished_time = timezone.now() - timedelta(seconds=settings.GRAPHERY_JOB_RETENTION)
+    count, _ = Job.objects.filter(
+        status__in=(JobStatus.DONE, JobStatus.FAILED),
+        modified_time__lt=finished_time,
+    ).delete()
+    return count
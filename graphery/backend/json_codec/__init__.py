@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Final, Optional, Tuple, Type
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+__all__ = [
+    "JSON_BACKEND",
+    "JSONDecodeError",
+    "JSONEncodeError",
+    "RawJSON",
+    "JSONObject",
+    "loads",
+    "dumps",
+    "to_json_object",
+    "to_json_text",
+]
+
+JSON_BACKEND: Final[str] = "orjson" if orjson is not None else "json"
+
+# orjson errors subclass these, so both backends raise the same errors
+JSONDecodeError: Final[Type[Exception]] = json.JSONDecodeError
+JSONEncodeError: Final[Tuple[Type[Exception], ...]] = (TypeError, ValueError)
+
+
+class RawJSON(str):
+    """
+    JSON text which is known to be valid, like the text read from a JSON column.
+    It is put in responses and in the database as is.
+    """
+
+    __slots__ = ()
+
+
+class JSONObject(dict):
+    """
+    A parsed JSON object which remembers the text it was parsed from or
+    serialized to, so that the text is not made again when the object
+    is stored or sent out.
+    The text is dropped when the object itself is changed,
+    nested values should be replaced instead of being changed in place.
+    """
+
+    __slots__ = ("_raw_json",)
+
+    def __init__(self, *args, raw_json: Optional[str] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._raw_json = raw_json
+
+    @property
+    def raw_json(self) -> Optional[str]:
+        return self._raw_json
+
+    def _changed(self) -> None:
+        self._raw_json = None
+
+    def __setitem__(self, key, value) -> None:
+        self._changed()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key) -> None:
+        self._changed()
+        super().__delitem__(key)
+
+    def update(self, *args, **kwargs) -> None:
+        self._changed()
+        super().update(*args, **kwargs)
+
+    def pop(self, *args):
+        self._changed()
+        return super().pop(*args)
+
+    def popitem(self):
+        self._changed()
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._changed()
+        return super().setdefault(key, default)
+
+    def clear(self) -> None:
+        self._changed()
+        super().clear()
+
+    def __ior__(self, other) -> JSONObject:
+        self._changed()
+        return super().__ior__(other)
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),), {"_raw_json": self._raw_json}
+
+    def __setstate__(self, state) -> None:
+        self._raw_json = state["_raw_json"]
+
+    def __copy__(self) -> JSONObject:
+        return self.__class__(self, raw_json=self._raw_json)
+
+
+def loads(text: str | bytes) -> Any:
+    """
+    parse JSON text with the fastest backend available
+    :param text:
+    :return: the parsed value
+    """
+    if orjson is not None:
+        # orjson only takes exact str, not subclasses like `RawJSON`
+        return orjson.loads(str(text) if isinstance(text, str) else text)
+    return json.loads(text)
+
+
+def dumps(obj: Any) -> str:
+    """
+    serialize an object to JSON text with the fastest backend available
+    :param obj:
+    :return: the JSON text
+    """
+    if isinstance(obj, JSONObject) and obj.raw_json is not None:
+        return obj.raw_json
+
+    if orjson is not None:
+        # non str keys are turned into str like the json module does
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj)
+
+
+def to_json_object(content: str | bytes | dict) -> Any:
+    """
+    turn the content into a parsed value in one pass. text is parsed,
+    and a dict is serialized, which validates it at the same time.
+    the text is kept in the returned `JSONObject` for storing and sending out.
+    :param content: JSON text or a dict
+    :return: a `JSONObject` for a JSON object, or the parsed value otherwise
+    :raise JSONDecodeError: when the text is not valid JSON
+    :raise TypeError or ValueError: when the dict can't be serialized
+    """
+    if isinstance(content, JSONObject) and content.raw_json is not None:
+        return content
+
+    if isinstance(content, (str, bytes)):
+        parsed = loads(content)
+        if not isinstance(parsed, dict):
+            return parsed
+        raw_json = content if isinstance(content, str) else content.decode()
+        return JSONObject(parsed, raw_json=raw_json)
+
+    if isinstance(content, dict):
+        return JSONObject(content, raw_json=dumps(content))
+
+    return content
+
+
+def to_json_text(obj: Any) -> str:
+    """
+    get the JSON text of a value without parsing or serializing it again
+    when the text is known
+    :param obj:
+    :return: the JSON text
+    """
+    if isinstance(obj, RawJSON):
+        return obj
+
+    return dumps(obj)
@@ -0,0 +1,136 @@
+import json
+import platform
+import time
+from dataclasses import asdict
+
+import django
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import override_settings
+from django.utils import timezone
+
+from ...benchmarks import (
+    SCENARIOS,
+    compare_results,
+    run_benchmarks,
+    seed_benchmark_data,
+    stand_in_executor,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds benchmark data, runs the GraphQL scenarios on it and reports "
+        "the latencies, query counts and memory as JSON. "
+        "The seeded data and everything the mutations write are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=int,
+            default=500,
+            help="the number of tutorial anchors seeded, with a graph anchor each",
+        )
+        parser.add_argument(
+            "--iterations", type=int, default=20, help="the measured runs"
+        )
+        parser.add_argument(
+            "--warmup", type=int, default=2, help="the runs before the measured ones"
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="the seed of the data and variables"
+        )
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            default=[],
+            choices=[scenario.name for scenario in SCENARIOS],
+            help="only run this scenario, can be repeated",
+        )
+        parser.add_argument(
+            "--executor-latency",
+            type=float,
+            default=0.0,
+            help="the seconds the stand-in executor takes for every request",
+        )
+        parser.add_argument(
+            "--output", default=None, help="write the report to this file"
+        )
+        parser.add_argument(
+            "--compare",
+            default=None,
+            help="a report to compare the results with",
+        )
+
+    def handle(self, *args, **options):
+        if options["scale"] < 1 or options["iterations"] < 1:
+            raise CommandError("the scale and the iterations have to be positive")
+
+        baseline = None
+        if options["compare"]:
+            with open(options["compare"]) as baseline_file:
+                baseline = json.load(baseline_file)
+
+        with stand_in_executor(options["executor_latency"]) as executor_url:
+            with override_settings(
+                GRAPHERY_EXECUTOR_URL=executor_url, GRAPHERY_PROFILING=False
+            ), transaction.atomic():
+                start_time = time.perf_counter()
+                data = seed_benchmark_data(options["scale"], options["seed"])
+                seed_time = time.perf_counter() - start_time
+
+                try:
+                    results = run_benchmarks(
+                        data,
+                        options["iterations"],
+                        options["warmup"],
+                        options["seed"],
+                        options["scenario"],
+                    )
+                except RuntimeError as e:
+                    raise CommandError(e)
+                finally:
+                    transaction.set_rollback(True)
+
+        report = {
+            "meta": {
+                "time": timezone.now().isoformat(),
+                "scale": options["scale"],
+                "iterations": options["iterations"],
+                "warmup": options["warmup"],
+                "seed": options["seed"],
+                "executor_latency": options["executor_latency"],
+                "seed_seconds": round(seed_time, 3),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+                # the queries are kept in memory when DEBUG is on
+                "debug": settings.DEBUG,
+            },
+            "results": [asdict(result) for result in results],
+        }
+        report_text = json.dumps(report, indent=2)
+
+        if options["output"]:
+            with open(options["output"], "w") as output_file:
+                output_file.write(report_text)
+        else:
+            self.stdout.write(report_text)
+
+        if baseline is not None:
+            # the comparison is kept apart from the report on stdout
+            log = self.stdout if options["output"] else self.stderr
+            for row in compare_results(baseline, report):
+                change = (
+                    f"{row['p50_change']:+.1%}"
+                    if row["p50_change"] is not None
+                    else "n/a"
+                )
+                log.write(
+                    f"{row['name']}: p50 {row['p50_ms'][0]}ms -> {row['p50_ms'][1]}ms "
+                    f"({change}), queries {row['queries'][0]} -> {row['queries'][1]}, "
+                    f"peak memory {row['peak_memory_kb'][0]}KB -> "
+                    f"{row['peak_memory_kb'][1]}KB"
+                )
@@ -0,0 +1,62 @@
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+from ...hashers import HASHERS, available_hashers
+
+
+class Command(BaseCommand):
+    help = (
+        "Times hashing and checking a password with every password hasher "
+        "which can run here, at the costs in the settings, "
+        "to pick GRAPHERY_PASSWORD_HASHER and tune its costs"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations", type=int, default=10, help="the passwords hashed"
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="report in JSON instead of text"
+        )
+
+    def handle(self, *args, **options):
+        if options["iterations"] < 1:
+            raise CommandError("the iterations have to be positive")
+
+        report = {}
+        for name in available_hashers():
+            hasher = import_string(HASHERS[name])()
+            hash_times, check_times = [], []
+            for i in range(options["iterations"]):
+                password = f"benchmark password {i}"
+
+                start_time = time.perf_counter()
+                encoded = hasher.encode(password, hasher.salt())
+                hash_times.append(time.perf_counter() - start_time)
+
+                start_time = time.perf_counter()
+                if not hasher.verify(password, encoded):
+                    raise CommandError(f"{name} didn't check its own hash")
+                check_times.append(time.perf_counter() - start_time)
+
+            report[name] = {
+                "hash_ms": round(statistics.median(hash_times) * 1000, 2),
+                "check_ms": round(statistics.median(check_times) * 1000, 2),
+                "preferred": settings.PASSWORD_HASHERS[0] == HASHERS[name],
+            }
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        for name, times in report.items():
+            self.stdout.write(
+                f"{name}{' (preferred)' if times['preferred'] else ''}: "
+                f"hash {times['hash_ms']}ms, check {times['check_ms']}ms, "
+                f"median of {options['iterations']}"
+            )
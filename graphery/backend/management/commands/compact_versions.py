@@ -0,0 +1,109 @@
+import time
+
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.db.models.functions import Length, Coalesce, Cast
+from django.db.models import Sum, Value, IntegerField, TextField
+
+from ...models import (
+    versioned_models,
+    compact_version_chain,
+    expand_version,
+    versioned_text,
+)
+
+
+class Command(BaseCommand):
+    help = "Stores older tutorial and graph description versions as deltas"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=None,
+            help="keep a full snapshot every n versions",
+        )
+        parser.add_argument(
+            "--expand",
+            action="store_true",
+            help="store every version in full again",
+        )
+        parser.add_argument(
+            "--benchmark",
+            action="store_true",
+            help="measure the time of reading the heads and the oldest versions",
+        )
+
+    def handle(self, *args, **options):
+        for model_cls in versioned_models:
+            before = self._storage_size(model_cls)
+
+            with transaction.atomic():
+                if options["expand"]:
+                    changed = self._expand(model_cls)
+                else:
+                    changed = sum(
+                        compact_version_chain(head, options["interval"])
+                        for head in model_cls.objects.filter(front=None)
+                    )
+
+            after = self._storage_size(model_cls)
+            self.stdout.write(
+                f"{model_cls.__name__}: {changed} versions "
+                f"{'expanded' if options['expand'] else 'compacted'}, "
+                f"text storage {before} -> {after} bytes"
+            )
+
+            if options["benchmark"]:
+                self._benchmark(model_cls)
+
+    @staticmethod
+    def _expand(model_cls) -> int:
+        changed = 0
+        # the newest compacted versions are expanded first,
+        # so that every delta still has a full text to be applied to
+        for head in model_cls.objects.filter(front=None):
+            instance = head
+            while instance is not None:
+                if instance.version_delta is not None:
+                    expand_version(instance)
+                    changed += 1
+                instance = instance.back
+
+        return changed
+
+    @staticmethod
+    def _storage_size(model_cls) -> int:
+        instance = model_cls()
+        sizes = {
+            f"{field_name}_size": Coalesce(
+                Sum(Length(field_name)), Value(0), output_field=IntegerField()
+            )
+            for field_name in instance.delta_fields
+        }
+        sizes["version_delta_size"] = Coalesce(
+            Sum(Length(Cast("version_delta", output_field=TextField()))),
+            Value(0),
+            output_field=IntegerField(),
+        )
+
+        return sum(model_cls.objects.aggregate(**sizes).values())
+
+    def _benchmark(self, model_cls) -> None:
+        instance = model_cls()
+
+        def read_all(queryset) -> float:
+            start = time.perf_counter()
+            for version in queryset:
+                for field_name in instance.delta_fields:
+                    versioned_text(version, field_name)
+            return time.perf_counter() - start
+
+        heads = model_cls.objects.filter(front=None)
+        oldest = model_cls.objects.filter(back=None, version_delta__isnull=False)
+
+        self.stdout.write(
+            f"{model_cls.__name__}: reading {heads.count()} heads took "
+            f"{read_all(heads):.4f}s, reading {oldest.count()} compacted oldest "
+            f"versions took {read_all(oldest):.4f}s"
+        )
@@ -1,11 +1,29 @@
 from django.core.management import BaseCommand
-from strawberry.printer import print_schema
 
-from ...schema import schema  # import your schema here
+from ...schema import get_schema_hash, get_schema_sdl
 
 
 class Command(BaseCommand):
-    help = "Exports the strawberry graphql schema"
+    help = "Exports the strawberry graphql schema, or the hash of it"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hash",
+            action="store_true",
+            help="only print the sha256 of the schema, the one served at "
+            "/graphql/schema/hash",
+        )
+        parser.add_argument(
+            "--output", default=None, help="write the schema to this file"
+        )
 
     def handle(self, *args, **options):
-        print(print_schema(schema))
+        if options["hash"]:
+            self.stdout.write(get_schema_hash())
+            return
+
+        if options["output"]:
+            with open(options["output"], "w") as output_file:
+                output_file.write(get_schema_sdl())
+        else:
+            self.stdout.write(get_schema_sdl())
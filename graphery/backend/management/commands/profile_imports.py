@@ -0,0 +1,157 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from django.core.management import BaseCommand, CommandError
+
+# run in a fresh interpreter, so that nothing is imported already
+_PROFILE_SCRIPT = """
+import json, resource, sys, time
+
+phases = {}
+start = time.perf_counter()
+import django
+django.setup()
+phases["django.setup"] = time.perf_counter() - start
+
+for module in sys.argv[2:]:
+    start = time.perf_counter()
+    __import__(module)
+    phases[f"import {module}"] = time.perf_counter() - start
+
+if sys.argv[1] == "schema":
+    from backend.schema import get_schema
+    start = time.perf_counter()
+    get_schema()
+    phases["build schema"] = time.perf_counter() - start
+
+print(json.dumps({
+    "phases": phases,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}))
+"""
+
+
+def _parse_import_times(stderr: str) -> List[Tuple[str, int, int]]:
+    """
+    the modules in the output of -X importtime
+    :return: the name, the self and the cumulative time in microseconds of each
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, cumulative_time, name = line[len("import time:") :].split("|")
+        modules.append((name.strip(), int(self_time), int(cumulative_time)))
+    return modules
+
+
+class Command(BaseCommand):
+    help = (
+        "Profiles the startup of a process: the time of django.setup, "
+        "of importing modules and of building the schema, "
+        "and the packages and modules that take the longest to import"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--module",
+            action="append",
+            default=[],
+            help="a module imported after django.setup, can be repeated, "
+            "graphery.urls by default",
+        )
+        parser.add_argument(
+            "--no-schema",
+            action="store_true",
+            help="don't build the schema",
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=3,
+            help="the processes started, the median of which is reported",
+        )
+        parser.add_argument(
+            "--top", type=int, default=15, help="the number of modules listed"
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="report in JSON instead of text"
+        )
+
+    def _run(self, modules: List[str], build_schema: bool) -> Tuple[Dict, str]:
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                _PROFILE_SCRIPT,
+                "schema" if build_schema else "-",
+                *modules,
+            ],
+            capture_output=True,
+            text=True,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        )
+        if result.returncode:
+            raise CommandError(result.stderr.strip().splitlines()[-1])
+        return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+    def handle(self, *args, **options):
+        if options["runs"] < 1:
+            raise CommandError("there has to be at least one run")
+
+        modules = options["module"] or ["graphery.urls"]
+        runs = [
+            self._run(modules, not options["no_schema"]) for _ in range(options["runs"])
+        ]
+
+        phases = {
+            phase: statistics.median(run["phases"][phase] for run, _ in runs)
+            for phase in runs[0][0]["phases"]
+        }
+        import_times = _parse_import_times(runs[-1][1])
+        packages = defaultdict(int)
+        for name, self_time, _ in import_times:
+            packages[name.split(".")[0]] += self_time
+        slowest = sorted(import_times, key=lambda module: module[1], reverse=True)
+
+        report = {
+            "phases_ms": {
+                phase: round(time * 1000, 1) for phase, time in phases.items()
+            },
+            "total_ms": round(sum(phases.values()) * 1000, 1),
+            "max_rss_kb": statistics.median(run["max_rss_kb"] for run, _ in runs),
+            "packages_ms": {
+                package: round(time / 1000, 1)
+                for package, time in sorted(
+                    packages.items(), key=lambda item: item[1], reverse=True
+                )[: options["top"]]
+            },
+            "modules_ms": {
+                name: round(self_time / 1000, 1)
+                for name, self_time, _ in slowest[: options["top"]]
+            },
+        }
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(
+            f"startup {report['total_ms']}ms, max rss {report['max_rss_kb']}KB, "
+            f"median of {options['runs']} runs"
+        )
+        for title, key in (
+            ("phases", "phases_ms"),
+            ("packages by import time", "packages_ms"),
+            ("modules by their own import time", "modules_ms"),
+        ):
+            self.stdout.write(f"\n{title}:")
+            for name, time in report[key].items():
+                self.stdout.write(f"  {time:>8.1f}ms  {name}")
@@ -0,0 +1,73 @@
+import time
+
+from django.core.management import BaseCommand
+
+from ...execution_precompute import (
+    PrecomputeStatus,
+    enqueue_execution_pairs,
+    execution_pairs,
+    precompute_execution_results,
+)
+
+
+class Command(BaseCommand):
+    help = "Computes the execution results of every code and graph pair"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--code",
+            action="append",
+            default=[],
+            help="only the pairs of the code with this id, can be repeated",
+        )
+        parser.add_argument(
+            "--graph-anchor",
+            action="append",
+            default=[],
+            help="only the pairs of the graph anchor with this id, can be repeated",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="compute the results which are up to date as well",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="the most executions running at the same time",
+        )
+        parser.add_argument(
+            "--queue",
+            action="store_true",
+            help="queue the pairs for the job workers instead of computing them here",
+        )
+
+    def handle(self, *args, **options):
+        if options["code"] or options["graph_anchor"]:
+            pairs = execution_pairs(
+                code_ids=options["code"], graph_anchor_ids=options["graph_anchor"]
+            )
+        else:
+            pairs = execution_pairs(everything=True)
+
+        if options["queue"]:
+            self.stdout.write(f"{enqueue_execution_pairs(pairs)} pairs queued")
+            return
+
+        start = time.perf_counter()
+        counts = precompute_execution_results(
+            pairs, force=options["force"], max_workers=options["workers"]
+        )
+
+        self.stdout.write(
+            f"{len(pairs)} pairs in {time.perf_counter() - start:.2f}s: "
+            + ", ".join(
+                f"{counts[status]} {status.value}" for status in PrecomputeStatus
+            )
+        )
+        if counts[PrecomputeStatus.FAILED]:
+            self.stderr.write(
+                f"{counts[PrecomputeStatus.FAILED]} executions failed, "
+                f"run the command again to retry them"
+            )
@@ -0,0 +1,129 @@
+import multiprocessing
+import signal
+import time
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+_stopping = False
+
+
+def _stop(*_) -> None:
+    global _stopping
+    _stopping = True
+
+
+def _setup_worker() -> None:
+    import django
+
+    django.setup()
+    # the command stops the workers, which finish their current jobs first
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, _stop)
+
+
+def _work(task_paths: Optional[List[str]], once: bool, poll_interval: float) -> int:
+    """
+    run jobs in a worker process until it's stopped,
+    or until there is no job to run when `once` is set
+    :return: the number of jobs run
+    """
+    from django.db import close_old_connections
+
+    from ...jobs import (
+        delete_finished_jobs,
+        requeue_stale_jobs,
+        run_next_job,
+        worker_name,
+    )
+
+    worker = worker_name()
+    count = 0
+    while not _stopping:
+        close_old_connections()
+        if run_next_job(worker, task_paths) is not None:
+            count += 1
+            continue
+
+        if once:
+            break
+        requeue_stale_jobs()
+        delete_finished_jobs()
+        time.sleep(poll_interval)
+
+    close_old_connections()
+    return count
+
+
+def _run_worker(counts, *arguments) -> None:
+    """
+    the entry of a worker process, which reports the number of jobs it runs
+    """
+    _setup_worker()
+    counts.put(_work(*arguments))
+
+
+class Command(BaseCommand):
+    help = "Runs the queued background jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=None,
+            help="the number of worker processes, GRAPHERY_JOB_WORKERS by default",
+        )
+        parser.add_argument(
+            "--task",
+            action="append",
+            default=[],
+            help="only the jobs of the task at this import path, can be repeated",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="stop when there is no job to run instead of waiting for more",
+        )
+        parser.add_argument(
+            "--poll",
+            type=float,
+            default=None,
+            help="the seconds between checks for new jobs, "
+            "GRAPHERY_JOB_POLL_INTERVAL by default",
+        )
+
+    def handle(self, *args, **options):
+        processes = options["processes"] or settings.GRAPHERY_JOB_WORKERS
+        arguments = (
+            options["task"] or None,
+            options["once"],
+            options["poll"] or settings.GRAPHERY_JOB_POLL_INTERVAL,
+        )
+
+        # stopping the command stops the workers the same way as ctrl-c
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        context = multiprocessing.get_context("spawn")
+        counts = context.SimpleQueue()
+        workers = [
+            context.Process(target=_run_worker, args=(counts, *arguments))
+            for _ in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            self.stdout.write("stopping the workers after their current jobs")
+            # the workers catch SIGTERM and stop after their current jobs
+            for worker in workers:
+                worker.terminate()
+            for worker in workers:
+                worker.join()
+
+        count = 0
+        while not counts.empty():
+            count += counts.get()
+        self.stdout.write(f"{count} jobs run by {processes} workers")
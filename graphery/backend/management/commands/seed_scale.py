@@ -0,0 +1,103 @@
+import time
+
+from django.core.exceptions import ValidationError
+from django.core.management import BaseCommand, CommandError
+from django.core.validators import validate_slug
+
+from ...baker_recipes.make_scale_examples import make_scale_example
+from ...models import LangCode, TutorialAnchor
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates users, anchors, multilingual version chains, large graphs "
+        "and synthetic execution results at scale, without the executor"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--prefix",
+            default="scale",
+            help="the names and urls of the data start with it",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="the seed of the random data"
+        )
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--tag-anchors", type=int, default=30)
+        parser.add_argument("--tutorial-anchors", type=int, default=200)
+        parser.add_argument("--graph-anchors", type=int, default=300)
+        parser.add_argument(
+            "--lang",
+            action="append",
+            default=[],
+            choices=LangCode.values,
+            help="a language of the tags, tutorials and descriptions, "
+            "can be repeated, EN and ZH_HANS by default",
+        )
+        parser.add_argument(
+            "--versions",
+            type=int,
+            default=5,
+            help="the versions of every tutorial chain",
+        )
+        parser.add_argument(
+            "--nodes", type=int, default=200, help="the most nodes in a graph"
+        )
+        parser.add_argument(
+            "--edges", type=int, default=600, help="the most edges in a graph"
+        )
+        parser.add_argument(
+            "--steps", type=int, default=200, help="the most steps in a result"
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=500, help="the rows in a bulk insert"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            validate_slug(options["prefix"])
+        except ValidationError:
+            raise CommandError("the prefix has to be a slug")
+
+        counts = [
+            options[name]
+            for name in ("users", "tutorial_anchors", "graph_anchors", "versions")
+        ]
+        if any(count < 1 for count in counts) or options["batch_size"] < 1:
+            raise CommandError(
+                "there has to be at least one user, tutorial anchor, graph anchor "
+                "and version, and the batch size has to be positive"
+            )
+
+        if TutorialAnchor.objects.filter(
+            url__startswith=f"{options['prefix']}-"
+        ).exists():
+            raise CommandError(
+                f"there is data with the prefix {options['prefix']} already, "
+                f"use another prefix"
+            )
+
+        start_time = time.perf_counter()
+        try:
+            created = make_scale_example(
+                prefix=options["prefix"],
+                seed=options["seed"],
+                users=options["users"],
+                tag_anchors=options["tag_anchors"],
+                tutorial_anchors=options["tutorial_anchors"],
+                graph_anchors=options["graph_anchors"],
+                langs=options["lang"] or (LangCode.EN, LangCode.ZH_HANS),
+                versions=options["versions"],
+                nodes=options["nodes"],
+                edges=options["edges"],
+                steps=options["steps"],
+                batch_size=options["batch_size"],
+            )
+        except ValueError as e:
+            raise CommandError(e)
+
+        self.stdout.write(
+            f"seeded in {time.perf_counter() - start_time:.2f}s: "
+            + ", ".join(f"{count} {name}" for name, count in created.items())
+        )
@@ -0,0 +1,33 @@
+# Generated by Django 4.0.6 on 2026-10-19 12:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0027_update_lang_code"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="graphdescription",
+            name="version_delta",
+            field=models.JSONField(
+                blank=True,
+                editable=False,
+                null=True,
+                verbose_name="delta against the newer version",
+            ),
+        ),
+        migrations.AddField(
+            model_name="tutorial",
+            name="version_delta",
+            field=models.JSONField(
+                blank=True,
+                editable=False,
+                null=True,
+                verbose_name="delta against the newer version",
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.0.6 on 2026-10-19 12:41
+
+import backend.models.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0028_add_version_delta"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="executionresult",
+            name="result_json",
+            field=backend.models.fields.GrapheryJSONField(
+                verbose_name="execution result json"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="executionresult",
+            name="result_json_meta",
+            field=backend.models.fields.GrapheryJSONField(
+                verbose_name="execution result json meta data"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="graph",
+            name="graph_json",
+            field=backend.models.fields.GrapheryJSONField(verbose_name="graph json"),
+        ),
+    ]
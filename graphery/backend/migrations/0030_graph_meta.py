@@ -0,0 +1,137 @@
+# Generated by Django 4.0.6 on 2026-10-19 12:46
+
+import backend.models.fields
+from django.db import migrations
+
+
+class _MalformedGraph(Exception):
+    pass
+
+
+def _key_of(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, int) and not isinstance(value, bool):
+        return str(value)
+    raise _MalformedGraph
+
+
+def _graph_meta(graph_json):
+    # a copy of the checks and the meta data of
+    # backend.graph_format.normalize_graph_json when this was made
+    if not isinstance(graph_json, dict) or not isinstance(
+        graph_json.get("attributes", {}), dict
+    ):
+        raise _MalformedGraph
+
+    options = graph_json.get("options", {})
+    if not isinstance(options, dict):
+        raise _MalformedGraph
+    options = {"type": "mixed", "multi": False, "allowSelfLoops": True, **options}
+    graph_type = options["type"]
+    if graph_type not in ("mixed", "directed", "undirected"):
+        raise _MalformedGraph
+    if not isinstance(options["multi"], bool) or not isinstance(
+        options["allowSelfLoops"], bool
+    ):
+        raise _MalformedGraph
+
+    nodes, edges = graph_json.get("nodes", []), graph_json.get("edges", [])
+    if not isinstance(nodes, list) or not isinstance(edges, list):
+        raise _MalformedGraph
+
+    degrees = {}
+    for node in nodes:
+        if not isinstance(node, dict) or "key" not in node:
+            raise _MalformedGraph
+        key = _key_of(node["key"])
+        if key in degrees or not isinstance(node.get("attributes", {}), dict):
+            raise _MalformedGraph
+        degrees[key] = 0
+
+    edge_keys, endpoints = set(), set()
+    self_loop_count = 0
+    for edge in edges:
+        if not isinstance(edge, dict) or "source" not in edge or "target" not in edge:
+            raise _MalformedGraph
+        source, target = _key_of(edge["source"]), _key_of(edge["target"])
+        if source not in degrees or target not in degrees:
+            raise _MalformedGraph
+        if "key" in edge:
+            key = _key_of(edge["key"])
+            if key in edge_keys:
+                raise _MalformedGraph
+            edge_keys.add(key)
+
+        undirected = edge.get("undirected", graph_type == "undirected")
+        if (
+            not isinstance(undirected, bool)
+            or (graph_type == "directed" and undirected)
+            or (graph_type == "undirected" and not undirected)
+        ):
+            raise _MalformedGraph
+
+        if source == target:
+            if not options["allowSelfLoops"]:
+                raise _MalformedGraph
+            self_loop_count += 1
+
+        if not options["multi"]:
+            pair = (
+                (undirected, min(source, target), max(source, target))
+                if undirected
+                else (undirected, source, target)
+            )
+            if pair in endpoints:
+                raise _MalformedGraph
+            endpoints.add(pair)
+
+        if not isinstance(edge.get("attributes", {}), dict):
+            raise _MalformedGraph
+        degrees[source] += 1
+        degrees[target] += 1
+
+    node_count = len(degrees)
+    return {
+        "node_count": node_count,
+        "edge_count": len(edges),
+        "type": graph_type,
+        "directed": graph_type == "directed",
+        "multi": options["multi"],
+        "self_loop_count": self_loop_count,
+        "degree": {
+            "min": min(degrees.values(), default=0),
+            "max": max(degrees.values(), default=0),
+            "mean": (sum(degrees.values()) / node_count) if node_count else 0.0,
+        },
+    }
+
+
+def compute_graph_meta(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    model = apps.get_model("backend", "Graph")  # type: Graph
+    for obj in model.objects.using(db_alias).all():
+        try:
+            obj.graph_meta = _graph_meta(obj.graph_json)
+        except _MalformedGraph:
+            # malformed graphs stored before are left for the editors to fix
+            continue
+        obj.save(update_fields=["graph_meta"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0029_graphery_json_field"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="graph",
+            name="graph_meta",
+            field=backend.models.fields.GrapheryJSONField(
+                blank=True, default=dict, editable=False, verbose_name="graph meta data"
+            ),
+        ),
+        migrations.RunPython(compute_graph_meta, migrations.RunPython.noop),
+    ]
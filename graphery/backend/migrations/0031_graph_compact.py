@@ -0,0 +1,26 @@
+# Generated by Django 4.0.6 on 2026-10-19 12:49
+
+import backend.models.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0030_graph_meta"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="graph",
+            name="graph_compact",
+            field=models.BinaryField(null=True, verbose_name="compact graph"),
+        ),
+        migrations.AlterField(
+            model_name="graph",
+            name="graph_json",
+            field=backend.models.fields.GrapheryJSONField(
+                null=True, verbose_name="graph json"
+            ),
+        ),
+    ]
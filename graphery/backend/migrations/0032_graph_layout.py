@@ -0,0 +1,62 @@
+# Generated by Django 4.0.6 on 2026-10-19 12:54
+
+import backend.models.fields
+import backend.models.mixins
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0031_graph_compact"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GraphLayout",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_time", models.DateTimeField(auto_now_add=True)),
+                ("modified_time", models.DateTimeField(auto_now=True)),
+                (
+                    "level",
+                    models.PositiveSmallIntegerField(verbose_name="level of detail"),
+                ),
+                (
+                    "layout_json",
+                    backend.models.fields.GrapheryJSONField(verbose_name="layout json"),
+                ),
+                ("node_count", models.PositiveIntegerField(verbose_name="node count")),
+                ("edge_count", models.PositiveIntegerField(verbose_name="edge count")),
+                (
+                    "source_modified_time",
+                    models.DateTimeField(verbose_name="source modified time"),
+                ),
+                (
+                    "graph",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="layouts",
+                        to="backend.graph",
+                    ),
+                ),
+            ],
+            bases=(models.Model, backend.models.mixins.MixinBase),
+        ),
+        migrations.AddConstraint(
+            model_name="graphlayout",
+            constraint=models.UniqueConstraint(
+                fields=("graph", "level"), name="graph layout unique on graph and level"
+            ),
+        ),
+    ]
@@ -0,0 +1,110 @@
+# Generated by Django 4.0.6 on 2026-10-19 12:57
+
+import backend.models.fields
+import backend.models.mixins
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+# the key of the steps in a result json, and the steps in a segment,
+# when this was made
+STEPS_KEY = "result"
+SEGMENT_STEPS = 100
+
+
+def _split_execution_steps(result_json):
+    # a copy of backend.models.executionresult.split_execution_steps
+    steps = result_json.get(STEPS_KEY)
+    if not isinstance(steps, list) or not steps:
+        return result_json, []
+
+    return {key: value for key, value in result_json.items() if key != STEPS_KEY}, steps
+
+
+def split_steps(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    result_model = apps.get_model("backend", "ExecutionResult")
+    segment_model = apps.get_model("backend", "ExecutionResultSegment")
+    segment_size = SEGMENT_STEPS
+    for obj in result_model.objects.using(db_alias).all():
+        result_json, steps = _split_execution_steps(obj.result_json)
+        if not steps:
+            continue
+
+        segment_model.objects.using(db_alias).bulk_create(
+            segment_model(
+                execution_result=obj,
+                start_step=start,
+                step_count=len(steps[start : start + segment_size]),
+                steps=steps[start : start + segment_size],
+            )
+            for start in range(0, len(steps), segment_size)
+        )
+        obj.result_json = result_json
+        obj.step_count = len(steps)
+        obj.save(update_fields=["result_json", "step_count"])
+
+
+def join_steps(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    result_model = apps.get_model("backend", "ExecutionResult")
+    for obj in result_model.objects.using(db_alias).filter(step_count__gt=0):
+        steps = []
+        for segment in obj.segments.order_by("start_step"):
+            steps.extend(segment.steps)
+        obj.result_json = {STEPS_KEY: steps, **obj.result_json}
+        obj.save(update_fields=["result_json"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0032_graph_layout"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="executionresult",
+            name="step_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="step count"
+            ),
+        ),
+        migrations.CreateModel(
+            name="ExecutionResultSegment",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("start_step", models.PositiveIntegerField(verbose_name="start step")),
+                ("step_count", models.PositiveIntegerField(verbose_name="step count")),
+                (
+                    "steps",
+                    backend.models.fields.GrapheryJSONField(verbose_name="steps"),
+                ),
+                (
+                    "execution_result",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="segments",
+                        to="backend.executionresult",
+                    ),
+                ),
+            ],
+            bases=(models.Model, backend.models.mixins.MixinBase),
+        ),
+        migrations.AddConstraint(
+            model_name="executionresultsegment",
+            constraint=models.UniqueConstraint(
+                fields=("execution_result", "start_step"),
+                name="execution result segment unique on result and start step",
+            ),
+        ),
+        migrations.RunPython(split_steps, join_steps),
+    ]
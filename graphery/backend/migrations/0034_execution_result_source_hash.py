@@ -0,0 +1,24 @@
+# Generated by Django 4.0.6 on 2026-10-19 13:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0033_execution_result_segment"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="executionresult",
+            name="source_hash",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                max_length=64,
+                verbose_name="source hash",
+            ),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 4.0.6 on 2026-10-19 13:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0035_job"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="executionresult",
+            index=models.Index(
+                fields=["graph_anchor", "code"], name="execution result graph code"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="graph",
+            index=models.Index(fields=["item_status"], name="status_graph"),
+        ),
+        migrations.AddIndex(
+            model_name="graphanchor",
+            index=models.Index(fields=["item_status"], name="status_graphanchor"),
+        ),
+        migrations.AddIndex(
+            model_name="graphdescription",
+            index=models.Index(
+                fields=["graph_anchor", "lang_code", "item_status"],
+                name="status_graphdescription",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="graphdescription",
+            index=models.Index(
+                condition=models.Q(("item_status", "PUBLISHED")),
+                fields=["graph_anchor", "lang_code"],
+                name="published_graphdescription",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="orderedanchortable",
+            index=models.Index(
+                fields=["tutorial_anchor", "order"],
+                name="ordered anchor tutorial order",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tag",
+            index=models.Index(fields=["item_status"], name="status_tag"),
+        ),
+        migrations.AddIndex(
+            model_name="taganchor",
+            index=models.Index(fields=["item_status"], name="status_taganchor"),
+        ),
+        migrations.AddIndex(
+            model_name="tutorial",
+            index=models.Index(
+                fields=["tutorial_anchor", "lang_code", "item_status"],
+                name="status_tutorial",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tutorial",
+            index=models.Index(
+                condition=models.Q(("item_status", "PUBLISHED")),
+                fields=["tutorial_anchor", "lang_code"],
+                name="published_tutorial",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tutorialanchor",
+            index=models.Index(fields=["item_status"], name="status_tutorialanchor"),
+        ),
+    ]
@@ -0,0 +1,398 @@
+# Generated by Django 4.0.6 on 2026-10-19 13:13
+
+import backend.models.mixins
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+PUBLISHED_MODELS = [
+    (
+        "Tutorial",
+        "PublishedTutorial",
+        "tutorial_anchor",
+        "tutorial",
+        ("title", "abstract", "content_markdown"),
+    ),
+    (
+        "GraphDescription",
+        "PublishedGraphDescription",
+        "graph_anchor",
+        "graph_description",
+        ("title", "description_markdown"),
+    ),
+]
+
+
+def _apply_delta(base, delta):
+    # a copy of backend.models.version_storage.apply_delta when this was made
+    base_lines = base.splitlines(keepends=True)
+    return "".join(
+        op if isinstance(op, str) else "".join(base_lines[op[0] : op[1]])
+        for op in delta
+    )
+
+
+def _full_texts(model_cls, version, delta_fields):
+    if version.version_delta is None:
+        return {field_name: getattr(version, field_name) for field_name in delta_fields}
+
+    base_texts = _full_texts(
+        model_cls, model_cls.objects.get(back=version), delta_fields
+    )
+    return {
+        field_name: _apply_delta(
+            base_texts[field_name], version.version_delta[field_name]
+        )
+        if field_name in version.version_delta
+        else getattr(version, field_name)
+        for field_name in delta_fields
+    }
+
+
+def copy_published(apps, schema_editor):
+    for (
+        model_name,
+        published_model_name,
+        anchor_field,
+        version_field,
+        delta_fields,
+    ) in PUBLISHED_MODELS:
+        model_cls = apps.get_model("backend", model_name)
+        published_model_cls = apps.get_model("backend", published_model_name)
+
+        copied = set()
+        for version in model_cls.objects.filter(item_status="PUBLISHED").order_by(
+            "-created_time"
+        ):
+            key = (getattr(version, f"{anchor_field}_id"), version.lang_code)
+            if key in copied:
+                continue
+            copied.add(key)
+
+            published_model_cls.objects.create(
+                **{f"{anchor_field}_id": key[0], version_field: version},
+                lang_code=version.lang_code,
+                **_full_texts(model_cls, version, delta_fields),
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0036_hot_lookup_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PublishedTutorial",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_time", models.DateTimeField(auto_now_add=True)),
+                ("modified_time", models.DateTimeField(auto_now=True)),
+                (
+                    "lang_code",
+                    models.CharField(
+                        choices=[
+                            ("AF", "Afrikaans"),
+                            ("AR", "Arabic"),
+                            ("AR_DZ", "Algerian Arabic"),
+                            ("AST", "Asturian"),
+                            ("AZ", "Azerbaijani"),
+                            ("BG", "Bulgarian"),
+                            ("BE", "Belarusian"),
+                            ("BN", "Bengali"),
+                            ("BR", "Breton"),
+                            ("BS", "Bosnian"),
+                            ("CA", "Catalan"),
+                            ("CS", "Czech"),
+                            ("CY", "Welsh"),
+                            ("DA", "Danish"),
+                            ("DE", "German"),
+                            ("DSB", "Lower Sorbian"),
+                            ("EL", "Greek"),
+                            ("EN", "English"),
+                            ("EN_AU", "Australian English"),
+                            ("EN_GB", "British English"),
+                            ("EO", "Esperanto"),
+                            ("ES", "Spanish"),
+                            ("ES_AR", "Argentinian Spanish"),
+                            ("ES_CO", "Colombian Spanish"),
+                            ("ES_MX", "Mexican Spanish"),
+                            ("ES_NI", "Nicaraguan Spanish"),
+                            ("ES_VE", "Venezuelan Spanish"),
+                            ("ET", "Estonian"),
+                            ("EU", "Basque"),
+                            ("FA", "Persian"),
+                            ("FI", "Finnish"),
+                            ("FR", "French"),
+                            ("FY", "Frisian"),
+                            ("GA", "Irish"),
+                            ("GD", "Scottish Gaelic"),
+                            ("GL", "Galician"),
+                            ("HE", "Hebrew"),
+                            ("HI", "Hindi"),
+                            ("HR", "Croatian"),
+                            ("HSB", "Upper Sorbian"),
+                            ("HU", "Hungarian"),
+                            ("HY", "Armenian"),
+                            ("IA", "Interlingua"),
+                            ("ID", "Indonesian"),
+                            ("IG", "Igbo"),
+                            ("IO", "Ido"),
+                            ("IS", "Icelandic"),
+                            ("IT", "Italian"),
+                            ("JA", "Japanese"),
+                            ("KA", "Georgian"),
+                            ("KAB", "Kabyle"),
+                            ("KK", "Kazakh"),
+                            ("KM", "Khmer"),
+                            ("KN", "Kannada"),
+                            ("KO", "Korean"),
+                            ("KY", "Kyrgyz"),
+                            ("LB", "Luxembourgish"),
+                            ("LT", "Lithuanian"),
+                            ("LV", "Latvian"),
+                            ("MK", "Macedonian"),
+                            ("ML", "Malayalam"),
+                            ("MN", "Mongolian"),
+                            ("MR", "Marathi"),
+                            ("MS", "Malay"),
+                            ("MY", "Burmese"),
+                            ("NB", "Norwegian Bokmål"),
+                            ("NE", "Nepali"),
+                            ("NL", "Dutch"),
+                            ("NN", "Norwegian Nynorsk"),
+                            ("OS", "Ossetic"),
+                            ("PA", "Punjabi"),
+                            ("PL", "Polish"),
+                            ("PT", "Portuguese"),
+                            ("PT_BR", "Brazilian Portuguese"),
+                            ("RO", "Romanian"),
+                            ("RU", "Russian"),
+                            ("SK", "Slovak"),
+                            ("SL", "Slovenian"),
+                            ("SQ", "Albanian"),
+                            ("SR", "Serbian"),
+                            ("SR_LATN", "Serbian Latin"),
+                            ("SV", "Swedish"),
+                            ("SW", "Swahili"),
+                            ("TA", "Tamil"),
+                            ("TE", "Telugu"),
+                            ("TG", "Tajik"),
+                            ("TH", "Thai"),
+                            ("TK", "Turkmen"),
+                            ("TR", "Turkish"),
+                            ("TT", "Tatar"),
+                            ("UDM", "Udmurt"),
+                            ("UK", "Ukrainian"),
+                            ("UR", "Urdu"),
+                            ("UZ", "Uzbek"),
+                            ("VI", "Vietnamese"),
+                            ("ZH_HANS", "Simplified Chinese"),
+                            ("ZH_HANT", "Traditional Chinese"),
+                        ],
+                        default="EN",
+                        max_length=8,
+                    ),
+                ),
+                (
+                    "title",
+                    models.CharField(max_length=300, verbose_name="tutorial title"),
+                ),
+                ("abstract", models.TextField(verbose_name="tutorial abstract")),
+                (
+                    "content_markdown",
+                    models.TextField(verbose_name="tutorial content in Markdown"),
+                ),
+                (
+                    "tutorial",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="published_copy",
+                        to="backend.tutorial",
+                    ),
+                ),
+                (
+                    "tutorial_anchor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="published_tutorials",
+                        to="backend.tutorialanchor",
+                    ),
+                ),
+            ],
+            bases=(models.Model, backend.models.mixins.MixinBase),
+        ),
+        migrations.CreateModel(
+            name="PublishedGraphDescription",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_time", models.DateTimeField(auto_now_add=True)),
+                ("modified_time", models.DateTimeField(auto_now=True)),
+                (
+                    "lang_code",
+                    models.CharField(
+                        choices=[
+                            ("AF", "Afrikaans"),
+                            ("AR", "Arabic"),
+                            ("AR_DZ", "Algerian Arabic"),
+                            ("AST", "Asturian"),
+                            ("AZ", "Azerbaijani"),
+                            ("BG", "Bulgarian"),
+                            ("BE", "Belarusian"),
+                            ("BN", "Bengali"),
+                            ("BR", "Breton"),
+                            ("BS", "Bosnian"),
+                            ("CA", "Catalan"),
+                            ("CS", "Czech"),
+                            ("CY", "Welsh"),
+                            ("DA", "Danish"),
+                            ("DE", "German"),
+                            ("DSB", "Lower Sorbian"),
+                            ("EL", "Greek"),
+                            ("EN", "English"),
+                            ("EN_AU", "Australian English"),
+                            ("EN_GB", "British English"),
+                            ("EO", "Esperanto"),
+                            ("ES", "Spanish"),
+                            ("ES_AR", "Argentinian Spanish"),
+                            ("ES_CO", "Colombian Spanish"),
+                            ("ES_MX", "Mexican Spanish"),
+                            ("ES_NI", "Nicaraguan Spanish"),
+                            ("ES_VE", "Venezuelan Spanish"),
+                            ("ET", "Estonian"),
+                            ("EU", "Basque"),
+                            ("FA", "Persian"),
+                            ("FI", "Finnish"),
+                            ("FR", "French"),
+                            ("FY", "Frisian"),
+                            ("GA", "Irish"),
+                            ("GD", "Scottish Gaelic"),
+                            ("GL", "Galician"),
+                            ("HE", "Hebrew"),
+                            ("HI", "Hindi"),
+                            ("HR", "Croatian"),
+                            ("HSB", "Upper Sorbian"),
+                            ("HU", "Hungarian"),
+                            ("HY", "Armenian"),
+                            ("IA", "Interlingua"),
+                            ("ID", "Indonesian"),
+                            ("IG", "Igbo"),
+                            ("IO", "Ido"),
+                            ("IS", "Icelandic"),
+                            ("IT", "Italian"),
+                            ("JA", "Japanese"),
+                            ("KA", "Georgian"),
+                            ("KAB", "Kabyle"),
+                            ("KK", "Kazakh"),
+                            ("KM", "Khmer"),
+                            ("KN", "Kannada"),
+                            ("KO", "Korean"),
+                            ("KY", "Kyrgyz"),
+                            ("LB", "Luxembourgish"),
+                            ("LT", "Lithuanian"),
+                            ("LV", "Latvian"),
+                            ("MK", "Macedonian"),
+                            ("ML", "Malayalam"),
+                            ("MN", "Mongolian"),
+                            ("MR", "Marathi"),
+                            ("MS", "Malay"),
+                            ("MY", "Burmese"),
+                            ("NB", "Norwegian Bokmål"),
+                            ("NE", "Nepali"),
+                            ("NL", "Dutch"),
+                            ("NN", "Norwegian Nynorsk"),
+                            ("OS", "Ossetic"),
+                            ("PA", "Punjabi"),
+                            ("PL", "Polish"),
+                            ("PT", "Portuguese"),
+                            ("PT_BR", "Brazilian Portuguese"),
+                            ("RO", "Romanian"),
+                            ("RU", "Russian"),
+                            ("SK", "Slovak"),
+                            ("SL", "Slovenian"),
+                            ("SQ", "Albanian"),
+                            ("SR", "Serbian"),
+                            ("SR_LATN", "Serbian Latin"),
+                            ("SV", "Swedish"),
+                            ("SW", "Swahili"),
+                            ("TA", "Tamil"),
+                            ("TE", "Telugu"),
+                            ("TG", "Tajik"),
+                            ("TH", "Thai"),
+                            ("TK", "Turkmen"),
+                            ("TR", "Turkish"),
+                            ("TT", "Tatar"),
+                            ("UDM", "Udmurt"),
+                            ("UK", "Ukrainian"),
+                            ("UR", "Urdu"),
+                            ("UZ", "Uzbek"),
+                            ("VI", "Vietnamese"),
+                            ("ZH_HANS", "Simplified Chinese"),
+                            ("ZH_HANT", "Traditional Chinese"),
+                        ],
+                        default="EN",
+                        max_length=8,
+                    ),
+                ),
+                (
+                    "title",
+                    models.CharField(
+                        max_length=300, verbose_name="graph description title"
+                    ),
+                ),
+                (
+                    "description_markdown",
+                    models.TextField(verbose_name="graph description markdown"),
+                ),
+                (
+                    "graph_anchor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="published_graph_descriptions",
+                        to="backend.graphanchor",
+                    ),
+                ),
+                (
+                    "graph_description",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="published_copy",
+                        to="backend.graphdescription",
+                    ),
+                ),
+            ],
+            bases=(models.Model, backend.models.mixins.MixinBase),
+        ),
+        migrations.AddConstraint(
+            model_name="publishedtutorial",
+            constraint=models.UniqueConstraint(
+                fields=("tutorial_anchor", "lang_code"),
+                name="unique_with_lang_publishedtutorial",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="publishedgraphdescription",
+            constraint=models.UniqueConstraint(
+                fields=("graph_anchor", "lang_code"),
+                name="unique_with_lang_publishedgraphdescription",
+            ),
+        ),
+        migrations.RunPython(copy_published, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,16 @@
 from .mixins import *
-from .user import User
+from .fields import *
+from .user import User, cached_user_key
 from .tag import *
 from .tutorial import *
 from .graph import *
 from .code import *
 from .executionresult import *
 from .uploads import *
+from .job import *
+from .version_storage import *
+from .published import *
+from .lang_fallback import *
 
 
 model_list = [
@@ -16,8 +21,13 @@ model_list = [
     Tutorial,
     GraphAnchor,
     Graph,
+    GraphLayout,
     GraphDescription,
     Code,
     ExecutionResult,
+    ExecutionResultSegment,
     Uploads,
+    Job,
+    PublishedTutorial,
+    PublishedGraphDescription,
 ]
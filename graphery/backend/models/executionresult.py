@@ -1,8 +1,42 @@
-from django.db import models
+from typing import Any, Dict, List, Tuple, Iterable
 
-from . import Code, GraphAnchor, UUIDMixin, TimeDateMixin
+from django.db import models, transaction
+from django.db.models import F
 
-__all__ = ["ExecutionResult"]
+from . import (
+    Code,
+    GraphAnchor,
+    UUIDMixin,
+    TimeDateMixin,
+    GrapheryJSONField,
+    RawJSONQuerySet,
+    raw_json_value,
+)
+from ..json_codec import RawJSON, dumps, loads, to_json_object, to_json_text
+
+__all__ = ["ExecutionResult", "ExecutionResultSegment", "split_execution_steps"]
+
+# the key of the steps in the result json the executor gives
+STEPS_KEY = "result"
+
+
+def _join_arrays(array_texts: Iterable[str]) -> RawJSON:
+    items = [text.strip()[1:-1].strip() for text in array_texts]
+    return RawJSON(f"[{', '.join(item for item in items if item)}]")
+
+
+def split_execution_steps(result_json: Dict) -> Tuple[Dict, List[Any]]:
+    """
+    split the steps out of a result json
+    :param result_json:
+    :return: the result json without the steps, and the steps,
+             which are empty if the result json has no steps to split
+    """
+    steps = result_json.get(STEPS_KEY)
+    if not isinstance(steps, list) or not steps:
+        return result_json, []
+
+    return {key: value for key, value in result_json.items() if key != STEPS_KEY}, steps
 
 
 class ExecutionResult(UUIDMixin, TimeDateMixin, models.Model):
@@ -12,8 +46,17 @@ class ExecutionResult(UUIDMixin, TimeDateMixin, models.Model):
     graph_anchor = models.ForeignKey(
         GraphAnchor, on_delete=models.PROTECT, related_name="execution_results"
     )
-    result_json = models.JSONField("execution result json")
-    result_json_meta = models.JSONField("execution result json meta data")
+    # the steps of the result are stored in segments when step_count is not 0,
+    # and result_json keeps everything else
+    result_json = GrapheryJSONField("execution result json")
+    result_json_meta = GrapheryJSONField("execution result json meta data")
+    step_count = models.PositiveIntegerField("step count", default=0, editable=False)
+    # the hash of what a precomputed result is computed from
+    source_hash = models.CharField(
+        "source hash", max_length=64, blank=True, default="", editable=False
+    )
+
+    objects = RawJSONQuerySet.as_manager()
 
     class Meta:
         constraints = [
@@ -22,3 +65,108 @@ class ExecutionResult(UUIDMixin, TimeDateMixin, models.Model):
                 name="execution result unique on code and graph",
             )
         ]
+        indexes = [
+            # the results of a graph, which the unique constraint doesn't lead with
+            models.Index(
+                fields=["graph_anchor", "code"],
+                name="execution result graph code",
+            )
+        ]
+
+    @transaction.atomic
+    def replace_steps(self, steps: List[Any], segment_size: int) -> None:
+        """
+        replace the stored steps with segments of the steps.
+        the result has to be saved already.
+        :param steps:
+        :param segment_size: the number of steps in a segment
+        :return:
+        """
+        self.segments.all().delete()
+        ExecutionResultSegment.objects.bulk_create(
+            ExecutionResultSegment(
+                execution_result=self,
+                start_step=start,
+                step_count=len(segment),
+                steps=segment,
+            )
+            for start in range(0, len(steps), segment_size)
+            if (segment := steps[start : start + segment_size])
+        )
+
+        self.step_count = len(steps)
+        ExecutionResult.objects.filter(id=self.id).update(step_count=self.step_count)
+
+    def get_steps(self, offset: int, limit: int) -> RawJSON:
+        """
+        get a range of the steps as JSON text. only the segments
+        in the range are read, and only the ones cut by the range are parsed.
+        :param offset: the index of the first step
+        :param limit: the most steps to get
+        :return:
+        """
+        if not self.step_count:
+            # the steps are not split out of the result json
+            result_json = to_json_object(raw_json_value(self, "result_json"))
+            steps = result_json.get(STEPS_KEY)
+            steps = steps if isinstance(steps, list) else []
+            return RawJSON(dumps(steps[offset : offset + limit]))
+
+        end = offset + limit
+        segment_texts = []
+        for segment in (
+            self.segments.with_raw_json()
+            .annotate(end_step=F("start_step") + F("step_count"))
+            .filter(start_step__lt=end, end_step__gt=offset)
+            .order_by("start_step")
+        ):
+            text = raw_json_value(segment, "steps")
+            if offset <= segment.start_step and segment.end_step <= end:
+                segment_texts.append(text)
+            else:
+                start = max(offset - segment.start_step, 0)
+                segment_texts.append(
+                    dumps(loads(text)[start : end - segment.start_step])
+                )
+
+        return _join_arrays(segment_texts)
+
+    def get_result_json(self) -> RawJSON | Any:
+        """
+        get the result json with its steps, which are put back as JSON text
+        :return:
+        """
+        result_json = raw_json_value(self, "result_json")
+        if not self.step_count:
+            return result_json
+
+        steps = _join_arrays(
+            raw_json_value(segment, "steps")
+            for segment in self.segments.with_raw_json().order_by("start_step")
+        )
+        rest = to_json_text(result_json).strip()[1:-1].strip()
+        return RawJSON(f'{{"{STEPS_KEY}": {steps}{", " if rest else ""}{rest}}}')
+
+
+class ExecutionResultSegment(UUIDMixin, models.Model):
+    """
+    the steps of an execution result from start_step,
+    so that a range of steps is read without reading the others
+    """
+
+    execution_result = models.ForeignKey(
+        ExecutionResult, on_delete=models.CASCADE, related_name="segments"
+    )
+    start_step = models.PositiveIntegerField("start step")
+    step_count = models.PositiveIntegerField("step count")
+    steps = GrapheryJSONField("steps")
+
+    objects = RawJSONQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["execution_result", "start_step"],
+                name="execution result segment unique on result and start step",
+            )
+        ]
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import Any, Final
+
+from django.db import models
+from django.db.models.fields.json import KeyTransform
+from django.db.models.functions import Cast
+
+from ..json_codec import JSONDecodeError, RawJSON, dumps, to_json_object
+
+__all__ = ["GrapheryJSONField", "RawJSONQuerySet", "raw_json_value"]
+
+
+class GrapheryJSONField(models.JSONField):
+    """
+    A JSON field reading and writing through `backend.json_codec`.
+    Objects read from the database keep the text they are parsed from,
+    and objects carrying their text are stored without serializing them again.
+    """
+
+    def from_db_value(self, value, expression, connection):
+        if value is None or isinstance(expression, KeyTransform):
+            return super().from_db_value(value, expression, connection)
+
+        if self.decoder is not None or not isinstance(value, (str, bytes)):
+            return super().from_db_value(value, expression, connection)
+
+        try:
+            return to_json_object(value)
+        except JSONDecodeError:
+            return value
+
+    def get_prep_value(self, value):
+        if value is None or self.encoder is not None:
+            return super().get_prep_value(value)
+
+        return dumps(value)
+
+
+RAW_JSON_SUFFIX: Final[str] = "_raw_json"
+
+
+class RawJSONQuerySet(models.QuerySet):
+    def with_raw_json(self, *field_names: str) -> RawJSONQuerySet:
+        """
+        read JSON columns as text instead of parsing them.
+        the columns are deferred, and their text is annotated
+        as `<field_name>_raw_json`, which is read by `raw_json_value`
+        :param field_names: the JSON fields, all of them if not given
+        :return:
+        """
+        if not field_names:
+            field_names = tuple(
+                field.name
+                for field in self.model._meta.concrete_fields
+                if isinstance(field, GrapheryJSONField)
+            )
+
+        return self.defer(*field_names).annotate(
+            **{
+                f"{field_name}{RAW_JSON_SUFFIX}": Cast(field_name, models.TextField())
+                for field_name in field_names
+            }
+        )
+
+
+def raw_json_value(instance: models.Model, field_name: str) -> RawJSON | Any:
+    """
+    get the value of a JSON field as the text read by `with_raw_json` if there is,
+    or the parsed value otherwise
+    :param instance:
+    :param field_name:
+    :return:
+    """
+    if (
+        raw_json := getattr(instance, f"{field_name}{RAW_JSON_SUFFIX}", None)
+    ) is not None:
+        return RawJSON(raw_json)
+
+    return getattr(instance, field_name)
@@ -1,3 +1,5 @@
+from typing import Dict, Optional
+
 from django.db import models
 
 from . import (
@@ -10,10 +12,22 @@ from . import (
     GraphOrder,
     TutorialAnchor,
     VersionMixin,
+    GrapheryJSONField,
+    RawJSONQuerySet,
+    raw_json_value,
+    indexed_with_status,
 )
+from ..graph_format import encode_compact, decode_compact
+from ..json_codec import to_json_object
 
 
-__all__ = ["GraphAnchor", "Graph", "OrderedAnchorTable", "GraphDescription"]
+__all__ = [
+    "GraphAnchor",
+    "Graph",
+    "GraphLayout",
+    "OrderedAnchorTable",
+    "GraphDescription",
+]
 
 
 class GraphAnchor(UUIDMixin, TimeDateMixin, StatusMixin, models.Model):
@@ -27,6 +41,10 @@ class GraphAnchor(UUIDMixin, TimeDateMixin, StatusMixin, models.Model):
         TutorialAnchor, through="OrderedAnchorTable", related_name="graph_anchors"
     )
 
+    @indexed_with_status((), "graphanchor")
+    class Meta:
+        pass
+
 
 class OrderedAnchorTable(UUIDMixin, TimeDateMixin, models.Model):
     graph_anchor = models.ForeignKey(GraphAnchor, on_delete=models.CASCADE)
@@ -35,16 +53,84 @@ class OrderedAnchorTable(UUIDMixin, TimeDateMixin, models.Model):
         "graph order", choices=GraphOrder.choices, default=GraphOrder.LOW
     )
 
+    class Meta:
+        indexes = [
+            # the graphs of a tutorial in their order
+            models.Index(
+                fields=["tutorial_anchor", "order"],
+                name="ordered anchor tutorial order",
+            )
+        ]
+
 
 class Graph(UUIDMixin, TimeDateMixin, StatusMixin, models.Model):
     graph_anchor = models.OneToOneField(
         GraphAnchor, on_delete=models.PROTECT, related_name="graph"
     )
-    graph_json = models.JSONField("graph json")
+    # large graphs are stored in the compact form, and graph_json is left empty
+    graph_json = GrapheryJSONField("graph json", null=True)
+    graph_compact = models.BinaryField("compact graph", null=True, editable=False)
+    # counts and degree summary of the graph json, computed when it's saved
+    graph_meta = GrapheryJSONField(
+        "graph meta data", default=dict, blank=True, editable=False
+    )
     makers = models.ManyToManyField(User, related_name="graphs")
 
+    objects = RawJSONQuerySet.as_manager()
+
+    @indexed_with_status((), "graph")
+    class Meta:
+        pass
+
+    def get_graph_json(self) -> Dict:
+        """
+        get the graph json, which is decoded only here for graphs stored compactly
+        :return:
+        """
+        if self.graph_compact is not None:
+            return decode_compact(self.graph_compact)
+        return self.graph_json
+
+    def get_graph_compact(self) -> Optional[bytes]:
+        """
+        get the compact form, which is encoded only here for graphs stored as json
+        :return:
+        """
+        if self.graph_compact is not None:
+            return bytes(self.graph_compact)
+        if (graph_json := raw_json_value(self, "graph_json")) is None:
+            return None
+        return encode_compact(to_json_object(graph_json))
+
+
+class GraphLayout(UUIDMixin, TimeDateMixin, models.Model):
+    """
+    a precomputed layout of a graph at a level of detail.
+    level 0 has every node, and higher levels are coarser summaries.
+    """
+
+    graph = models.ForeignKey(Graph, on_delete=models.CASCADE, related_name="layouts")
+    level = models.PositiveSmallIntegerField("level of detail")
+    layout_json = GrapheryJSONField("layout json")
+    node_count = models.PositiveIntegerField("node count")
+    edge_count = models.PositiveIntegerField("edge count")
+    # the modified time of the graph the layout is computed from
+    source_modified_time = models.DateTimeField("source modified time")
+
+    objects = RawJSONQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["graph", "level"],
+                name="graph layout unique on graph and level",
+            )
+        ]
+
 
 class GraphDescription(UUIDMixin, TimeDateMixin, VersionMixin, LangMixin, models.Model):
+    _delta_fields = ("title", "description_markdown")
+
     graph_anchor = models.ForeignKey(
         GraphAnchor, on_delete=models.PROTECT, related_name="graph_descriptions"
     )
@@ -52,5 +138,6 @@ class GraphDescription(UUIDMixin, TimeDateMixin, VersionMixin, LangMixin, models
     title = models.CharField("graph description title", max_length=300)
     description_markdown = models.TextField("graph description markdown")
 
+    @indexed_with_status(["graph_anchor", "lang_code"], "graphdescription")
     class Meta:
         pass
@@ -0,0 +1,55 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from . import UUIDMixin, TimeDateMixin, GrapheryJSONField
+
+__all__ = ["JobStatus", "Job"]
+
+
+class JobStatus(models.TextChoices):
+    QUEUED = "queued", "Queued"
+    RUNNING = "running", "Running"
+    DONE = "done", "Done"
+    FAILED = "failed", "Failed"
+
+
+class Job(UUIDMixin, TimeDateMixin, models.Model):
+    """
+    a piece of background work, which is the function at `task`
+    called with `kwargs` by a job worker
+    """
+
+    task = models.CharField("task path", max_length=200)
+    kwargs = GrapheryJSONField("task keyword arguments", default=dict, blank=True)
+    # jobs with higher priorities run first
+    priority = models.SmallIntegerField("priority", default=0)
+    # only one queued job has the same key, so the same work is queued once
+    dedup_key = models.CharField(
+        "deduplication key", max_length=200, null=True, blank=True
+    )
+    status = models.CharField(
+        "status", max_length=10, choices=JobStatus.choices, default=JobStatus.QUEUED
+    )
+    run_after = models.DateTimeField("run after", default=timezone.now)
+    attempts = models.PositiveSmallIntegerField("attempts", default=0)
+    max_attempts = models.PositiveSmallIntegerField("max attempts", default=3)
+    locked_by = models.CharField("locked by", max_length=200, blank=True, default="")
+    locked_time = models.DateTimeField("locked time", null=True, blank=True)
+    last_error = models.TextField("last error", blank=True, default="")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dedup_key"],
+                condition=Q(status=JobStatus.QUEUED),
+                name="job unique on dedup key while queued",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["-priority", "run_after"],
+                condition=Q(status=JobStatus.QUEUED),
+                name="job queued order",
+            )
+        ]
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, TypeVar
+from uuid import UUID
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Case, IntegerField, Value, When
+
+from . import LangCode
+
+__all__ = [
+    "lang_fallbacks",
+    "lang_order",
+    "first_in_lang",
+    "first_in_lang_by_anchor",
+]
+
+_MODEL = TypeVar("_MODEL", bound=models.Model)
+
+
+def lang_fallbacks(lang: str) -> List[str]:
+    """
+    the languages read for a requested language, in order.
+    those are the language itself, the ones in GRAPHERY_LANG_FALLBACKS,
+    the base language of a regional one, and English at last
+    :param lang:
+    :return:
+    """
+    lang = LangCode(lang)
+    chain = [lang, *settings.GRAPHERY_LANG_FALLBACKS.get(lang, ())]
+
+    base_lang, _, region = lang.partition("_")
+    if region and base_lang in LangCode.values:
+        chain.append(base_lang)
+
+    chain.append(LangCode.EN)
+    return [LangCode(code) for code in dict.fromkeys(chain)]
+
+
+def lang_order(lang: str, field_name: str = "lang_code") -> Case:
+    """
+    the position of the language of a row in the fallbacks of a language
+    :param lang:
+    :param field_name: the language field
+    :return:
+    """
+    chain = lang_fallbacks(lang)
+    return Case(
+        *(
+            When(**{field_name: code}, then=Value(position))
+            for position, code in enumerate(chain)
+        ),
+        default=Value(len(chain)),
+        output_field=IntegerField(),
+    )
+
+
+def _in_fallbacks(query_set: models.QuerySet[_MODEL], lang: str):
+    return query_set.filter(lang_code__in=lang_fallbacks(lang)).alias(
+        lang_position=lang_order(lang)
+    )
+
+
+def first_in_lang(query_set: models.QuerySet[_MODEL], lang: str) -> Optional[_MODEL]:
+    """
+    the row in the requested language, or in the first fallback language
+    there is a row in, in one query
+    :param query_set: the rows of an anchor in all languages
+    :param lang:
+    :return: None if there is no row in any of the fallback languages
+    """
+    return _in_fallbacks(query_set, lang).order_by("lang_position").first()
+
+
+def first_in_lang_by_anchor(
+    query_set: models.QuerySet[_MODEL],
+    lang: str,
+    anchor_field: str,
+    anchor_ids: Iterable[UUID],
+) -> Dict[UUID, _MODEL]:
+    """
+    `first_in_lang` for many anchors in one query, which is used for listings
+    :param query_set: the rows in all languages
+    :param lang:
+    :param anchor_field: the foreign key to the anchor
+    :param anchor_ids:
+    :return: the row of each anchor, anchors without a row are left out
+    """
+    rows: Dict[UUID, _MODEL] = {}
+    for row in (
+        _in_fallbacks(query_set, lang)
+        .filter(**{f"{anchor_field}__in": list(anchor_ids)})
+        .order_by(anchor_field, "lang_position")
+    ):
+        rows.setdefault(getattr(row, f"{anchor_field}_id"), row)
+    return rows
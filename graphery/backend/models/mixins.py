@@ -22,6 +22,7 @@ __all__ = [
     "UserRoles",
     "GraphOrder",
     "unique_with_lang",
+    "indexed_with_status",
 ]
 
 from strawberry import auto
@@ -108,11 +109,20 @@ class StatusMixin(models.Model, MixinBase):
 class VersionMixin(StatusMixin, models.Model, MixinBase):
     _graphql_types = ("back", "front", "edited_by")
     _auto_require = False
+    # text fields which are stored as deltas in older versions
+    _delta_fields: ClassVar[Tuple[str, ...]] = ()
 
     back = models.OneToOneField(
         "self", on_delete=models.SET_NULL, null=True, related_name="front"
     )
     edited_by = models.ForeignKey("User", on_delete=models.SET_NULL, null=True)
+    version_delta = models.JSONField(
+        "delta against the newer version", null=True, blank=True, editable=False
+    )
+
+    @property
+    def delta_fields(self) -> Tuple[str, ...]:
+        return self._delta_fields
 
     class Meta:
         abstract = True
@@ -180,6 +190,46 @@ def unique_with_lang(field_or_iterable: str | Iterable[str], cls_name: str) -> C
     return _helper
 
 
+def indexed_with_status(
+    field_or_iterable: str | Iterable[str], cls_name: str
+) -> Callable:
+    """
+    add the indexes of the lookups filtered by status to the meta class,
+    which are the fields followed by the status,
+    and the fields of the published items only when there are fields
+    :param field_or_iterable: the fields looked up with the status
+    :param cls_name:
+    :return:
+    """
+    if isinstance(field_or_iterable, str):
+        field_or_iterable = [field_or_iterable]
+    fields = list(field_or_iterable)
+
+    def _helper(meta_cls: Type[models.Model]) -> Type[models.Model]:
+        indexes = [
+            models.Index(
+                fields=[*fields, "item_status"], name=f"status_{cls_name.lower()}"
+            )
+        ]
+        if fields:
+            indexes.append(
+                models.Index(
+                    fields=fields,
+                    condition=models.Q(item_status=Status.PUBLISHED),
+                    name=f"published_{cls_name.lower()}",
+                )
+            )
+
+        setattr(
+            meta_cls,
+            "indexes",
+            [*getattr(meta_cls, "indexes", []), *indexes],
+        )
+        return meta_cls
+
+    return _helper
+
+
 def generate_group_name(tag: int | UserRoles) -> str:
     if isinstance(tag, int):
         tag = UserRoles(tag)
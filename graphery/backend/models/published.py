@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+from typing import Dict, NamedTuple, Optional, Type
+from uuid import UUID
+
+from django.db import models
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from . import (
+    CLOSE_OLD_STATUS,
+    GraphAnchor,
+    GraphDescription,
+    LangMixin,
+    Status,
+    TimeDateMixin,
+    Tutorial,
+    TutorialAnchor,
+    UUIDMixin,
+    VersionMixin,
+    unique_with_lang,
+    versioned_text,
+)
+
+__all__ = [
+    "PublishedTutorial",
+    "PublishedGraphDescription",
+    "published_models",
+    "refresh_published",
+]
+
+
+class PublishedMixin(models.Model):
+    # the field of the published version
+    _version_field: str
+
+    def as_version(self) -> VersionMixin:
+        """
+        the published version with its texts taken from this row,
+        so that they are not rebuilt from deltas
+        :return:
+        """
+        version: VersionMixin = getattr(self, self._version_field)
+        for field_name in version.delta_fields:
+            setattr(version, field_name, getattr(self, field_name))
+        version.version_delta = None
+        return version
+
+    class Meta:
+        abstract = True
+
+
+class PublishedTutorial(UUIDMixin, TimeDateMixin, LangMixin, PublishedMixin):
+    """
+    the published tutorial of an anchor in a language, kept in full for reading
+    """
+
+    _version_field = "tutorial"
+
+    tutorial_anchor = models.ForeignKey(
+        TutorialAnchor, on_delete=models.CASCADE, related_name="published_tutorials"
+    )
+    tutorial = models.OneToOneField(
+        Tutorial, on_delete=models.CASCADE, related_name="published_copy"
+    )
+    title = models.CharField("tutorial title", max_length=300)
+    abstract = models.TextField("tutorial abstract")
+    content_markdown = models.TextField("tutorial content in Markdown")
+
+    @unique_with_lang("tutorial_anchor", "publishedtutorial")
+    class Meta:
+        pass
+
+
+class PublishedGraphDescription(UUIDMixin, TimeDateMixin, LangMixin, PublishedMixin):
+    """
+    the published description of a graph anchor in a language,
+    kept in full for reading
+    """
+
+    _version_field = "graph_description"
+
+    graph_anchor = models.ForeignKey(
+        GraphAnchor,
+        on_delete=models.CASCADE,
+        related_name="published_graph_descriptions",
+    )
+    graph_description = models.OneToOneField(
+        GraphDescription, on_delete=models.CASCADE, related_name="published_copy"
+    )
+    title = models.CharField("graph description title", max_length=300)
+    description_markdown = models.TextField("graph description markdown")
+
+    @unique_with_lang("graph_anchor", "publishedgraphdescription")
+    class Meta:
+        pass
+
+
+class _PublishedSpec(NamedTuple):
+    published_model_cls: Type[models.Model]
+    anchor_field: str
+    version_field: str
+
+
+_published_specs: Dict[Type[VersionMixin], _PublishedSpec] = {
+    Tutorial: _PublishedSpec(PublishedTutorial, "tutorial_anchor", "tutorial"),
+    GraphDescription: _PublishedSpec(
+        PublishedGraphDescription, "graph_anchor", "graph_description"
+    ),
+}
+
+published_models = [spec.published_model_cls for spec in _published_specs.values()]
+
+
+def refresh_published(
+    model_cls: Type[VersionMixin], anchor_id: UUID | str, lang_code: str
+) -> Optional[models.Model]:
+    """
+    copy the newest published version of an anchor in a language
+    to the published row, or remove the row when nothing is published
+    :param model_cls: Tutorial or GraphDescription
+    :param anchor_id:
+    :param lang_code:
+    :return: the published row
+    """
+    spec = _published_specs[model_cls]
+    filters = {f"{spec.anchor_field}_id": anchor_id, "lang_code": lang_code}
+
+    version = (
+        model_cls.objects.filter(**filters, item_status=Status.PUBLISHED)
+        .order_by("-created_time")
+        .first()
+    )
+    if version is None:
+        spec.published_model_cls.objects.filter(**filters).delete()
+        return None
+
+    published, _ = spec.published_model_cls.objects.update_or_create(
+        **filters,
+        defaults={
+            spec.version_field: version,
+            **{
+                field_name: versioned_text(version, field_name)
+                for field_name in version.delta_fields
+            },
+        },
+    )
+    return published
+
+
+def _remember_stored_status(
+    sender: Type[VersionMixin], instance: VersionMixin, raw=False, **__
+) -> None:
+    """
+    keep the status the version had before the save,
+    so the older versions are only closed when the status changes
+    """
+    if raw or instance._state.adding:
+        instance._stored_item_status = None
+        return
+
+    instance._stored_item_status = (
+        sender.objects.filter(pk=instance.pk)
+        .values_list("item_status", flat=True)
+        .first()
+    )
+
+
+def _refresh_published_after_save(
+    sender: Type[VersionMixin],
+    instance: VersionMixin,
+    raw=False,
+    update_fields=None,
+    **__,
+) -> None:
+    # compacting and expanding change how the texts are stored, not the texts
+    if raw or (update_fields and "version_delta" in update_fields):
+        return
+
+    spec = _published_specs[sender]
+    anchor_id = getattr(instance, f"{spec.anchor_field}_id")
+    closes_old = instance.item_status in CLOSE_OLD_STATUS and (
+        instance.item_status != getattr(instance, "_stored_item_status", None)
+    )
+
+    if closes_old:
+        # a version published or made private replaces the older ones
+        sender.objects.filter(
+            **{f"{spec.anchor_field}_id": anchor_id},
+            lang_code=instance.lang_code,
+            item_status__in=CLOSE_OLD_STATUS,
+        ).exclude(pk=instance.pk).update(item_status=Status.CLOSED)
+
+    if (
+        closes_old
+        or spec.published_model_cls.objects.filter(
+            **{f"{spec.version_field}_id": instance.pk}
+        ).exists()
+    ):
+        refresh_published(sender, anchor_id, instance.lang_code)
+
+
+def _refresh_published_after_delete(
+    sender: Type[VersionMixin], instance: VersionMixin, **__
+) -> None:
+    if instance.item_status == Status.PUBLISHED:
+        spec = _published_specs[sender]
+        refresh_published(
+            sender, getattr(instance, f"{spec.anchor_field}_id"), instance.lang_code
+        )
+
+
+for _model_cls in _published_specs:
+    pre_save.connect(_remember_stored_status, sender=_model_cls)
+    post_save.connect(_refresh_published_after_save, sender=_model_cls)
+    post_delete.connect(_refresh_published_after_delete, sender=_model_cls)
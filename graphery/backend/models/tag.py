@@ -1,6 +1,13 @@
 from django.db import models
 
-from . import UUIDMixin, TimeDateMixin, StatusMixin, LangMixin, unique_with_lang
+from . import (
+    UUIDMixin,
+    TimeDateMixin,
+    StatusMixin,
+    LangMixin,
+    unique_with_lang,
+    indexed_with_status,
+)
 
 
 __all__ = ["TagAnchor", "Tag"]
@@ -11,6 +18,10 @@ class TagAnchor(UUIDMixin, TimeDateMixin, StatusMixin, models.Model):
         "tag anchor name", max_length=150, null=False, blank=False, unique=True
     )
 
+    @indexed_with_status((), "taganchor")
+    class Meta:
+        pass
+
 
 class Tag(UUIDMixin, TimeDateMixin, StatusMixin, LangMixin, models.Model):
     name = models.CharField(
@@ -23,6 +34,7 @@ class Tag(UUIDMixin, TimeDateMixin, StatusMixin, LangMixin, models.Model):
         "tag description", max_length=512, null=False, blank=True
     )
 
+    @indexed_with_status((), "tag")
     @unique_with_lang("tag_anchor", "tag")
     class Meta:
         pass
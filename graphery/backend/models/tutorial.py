@@ -9,6 +9,7 @@ from . import (
     User,
     RankMixin,
     VersionMixin,
+    indexed_with_status,
 )
 
 __all__ = ["TutorialAnchor", "Tutorial"]
@@ -23,8 +24,14 @@ class TutorialAnchor(UUIDMixin, TimeDateMixin, StatusMixin, RankMixin, models.Mo
     )
     tag_anchors = models.ManyToManyField(TagAnchor, related_name="tutorial_anchors")
 
+    @indexed_with_status((), "tutorialanchor")
+    class Meta:
+        pass
+
 
 class Tutorial(UUIDMixin, TimeDateMixin, VersionMixin, LangMixin, models.Model):
+    _delta_fields = ("title", "abstract", "content_markdown")
+
     tutorial_anchor = models.ForeignKey(
         TutorialAnchor, on_delete=models.PROTECT, related_name="tutorials"
     )
@@ -33,5 +40,6 @@ class Tutorial(UUIDMixin, TimeDateMixin, VersionMixin, LangMixin, models.Model):
     abstract = models.TextField("tutorial abstract", null=False)
     content_markdown = models.TextField("tutorial content in Markdown", null=False)
 
+    @indexed_with_status(["tutorial_anchor", "lang_code"], "tutorial")
     class Meta:
         pass
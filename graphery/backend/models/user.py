@@ -1,21 +1,28 @@
 import warnings
+from typing import Iterable
 
 from django.apps import apps
 from django.contrib import auth
 from django.contrib.auth.base_user import AbstractBaseUser
 from django.contrib.auth.hashers import make_password
-from django.contrib.auth.models import UserManager, PermissionsMixin, Group
+from django.contrib.auth.models import (
+    UserManager,
+    PermissionsMixin,
+    Group,
+    Permission,
+)
 from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.conf import settings
 from django.core.mail import send_mail
-from django.db import models
-from django.db.models.signals import post_save
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from django.utils.crypto import get_random_string
 
 from .mixins import UUIDMixin, UserRoles, TimeDateMixin
 
-__all__ = ["CustomUserManager", "User"]
+__all__ = ["CustomUserManager", "User", "cached_user_key"]
 
 
 class CustomUserManager(UserManager):
@@ -154,3 +161,64 @@ class User(UUIDMixin, TimeDateMixin, AbstractBaseUser, PermissionsMixin):
     def email_user(self, subject, message, from_email=None, **kwargs):
         """Email this user."""
         send_mail(subject, message, from_email, [self.email], **kwargs)
+
+
+def cached_user_key(user_id) -> str:
+    """
+    the key of a user in the cache, see `backend.user_cache`
+    """
+    return f"graphery:user:{user_id}"
+
+
+def _forget_cached_users(user_ids: Iterable) -> None:
+    # dropped again after the commit, in case a request cached the old row
+    # before the transaction was committed
+    keys = [cached_user_key(user_id) for user_id in user_ids]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+@receiver([post_save, post_delete], sender=User)
+def _forget_cached_user(sender, instance: User, **kwargs) -> None:
+    _forget_cached_users([instance.pk])
+
+
+def _user_ids_related_to(sender, related_model, related_ids) -> Iterable:
+    if related_model is Permission:
+        if sender is not Group.permissions.through:
+            return sender.objects.filter(permission__in=related_ids).values_list(
+                "user", flat=True
+            )
+        related_model = Group
+        related_ids = sender.objects.filter(permission__in=related_ids).values_list(
+            "group", flat=True
+        )
+
+    if related_model is Group:
+        return User.groups.through.objects.filter(group__in=related_ids).values_list(
+            "user", flat=True
+        )
+
+    return related_ids
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=Group.permissions.through)
+def _forget_cached_user_permissions(
+    sender, instance, action: str, reverse: bool, model, pk_set, **kwargs
+) -> None:
+    # the users are cached with their groups and permissions, so the users
+    # whose groups or permissions change are dropped from the cache.
+    # the rows are looked up before a clear, while they are still there
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if reverse and action != "pre_clear":
+        related_model, related_ids = model, pk_set
+    else:
+        related_model, related_ids = type(instance), [instance.pk]
+
+    _forget_cached_users(list(_user_ids_related_to(sender, related_model, related_ids)))
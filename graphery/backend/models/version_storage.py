@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, List, Optional, Type, Iterator
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models.signals import pre_save, pre_delete
+
+from . import VersionMixin, Tutorial, GraphDescription
+
+__all__ = [
+    "make_delta",
+    "apply_delta",
+    "delta_size",
+    "versioned_text",
+    "compact_version",
+    "expand_version",
+    "compact_previous_version",
+    "compact_version_chain",
+    "versioned_models",
+]
+
+# a delta is a list of operations rebuilding a text from the text of the
+# next (newer) version. `[start, end]` copies the lines `start:end` from the
+# newer text, and a string is inserted as is.
+DeltaType = List[List[int] | str]
+
+versioned_models: List[Type[VersionMixin]] = [Tutorial, GraphDescription]
+
+
+def make_delta(base: str, target: str) -> DeltaType:
+    """
+    make a line based delta which rebuilds `target` from `base`
+    :param base: the text of the newer version
+    :param target: the text to be stored as delta
+    :return: the delta
+    """
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+
+    delta: DeltaType = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(
+        None, base_lines, target_lines, autojunk=False
+    ).get_opcodes():
+        if tag == "equal":
+            delta.append([i1, i2])
+        elif tag in ("replace", "insert"):
+            delta.append("".join(target_lines[j1:j2]))
+
+    return delta
+
+
+def apply_delta(base: str, delta: DeltaType) -> str:
+    """
+    rebuild a text from the text of the newer version and the delta
+    :param base: the text of the newer version
+    :param delta: the delta made by `make_delta`
+    :return: the rebuilt text
+    """
+    base_lines = base.splitlines(keepends=True)
+    return "".join(
+        op if isinstance(op, str) else "".join(base_lines[op[0] : op[1]])
+        for op in delta
+    )
+
+
+def delta_size(delta: Dict[str, DeltaType]) -> int:
+    """
+    the rough size of the deltas of a version, which is compared
+    with the size of its full texts to decide if it is compacted
+    :param delta: the deltas by the field name
+    :return: the size
+    """
+    return sum(
+        len(op) if isinstance(op, str) else 16 for ops in delta.values() for op in ops
+    )
+
+
+def _full_texts(instance: VersionMixin) -> Dict[str, str]:
+    if instance.version_delta is None:
+        return {
+            field_name: getattr(instance, field_name)
+            for field_name in instance.delta_fields
+        }
+
+    return _rebuild_version(
+        instance._meta.label, instance.pk, instance.modified_time
+    ).copy()
+
+
+@lru_cache(maxsize=settings.GRAPHERY_VERSION_CACHE_SIZE)
+def _rebuild_version(label: str, pk, modified_time) -> Dict[str, str]:
+    """
+    rebuild the full text of a compacted version from its newer version.
+    the modified time is part of the cache key so that an expanded or edited
+    version is never served from the cache
+    """
+    model_cls: Type[VersionMixin] = apps.get_model(label)
+    instance = model_cls.objects.select_related("front").get(pk=pk)
+
+    if instance.version_delta is None:
+        return _full_texts(instance)
+
+    base_texts = _full_texts(instance.front)
+    return {
+        field_name: apply_delta(
+            base_texts[field_name], instance.version_delta[field_name]
+        )
+        if field_name in instance.version_delta
+        else getattr(instance, field_name)
+        for field_name in instance.delta_fields
+    }
+
+
+def versioned_text(instance: VersionMixin, field_name: str) -> str:
+    """
+    get the text of a versioned field, rebuilding it if the version is compacted
+    :param instance: the version
+    :param field_name: the name of the text field
+    :return:
+    """
+    if instance.version_delta is None or field_name not in instance.delta_fields:
+        return getattr(instance, field_name)
+
+    return _full_texts(instance)[field_name]
+
+
+def _get_front(instance: VersionMixin) -> Optional[VersionMixin]:
+    try:
+        return instance.front
+    except instance.__class__.DoesNotExist:
+        return None
+
+
+def expand_version(instance: Optional[VersionMixin]) -> None:
+    """
+    store the full text of a compacted version back in its columns
+    :param instance: the version, nothing happens if it's None or not compacted
+    :return:
+    """
+    if instance is None or instance.version_delta is None:
+        return
+
+    for field_name, text in _full_texts(instance).items():
+        setattr(instance, field_name, text)
+    instance.version_delta = None
+    instance.save(update_fields=[*instance.delta_fields, "version_delta"])
+
+
+def compact_version(instance: VersionMixin) -> bool:
+    """
+    replace the full text of a version with a delta against its newer version.
+    the version is kept as is if it has no newer version or the delta
+    would not be smaller than the text
+    :param instance: the version
+    :return: if the version is compacted
+    """
+    if instance.version_delta is not None:
+        return True
+
+    front = _get_front(instance)
+    if front is None:
+        return False
+
+    base_texts = _full_texts(front)
+    delta = {
+        field_name: make_delta(base_texts[field_name], getattr(instance, field_name))
+        for field_name in instance.delta_fields
+    }
+
+    if delta_size(delta) >= sum(
+        len(getattr(instance, field_name)) for field_name in instance.delta_fields
+    ):
+        return False
+
+    for field_name in instance.delta_fields:
+        setattr(instance, field_name, "")
+    instance.version_delta = delta
+    # modified_time is left out to keep the history intact
+    instance.save(update_fields=[*instance.delta_fields, "version_delta"])
+
+    return True
+
+
+def _compacted_run_length(instance: Optional[VersionMixin], limit: int) -> int:
+    """
+    count the compacted versions right behind the given version
+    """
+    count = 0
+    while instance is not None and instance.version_delta is not None and count < limit:
+        count += 1
+        instance = instance.back
+
+    return count
+
+
+def compact_previous_version(head_object: VersionMixin) -> bool:
+    """
+    called when `head_object` is replaced by a new head.
+    the version behind `head_object` is compacted against `head_object`,
+    unless it's time for a full snapshot.
+    `head_object` itself stays full, since it is still edited in place sometimes.
+    :param head_object: the version which was the head
+    :return: if a version is compacted
+    """
+    previous = head_object.back
+    if previous is None or previous.version_delta is not None:
+        return False
+
+    interval = settings.GRAPHERY_VERSION_SNAPSHOT_INTERVAL
+    if _compacted_run_length(previous.back, interval) + 1 >= interval:
+        return False
+
+    return compact_version(previous)
+
+
+def _iter_chain(head_object: VersionMixin) -> Iterator[VersionMixin]:
+    instance = head_object
+    while instance is not None:
+        yield instance
+        instance = instance.back
+
+
+def compact_version_chain(head_object: VersionMixin, interval: int = None) -> int:
+    """
+    compact a whole version chain ending at `head_object`,
+    keeping the head, the version behind it, and a snapshot
+    every `interval` versions in full
+    :param head_object: the head of the chain
+    :param interval: the snapshot interval
+    :return: the number of compacted versions
+    """
+    interval = interval or settings.GRAPHERY_VERSION_SNAPSHOT_INTERVAL
+    # the oldest version is compacted first, so that its newer version is still full
+    chain = list(_iter_chain(head_object))[2:]
+
+    compacted_count = 0
+    run_length = 0
+    for instance in reversed(chain):
+        if instance.version_delta is not None:
+            run_length += 1
+        elif run_length + 1 < interval and compact_version(instance):
+            compacted_count += 1
+            run_length += 1
+        else:
+            run_length = 0
+
+    return compacted_count
+
+
+def _expand_back_before_text_change(
+    sender: Type[VersionMixin], instance: VersionMixin, raw=False, **__
+) -> None:
+    """
+    the version behind is stored against the text of this version,
+    so it has to be expanded before the text changes
+    """
+    if raw or instance.back_id is None or instance.version_delta is not None:
+        return
+
+    stored = (
+        sender.objects.filter(pk=instance.pk, version_delta__isnull=True)
+        .values(*instance.delta_fields)
+        .first()
+    )
+    if stored is None:
+        return
+
+    if any(
+        stored[field_name] != getattr(instance, field_name)
+        for field_name in instance.delta_fields
+    ):
+        expand_version(sender.objects.get(pk=instance.back_id))
+
+
+def _expand_back_before_delete(
+    sender: Type[VersionMixin], instance: VersionMixin, **__
+) -> None:
+    if instance.back_id is not None:
+        expand_version(sender.objects.get(pk=instance.back_id))
+
+
+for _model_cls in versioned_models:
+    pre_save.connect(_expand_back_before_text_change, sender=_model_cls)
+    pre_delete.connect(_expand_back_before_delete, sender=_model_cls)
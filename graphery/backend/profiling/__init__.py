@@ -0,0 +1,390 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.db import connection
+from django.utils.deprecation import MiddlewareMixin
+from strawberry.extensions import Extension
+
+__all__ = [
+    "OperationProfiler",
+    "ProfilingMiddleware",
+    "OperationStats",
+    "capture_queries",
+    "capture_profiled_queries",
+    "track_executor",
+    "operation_stats",
+    "reset_operation_stats",
+    "prometheus_text",
+]
+
+logger = logging.getLogger(__name__)
+
+ANONYMOUS_OPERATION = "<anonymous>"
+# the operations past GRAPHERY_PROFILING_MAX_OPERATIONS names are counted together
+OTHER_OPERATIONS = "<other>"
+
+
+@dataclass
+class _OperationProfile:
+    """
+    what one operation spends its time on, which is filled while it runs
+    """
+
+    name: str
+    start_time: float = field(default_factory=time.perf_counter)
+    sql_count: int = 0
+    sql_time: float = 0.0
+    executor_time: float = 0.0
+    resolver_times: Dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    resolver_calls: Counter = field(default_factory=Counter)
+    # the resolver paths running every sql, with the parameters left out
+    query_paths: Dict[str, List[str]] = field(default_factory=lambda: defaultdict(list))
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+@dataclass
+class OperationStats:
+    """
+    the aggregates of an operation since the process started
+    """
+
+    name: str
+    count: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    sql_count: int = 0
+    sql_time: float = 0.0
+    executor_time: float = 0.0
+    duplicate_queries: int = 0
+    resolver_times: Dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    resolver_calls: Counter = field(default_factory=Counter)
+
+
+_current_profile: ContextVar[Optional[_OperationProfile]] = ContextVar(
+    "graphery_operation_profile", default=None
+)
+_current_path: ContextVar[Optional[str]] = ContextVar(
+    "graphery_resolver_path", default=None
+)
+
+_stats: Dict[str, OperationStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _record_query(execute, sql, params, many, context):
+    profile = _current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+
+    start_time = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - start_time
+        with profile.lock:
+            profile.sql_count += 1
+            profile.sql_time += duration
+            profile.query_paths[sql].append(_current_path.get() or "")
+
+
+@contextmanager
+def capture_queries() -> Iterator[None]:
+    """
+    count the queries of the running operation made through the connection
+    of this thread. nothing is counted when no operation is profiled,
+    and the queries are counted once when this is nested.
+    """
+    if _record_query in connection.execute_wrappers:
+        yield
+        return
+
+    with connection.execute_wrapper(_record_query):
+        yield
+
+
+@contextmanager
+def capture_profiled_queries() -> Iterator[None]:
+    """
+    count the queries of the running operation made in this thread, such as
+    a thread of a pool running a resolver, when an operation is profiled
+    """
+    if _current_profile.get() is None:
+        yield
+        return
+
+    with capture_queries():
+        yield
+
+
+@contextmanager
+def track_executor() -> Iterator[None]:
+    """
+    add the time spent in the block to the executor time of the running operation
+    """
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        if (profile := _current_profile.get()) is not None:
+            with profile.lock:
+                profile.executor_time += time.perf_counter() - start_time
+
+
+def _resolver_path(info) -> str:
+    """
+    the path of the field without list indices, like `graphAnchors.graph`
+    """
+    keys = []
+    path = info.path
+    while path is not None:
+        if isinstance(path.key, str):
+            keys.append(path.key)
+        path = path.prev
+    return ".".join(reversed(keys))
+
+
+def _report_duplicate_queries(profile: _OperationProfile) -> int:
+    """
+    log the queries run again and again with different parameters,
+    which are usually a field resolved one query per item of a list
+    :return: the number of duplicated queries
+    """
+    threshold = settings.GRAPHERY_PROFILING_DUPLICATE_QUERIES
+    duplicates = 0
+    for sql, paths in profile.query_paths.items():
+        if len(paths) < threshold:
+            continue
+
+        duplicates += len(paths) - 1
+        path, count = Counter(paths).most_common(1)[0]
+        logger.warning(
+            "operation %s ran the same query %d times, %d of them in %s: %s",
+            profile.name,
+            len(paths),
+            count,
+            path or "<outside resolvers>",
+            sql,
+        )
+    return duplicates
+
+
+def _add_to_stats(profile: _OperationProfile, wall_time: float) -> None:
+    duplicates = _report_duplicate_queries(profile)
+
+    with _stats_lock:
+        # the names are chosen by the clients, so their number is bounded
+        name = profile.name
+        if (
+            name not in _stats
+            and len(_stats) >= settings.GRAPHERY_PROFILING_MAX_OPERATIONS
+        ):
+            name = OTHER_OPERATIONS
+        stats = _stats.setdefault(name, OperationStats(name))
+        stats.count += 1
+        stats.total_time += wall_time
+        stats.max_time = max(stats.max_time, wall_time)
+        stats.sql_count += profile.sql_count
+        stats.sql_time += profile.sql_time
+        stats.executor_time += profile.executor_time
+        stats.duplicate_queries += duplicates
+        for field_name, resolver_time in profile.resolver_times.items():
+            stats.resolver_times[field_name] += resolver_time
+        stats.resolver_calls.update(profile.resolver_calls)
+
+
+class OperationProfiler(Extension):
+    """
+    profile every operation when GRAPHERY_PROFILING is on.
+    it records the wall time, the time of every field, the queries,
+    and the time spent waiting for the executor
+    """
+
+    _profile: Optional[_OperationProfile] = None
+
+    def on_request_start(self):
+        if not settings.GRAPHERY_PROFILING:
+            return
+
+        self._profile = _OperationProfile(ANONYMOUS_OPERATION)
+        self._profile_token = _current_profile.set(self._profile)
+        self._capture = capture_queries()
+        self._capture.__enter__()
+
+    def on_request_end(self):
+        if self._profile is None:
+            return
+
+        self._capture.__exit__(None, None, None)
+        _current_profile.reset(self._profile_token)
+
+        # the operation name is known after parsing when it's not given
+        self._profile.name = (
+            self.execution_context.operation_name or ANONYMOUS_OPERATION
+        )
+
+        _add_to_stats(self._profile, time.perf_counter() - self._profile.start_time)
+        self._profile = None
+
+    def _record_resolver(self, field_name: str, start_time: float) -> None:
+        with self._profile.lock:
+            self._profile.resolver_times[field_name] += time.perf_counter() - start_time
+            self._profile.resolver_calls[field_name] += 1
+
+    async def _resolve_async(self, result, field_name: str, path: str, start_time):
+        token = _current_path.set(path)
+        try:
+            return await result
+        finally:
+            _current_path.reset(token)
+            self._record_resolver(field_name, start_time)
+
+    def resolve(self, _next, root, info, *args, **kwargs):
+        if self._profile is None:
+            return _next(root, info, *args, **kwargs)
+
+        field_name = f"{info.parent_type.name}.{info.field_name}"
+        path = _resolver_path(info)
+        start_time = time.perf_counter()
+
+        token = _current_path.set(path)
+        try:
+            result = _next(root, info, *args, **kwargs)
+        finally:
+            _current_path.reset(token)
+
+        if inspect.isawaitable(result):
+            return self._resolve_async(result, field_name, path, start_time)
+
+        self._record_resolver(field_name, start_time)
+        return result
+
+
+class ProfilingMiddleware(MiddlewareMixin):
+    """
+    count the queries of the resolvers the async endpoint runs in the request thread,
+    which the extension, running in the event loop, does not see.
+    under asgi there is no request thread, and the requests are passed on
+    without being adapted to sync
+    """
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        if not settings.GRAPHERY_PROFILING:
+            return self.get_response(request)
+
+        with capture_queries():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        # the resolvers running in threads capture their queries themselves
+        return await self.get_response(request)
+
+
+def operation_stats() -> List[OperationStats]:
+    """
+    a copy of the aggregates of every operation, sorted by the total time
+    """
+    with _stats_lock:
+        copies = [
+            OperationStats(
+                **{
+                    **stats.__dict__,
+                    "resolver_times": dict(stats.resolver_times),
+                    "resolver_calls": Counter(stats.resolver_calls),
+                }
+            )
+            for stats in _stats.values()
+        ]
+    return sorted(copies, key=lambda stats: stats.total_time, reverse=True)
+
+
+def reset_operation_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text() -> str:
+    """
+    the aggregates in the Prometheus text format
+    """
+    metrics = [
+        ("graphery_operation_count", "counter", "operations run", "count"),
+        (
+            "graphery_operation_seconds_total",
+            "counter",
+            "wall time of the operations",
+            "total_time",
+        ),
+        (
+            "graphery_operation_seconds_max",
+            "gauge",
+            "the slowest run of the operations",
+            "max_time",
+        ),
+        ("graphery_operation_sql_queries_total", "counter", "sql queries", "sql_count"),
+        (
+            "graphery_operation_sql_seconds_total",
+            "counter",
+            "time spent in sql queries",
+            "sql_time",
+        ),
+        (
+            "graphery_operation_executor_seconds_total",
+            "counter",
+            "time spent waiting for the executor",
+            "executor_time",
+        ),
+        (
+            "graphery_operation_duplicate_queries_total",
+            "counter",
+            "queries repeated with different parameters",
+            "duplicate_queries",
+        ),
+    ]
+
+    all_stats = operation_stats()
+    lines = []
+    for name, metric_type, description, attribute in metrics:
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for stats in all_stats:
+            lines.append(
+                f'{name}{{operation="{_label(stats.name)}"}} '
+                f"{getattr(stats, attribute)}"
+            )
+
+    for name, description, attribute in (
+        (
+            "graphery_resolver_seconds_total",
+            "time spent in resolvers",
+            "resolver_times",
+        ),
+        ("graphery_resolver_calls_total", "resolver calls", "resolver_calls"),
+    ):
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} counter")
+        for stats in all_stats:
+            for field_name, value in getattr(stats, attribute).items():
+                lines.append(
+                    f'{name}{{operation="{_label(stats.name)}",'
+                    f'field="{_label(field_name)}"}} {value}'
+                )
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import List
+
+import strawberry
+from strawberry.types import Info
+
+from . import OperationStats, operation_stats
+
+__all__ = ["ResolverStatsType", "OperationStatsType", "resolve_operation_stats"]
+
+
+@strawberry.type
+class ResolverStatsType:
+    field: str
+    calls: int
+    seconds: float
+
+
+@strawberry.type
+class OperationStatsType:
+    name: str
+    count: int
+    total_seconds: float
+    max_seconds: float
+    sql_queries: int
+    sql_seconds: float
+    executor_seconds: float
+    duplicate_queries: int
+    resolvers: List[ResolverStatsType]
+
+    @classmethod
+    def from_stats(cls, stats: OperationStats) -> OperationStatsType:
+        return cls(
+            name=stats.name,
+            count=stats.count,
+            total_seconds=stats.total_time,
+            max_seconds=stats.max_time,
+            sql_queries=stats.sql_count,
+            sql_seconds=stats.sql_time,
+            executor_seconds=stats.executor_time,
+            duplicate_queries=stats.duplicate_queries,
+            resolvers=sorted(
+                (
+                    ResolverStatsType(
+                        field=field_name,
+                        calls=stats.resolver_calls[field_name],
+                        seconds=seconds,
+                    )
+                    for field_name, seconds in stats.resolver_times.items()
+                ),
+                key=lambda resolver: resolver.seconds,
+                reverse=True,
+            ),
+        )
+
+
+def resolve_operation_stats(info: Info) -> List[OperationStatsType]:
+    return [OperationStatsType.from_stats(stats) for stats in operation_stats()]
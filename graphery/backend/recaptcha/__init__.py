@@ -1,29 +1,46 @@
 from __future__ import annotations
 
+import asyncio
 import datetime
+import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 
-import requests
 from django.conf import settings
+from django.core.cache import cache
 from typing import TypedDict, Literal, Final, Dict, Optional, List
 
+from .stand_in import *
+from ..http_client import lazy_requests
+
 __all__ = [
     "site_verify_recaptcha",
+    "verify_recaptcha",
+    "averify_recaptcha",
+    "shutdown_recaptcha_executor",
+    "stand_in_recaptcha",
     "VerifyRequest",
     "VerifyResponse",
     "RecaptchaErrorCodesMsg",
-    "RECAPTCHA_ON",
+    "recaptcha_on",
 ]
 
 
-if settings.G_RECAPTCHA_ON or settings.G_RECAPTCHA_SECRET:
-    if not settings.G_RECAPTCHA_ON or not settings.G_RECAPTCHA_SECRET:
-        raise ValueError("ReCaptcha is not set properly")
-    RECAPTCHA_ON = True
-else:
-    RECAPTCHA_ON = False
+def recaptcha_on() -> bool:
+    """
+    if the tokens are verified, which is set by G_RECAPTCHA_ON
+    and needs G_RECAPTCHA_SECRET
+    :return:
+    """
+    if settings.G_RECAPTCHA_ON or settings.G_RECAPTCHA_SECRET:
+        if not settings.G_RECAPTCHA_ON or not settings.G_RECAPTCHA_SECRET:
+            raise ValueError("ReCaptcha is not set properly")
+        return True
+    return False
 
 
-RECAPTCHA_URL = "https://www.google.com/recaptcha/api/siteverify"
+# the error code of the verifications which didn't get an answer from google
+VERIFICATION_FAILED = "verification-failed"
 
 RecaptchaErrorCodesMsg: Final[Dict[str, str]] = {
     "missing-input-secret": "The secret parameter is missing.",
@@ -32,6 +49,7 @@ RecaptchaErrorCodesMsg: Final[Dict[str, str]] = {
     "invalid-input-response": "The response parameter is invalid or malformed.",
     "bad-request": "The request is invalid or malformed.",
     "timeout-or-duplicate": "The response is no longer valid: either is too old or has been used previously.",
+    VERIFICATION_FAILED: "The response could not be verified in time.",
 }
 
 ReCaptchaErrorCodesType = Literal[
@@ -41,6 +59,7 @@ ReCaptchaErrorCodesType = Literal[
     "invalid-input-response",
     "bad-request",
     "timeout-or-duplicate",
+    "verification-failed",
 ]
 
 
@@ -60,11 +79,114 @@ class VerifyResponse(TypedDict, total=False):
     error_codes: Optional[List[ReCaptchaErrorCodesType]]
 
 
-def site_verify_recaptcha(token: str, remote_ip: str | None = None) -> VerifyResponse:
-    if not RECAPTCHA_ON:
-        return VerifyResponse(success=True, score=1.0)
+_executor: Optional[ThreadPoolExecutor] = None
+_session = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """
+    the threads verifying the tokens and the pooled http session they share
+    """
+    global _executor, _session
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                requests = lazy_requests()
+                _session = requests.Session()
+                for prefix in ("https://", "http://"):
+                    _session.mount(
+                        prefix,
+                        requests.adapters.HTTPAdapter(
+                            pool_maxsize=settings.GRAPHERY_RECAPTCHA_WORKERS
+                        ),
+                    )
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.GRAPHERY_RECAPTCHA_WORKERS,
+                    thread_name_prefix="graphery-recaptcha",
+                )
+
+    return _executor
+
+
+def shutdown_recaptcha_executor(wait: bool = True) -> None:
+    """
+    shut down the worker threads and close the session,
+    new ones are made on the next verification
+    :param wait: if waiting for the running verifications to finish
+    :return:
+    """
+    global _executor, _session
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _session.close()
+            _executor = _session = None
+
+
+def _failed(error_code: ReCaptchaErrorCodesType) -> VerifyResponse:
+    return VerifyResponse(success=False, score=0.0, error_codes=[error_code])
+
+
+def _post_verify_request(request: VerifyRequest) -> VerifyResponse:
+    try:
+        response = _session.post(
+            settings.G_RECAPTCHA_URL,
+            data=request,
+            timeout=settings.GRAPHERY_RECAPTCHA_TIMEOUT,
+        )
+        response.raise_for_status()
+        result = response.json()
+    except (lazy_requests().RequestException, ValueError):
+        return _failed(VERIFICATION_FAILED)
+
+    # google names the error codes with a dash
+    if "error-codes" in result:
+        result["error_codes"] = result.pop("error-codes")
+    return result
+
+
+def verify_recaptcha(token: str, remote_ip: str | None = None) -> Future:
+    """
+    start verifying a token in the recaptcha threads, so the caller can do
+    other work while google answers. a token is only sent to google once,
+    since google rejects the tokens it has seen, and the tokens seen in the
+    last GRAPHERY_RECAPTCHA_TOKEN_TTL seconds fail without a request
+    :param token: the response token from the client
+    :param remote_ip:
+    :return: a future of the VerifyResponse
+    """
+    future = Future()
+    if not recaptcha_on():
+        future.set_result(VerifyResponse(success=True, score=1.0))
+        return future
+
+    if not token:
+        future.set_result(_failed("missing-input-response"))
+        return future
+
+    key = f"graphery:recaptcha:{hashlib.sha256(token.encode()).hexdigest()}"
+    if not cache.add(key, True, settings.GRAPHERY_RECAPTCHA_TOKEN_TTL):
+        future.set_result(_failed("timeout-or-duplicate"))
+        return future
 
     request = VerifyRequest(
         secret=settings.G_RECAPTCHA_SECRET, response=token, remoteip=remote_ip
     )
-    return requests.post(RECAPTCHA_URL, json=request).json()
+    return _get_executor().submit(_post_verify_request, request)
+
+
+async def averify_recaptcha(token: str, remote_ip: str | None = None) -> VerifyResponse:
+    """
+    verify a token without blocking the event loop
+    :param token:
+    :param remote_ip:
+    :return:
+    """
+    return await asyncio.wrap_future(verify_recaptcha(token, remote_ip))
+
+
+def site_verify_recaptcha(token: str, remote_ip: str | None = None) -> VerifyResponse:
+    return verify_recaptcha(token, remote_ip).result()
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, List
+from urllib.parse import parse_qs
+
+__all__ = ["stand_in_recaptcha"]
+
+
+@contextmanager
+def stand_in_recaptcha(
+    score: float = 0.9, latency: float = 0.0, received: List[str] | None = None
+) -> Iterator[str]:
+    """
+    serve a stand-in of the google verification on a free local port,
+    which passes every token with the score once and rejects it after
+    :param score: the score of the tokens
+    :param latency: the seconds each verification takes
+    :param received: the tokens the stand-in received are appended to it
+    :return: the url to set as G_RECAPTCHA_URL
+    """
+    seen = set()
+    seen_lock = threading.Lock()
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            form = parse_qs(
+                self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+            )
+            token = form.get("response", [""])[0]
+            with seen_lock:
+                duplicate = token in seen
+                seen.add(token)
+            if received is not None:
+                received.append(token)
+
+            time.sleep(latency)
+            result = (
+                {"success": False, "error-codes": ["timeout-or-duplicate"]}
+                if duplicate
+                else {"success": True, "score": score, "action": "register"}
+            )
+            body = json.dumps(result).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/siteverify"
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
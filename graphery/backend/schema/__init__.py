@@ -1,3 +1,5 @@
+import hashlib
+import threading
 from types import NoneType
 
 from typing import List, Optional
@@ -5,8 +7,10 @@ from typing import List, Optional
 import strawberry
 import strawberry_django
 from strawberry.django import auth
+from strawberry.printer import print_schema
 
 from .permissions import AdminPermission
+from .query_limits import QueryLimiter
 from .resolvers import (
     resolve_current_user,
     tag_anchor_mutation,
@@ -29,6 +33,8 @@ from .resolvers.queries import (
 )
 from ..executor_runner import handle_executor_request
 from ..executor_runner.types import ResponseType
+from ..profiling import OperationProfiler
+from ..profiling.types import OperationStatsType, resolve_operation_stats
 
 from ..models import Code
 from ..types import (
@@ -47,7 +53,7 @@ from ..types.filters import (
     TagAnchorFilter,
 )
 
-__all__ = ["schema"]
+__all__ = ["schema", "get_schema", "get_schema_sdl", "get_schema_hash"]
 
 
 @strawberry.type
@@ -68,6 +74,9 @@ class Query:
     )
     graph: Optional[GraphType] = strawberry_django.field(get_graph)
     code: Optional[Code] = strawberry_django.field(get_code)
+    operation_stats: List[OperationStatsType] = strawberry.field(
+        resolver=resolve_operation_stats, permission_classes=[AdminPermission]
+    )
 
 
 @strawberry.type
@@ -98,4 +107,64 @@ class Mutation:
     )
 
 
-schema = strawberry.Schema(query=Query, mutation=Mutation)
+_schema: Optional[strawberry.Schema] = None
+_schema_sdl: Optional[str] = None
+_schema_hash: Optional[str] = None
+_schema_lock = threading.Lock()
+
+
+def get_schema() -> strawberry.Schema:
+    """
+    the schema of the process, which is built on the first call and reused.
+    building it takes most of the time of importing the schema,
+    so it is not built by the management commands that never run queries.
+    :return:
+    """
+    global _schema
+
+    if _schema is None:
+        with _schema_lock:
+            if _schema is None:
+                _schema = strawberry.Schema(
+                    query=Query,
+                    mutation=Mutation,
+                    extensions=[QueryLimiter, OperationProfiler],
+                )
+
+    return _schema
+
+
+def get_schema_sdl() -> str:
+    """
+    the SDL of the schema, which is printed on the first call and reused,
+    since the schema doesn't change until the next deploy
+    :return:
+    """
+    global _schema_sdl, _schema_hash
+
+    if _schema_sdl is None:
+        schema = get_schema()
+        with _schema_lock:
+            if _schema_sdl is None:
+                sdl = print_schema(schema)
+                _schema_hash = hashlib.sha256(sdl.encode()).hexdigest()
+                _schema_sdl = sdl
+
+    return _schema_sdl
+
+
+def get_schema_hash() -> str:
+    """
+    the sha256 of the SDL, the version of the schema clients can compare
+    their generated types and stored queries with
+    :return:
+    """
+    get_schema_sdl()
+    return _schema_hash
+
+
+def __getattr__(name: str):
+    # `from backend.schema import schema` builds the schema when it's imported
+    if name == "schema":
+        return get_schema()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
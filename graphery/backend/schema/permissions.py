@@ -1,23 +1,33 @@
 from __future__ import annotations
 
 from strawberry.types import Info
-from typing import Union, Awaitable, Any
+from typing import Union, Awaitable, Any, ClassVar, Tuple
 
 from strawberry.permission import BasePermission
 
-from .utils import get_user_from_info
 from ..models import UserRoles
+from ..types.permissions import get_permissions
 
 
-class AdminPermission(BasePermission):
-    message = "You must be an admin to access this resource."
+class RolePermission(BasePermission):
+    """
+    the fields for the users with at least a role and with some permissions,
+    which are checked against the permissions loaded once for the request
+    """
+
+    minimal_role: ClassVar[int] = UserRoles.READER
+    required_permissions: ClassVar[Tuple[str, ...]] = ()
+    message = "You don't have the permission to access this resource."
 
     def has_permission(
         self, source: Any, info: Info, **kwargs
     ) -> Union[bool, Awaitable[bool]]:
-        user = get_user_from_info(info)
-        if user is not None:
-            # TODO fix this
-            # user.has_perm("backend.can_view_tag_anchor")
-            return True
-        return False
+        permissions = get_permissions(info)
+        return permissions.has_role(self.minimal_role) and permissions.has_perms(
+            *self.required_permissions
+        )
+
+
+class AdminPermission(RolePermission):
+    minimal_role = UserRoles.ADMINISTRATOR
+    message = "You must be an admin to access this resource."
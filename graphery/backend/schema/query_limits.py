@@ -0,0 +1,323 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+from django.conf import settings
+from graphql import (
+    ExecutionResult as GraphQLExecutionResult,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLField,
+    GraphQLObjectType,
+    GraphQLSchema,
+    InlineFragmentNode,
+    IntValueNode,
+    SelectionSetNode,
+    VariableNode,
+    get_named_type,
+    get_nullable_type,
+    is_list_type,
+)
+from graphql.utilities import get_operation_ast
+from strawberry.extensions import Extension
+from strawberry.schema.execute import validate_document
+
+__all__ = [
+    "QueryLimiter",
+    "QueryCost",
+    "analyze_query",
+    "clear_introspection_cache",
+]
+
+# the arguments which set how many items a field returns
+PAGE_SIZE_ARGUMENTS = ("limit", "first", "last")
+INTROSPECTION_FIELDS = ("__schema", "__type")
+
+
+@dataclass
+class QueryCost:
+    """
+    what running an operation would take, estimated before it runs
+    """
+
+    depth: int = 0
+    # the objects and page items the operation could return
+    cost: int = 0
+    aliases: int = 0
+    # the operation asks for __schema or __type
+    introspection: bool = False
+    # every root field is an introspection field
+    only_introspection: bool = False
+
+
+class _Analyzer:
+    def __init__(
+        self,
+        schema: GraphQLSchema,
+        fragments: Dict[str, FragmentDefinitionNode],
+        variables: Dict[str, Any],
+    ):
+        self.schema = schema
+        self.fragments = fragments
+        self.variables = variables
+        self.result = QueryCost()
+
+    def _page_size(self, node: FieldNode, field: GraphQLField) -> Optional[int]:
+        """
+        the page size a field is asked for, which is clamped between 0 and
+        GRAPHERY_QUERY_MAX_PAGE_SIZE, so a negative one can't lower the cost
+        """
+        arguments = {argument.name.value: argument.value for argument in node.arguments}
+        for name in PAGE_SIZE_ARGUMENTS:
+            if name not in field.args:
+                continue
+
+            value, page_size = arguments.get(name), None
+            if isinstance(value, IntValueNode):
+                page_size = int(value.value)
+            elif isinstance(value, VariableNode):
+                variable = self.variables.get(value.name.value)
+                if isinstance(variable, int):
+                    page_size = variable
+            if page_size is None and isinstance(
+                default := field.args[name].default_value, int
+            ):
+                page_size = default
+
+            if page_size is not None:
+                return min(max(page_size, 0), settings.GRAPHERY_QUERY_MAX_PAGE_SIZE)
+        return None
+
+    def _fields(
+        self, parent_type, selection_set: SelectionSetNode, visited: Set[str]
+    ) -> List[tuple]:
+        """
+        the fields of a selection set with the fragments spread
+        :return: the field nodes and the types they are selected on
+        """
+        fields = []
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                fields.append((selection, parent_type))
+            elif isinstance(selection, InlineFragmentNode):
+                fragment_type = (
+                    self.schema.get_type(selection.type_condition.name.value)
+                    if selection.type_condition
+                    else parent_type
+                )
+                fields.extend(
+                    self._fields(fragment_type, selection.selection_set, visited)
+                )
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                fragment = self.fragments.get(name)
+                # cycles are reported by the validation
+                if fragment is None or name in visited:
+                    continue
+                fields.extend(
+                    self._fields(
+                        self.schema.get_type(fragment.type_condition.name.value),
+                        fragment.selection_set,
+                        visited | {name},
+                    )
+                )
+        return fields
+
+    def selection_cost(
+        self,
+        parent_type,
+        selection_set: SelectionSetNode,
+        depth: int,
+        visited: Set[str],
+    ) -> int:
+        cost = 0
+        for node, field_parent in self._fields(parent_type, selection_set, visited):
+            name = node.name.value
+            if node.alias is not None:
+                self.result.aliases += 1
+            if name in INTROSPECTION_FIELDS:
+                self.result.introspection = True
+            if name.startswith("__") or not isinstance(field_parent, GraphQLObjectType):
+                # introspection is cached, and unions and interfaces
+                # are only selected through fragments on their object types
+                continue
+
+            field = field_parent.fields.get(name)
+            if field is None:
+                continue
+
+            self.result.depth = max(self.result.depth, depth)
+            page_size = self._page_size(node, field)
+            children = (
+                self.selection_cost(
+                    get_named_type(field.type), node.selection_set, depth + 1, visited
+                )
+                if node.selection_set
+                else 0
+            )
+
+            if is_list_type(get_nullable_type(field.type)):
+                items = (
+                    page_size
+                    if page_size is not None
+                    else settings.GRAPHERY_QUERY_LIST_SIZE
+                )
+                cost += items * (1 + children)
+            elif node.selection_set:
+                cost += 1 + children
+            else:
+                # a scalar holding a page of items, like the steps of a result
+                cost += page_size or 0
+        return cost
+
+
+def analyze_query(
+    schema: GraphQLSchema,
+    document,
+    operation_name: Optional[str] = None,
+    variables: Optional[Dict[str, Any]] = None,
+) -> Optional[QueryCost]:
+    """
+    estimate the depth, the cost and the aliases of an operation.
+    a list field costs an item for each object it could return, which is
+    its page size when it has one and GRAPHERY_QUERY_LIST_SIZE when it has not,
+    times what the selection of every item costs
+    :param schema: the graphql-core schema
+    :param document: the parsed and validated document
+    :param operation_name:
+    :param variables:
+    :return: None when the document doesn't have the operation
+    """
+    operation = get_operation_ast(document, operation_name)
+    if operation is None:
+        return None
+
+    root_type = schema.get_root_type(operation.operation)
+    if root_type is None:
+        return None
+
+    fragments = {
+        definition.name.value: definition
+        for definition in document.definitions
+        if isinstance(definition, FragmentDefinitionNode)
+    }
+    analyzer = _Analyzer(schema, fragments, variables or {})
+    analyzer.result.cost = analyzer.selection_cost(
+        root_type, operation.selection_set, 1, set()
+    )
+    analyzer.result.only_introspection = all(
+        node.name.value.startswith("__")
+        for node, _ in analyzer._fields(root_type, operation.selection_set, set())
+    )
+    return analyzer.result
+
+
+_introspection_cache: Dict[str, GraphQLExecutionResult] = {}
+_introspection_lock = threading.Lock()
+
+
+def clear_introspection_cache() -> None:
+    with _introspection_lock:
+        _introspection_cache.clear()
+
+
+class QueryLimiter(Extension):
+    """
+    reject the operations that are too deep, too costly or use too many aliases
+    after they are validated and before they run, and answer the introspection
+    queries from a cache, since the schema doesn't change while a process runs
+    """
+
+    _cache_key: Optional[str] = None
+
+    def _limit_errors(self, query_cost: QueryCost) -> List[GraphQLError]:
+        errors = []
+        if query_cost.introspection and not settings.GRAPHERY_GRAPHQL_INTROSPECTION:
+            errors.append(GraphQLError("introspection is disabled"))
+        if query_cost.depth > settings.GRAPHERY_QUERY_MAX_DEPTH:
+            errors.append(
+                GraphQLError(
+                    f"the query is {query_cost.depth} levels deep, "
+                    f"at most {settings.GRAPHERY_QUERY_MAX_DEPTH} are allowed"
+                )
+            )
+        if query_cost.cost > settings.GRAPHERY_QUERY_MAX_COST:
+            errors.append(
+                GraphQLError(
+                    f"the query costs {query_cost.cost}, "
+                    f"at most {settings.GRAPHERY_QUERY_MAX_COST} is allowed"
+                )
+            )
+        if query_cost.aliases > settings.GRAPHERY_QUERY_MAX_ALIASES:
+            errors.append(
+                GraphQLError(
+                    f"the query has {query_cost.aliases} aliases, "
+                    f"at most {settings.GRAPHERY_QUERY_MAX_ALIASES} are allowed"
+                )
+            )
+        return errors
+
+    def on_validation_start(self):
+        execution_context = self.execution_context
+        if execution_context.errors is not None:
+            return
+
+        # the limits are checked on valid documents only, so the validation
+        # runs here, and strawberry doesn't run it again when there are errors
+        graphql_schema = execution_context.schema._schema
+        execution_context.errors = validate_document(
+            graphql_schema,
+            execution_context.graphql_document,
+            execution_context.validation_rules,
+        )
+        if execution_context.errors:
+            return
+
+        query_cost = analyze_query(
+            graphql_schema,
+            execution_context.graphql_document,
+            execution_context.operation_name,
+            execution_context.variables,
+        )
+        if query_cost is None:
+            return
+
+        execution_context.errors = self._limit_errors(query_cost)
+        if not execution_context.errors and query_cost.only_introspection:
+            self._cache_key = hashlib.sha256(
+                json.dumps(
+                    [
+                        execution_context.query,
+                        execution_context.operation_name,
+                        execution_context.variables,
+                    ],
+                    sort_keys=True,
+                    default=str,
+                ).encode()
+            ).hexdigest()
+
+    def on_executing_start(self):
+        if self._cache_key is None:
+            return
+
+        with _introspection_lock:
+            result = _introspection_cache.get(self._cache_key)
+        if result is not None:
+            # strawberry doesn't execute the operation when there is a result
+            self.execution_context.result = result
+
+    def on_executing_end(self):
+        result = self.execution_context.result
+        if self._cache_key is None or result is None or result.errors:
+            return
+
+        with _introspection_lock:
+            if len(_introspection_cache) >= settings.GRAPHERY_INTROSPECTION_CACHE_SIZE:
+                _introspection_cache.pop(next(iter(_introspection_cache)))
+            _introspection_cache[self._cache_key] = result
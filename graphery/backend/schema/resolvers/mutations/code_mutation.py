@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from strawberry.types import Info
 
-from ....data_bridge import CodeBridge
+from ....data_bridge import CodeBridge, bridge_resolver
 from ....types import OperationType, CodeMutationType, CodeType
 
 
 __all__ = ["code_mutation"]
 
 
-def code_mutation(info: Info, op: OperationType, data: CodeMutationType) -> CodeType:
-    return CodeBridge.bridges_from_mutation(op, data, info=info)
+@bridge_resolver
+def code_mutation(
+    info: Info,
+    op: OperationType,
+    data: CodeMutationType,
+    autosave: Optional[bool] = False,
+) -> CodeType:
+    return CodeBridge.bridges_from_mutation(op, data, info=info, autosave=autosave)
@@ -2,7 +2,12 @@ from __future__ import annotations
 
 from strawberry.types import Info
 
-from ....data_bridge import GraphAnchorBridge, GraphBridge, GraphDescriptionBridge
+from ....data_bridge import (
+    GraphAnchorBridge,
+    GraphBridge,
+    GraphDescriptionBridge,
+    bridge_resolver,
+)
 from ....types import (
     OperationType,
     GraphAnchorMutationType,
@@ -17,16 +22,19 @@ from ....types import (
 __all__ = ["graph_anchor_mutation", "graph_mutation", "graph_description_mutation"]
 
 
+@bridge_resolver
 def graph_anchor_mutation(
     info: Info, op: OperationType, data: GraphAnchorMutationType
 ) -> GraphAnchorType:
     return GraphAnchorBridge.bridges_from_mutation(op, data, info=info)
 
 
+@bridge_resolver
 def graph_mutation(info: Info, op: OperationType, data: GraphMutationType) -> GraphType:
     return GraphBridge.bridges_from_mutation(op, data, info=info)
 
 
+@bridge_resolver
 def graph_description_mutation(
     info: Info, op: OperationType, data: GraphDescriptionMutationType
 ) -> GraphDescriptionType:
@@ -4,7 +4,7 @@ from typing import Optional
 
 from strawberry.types import Info
 
-from ....data_bridge import TagAnchorBridge, TagBridge
+from ....data_bridge import TagAnchorBridge, TagBridge, bridge_resolver
 from ....types import TagAnchorType, TagType
 from ....types.django_inputs import (
     OperationType,
@@ -16,12 +16,14 @@ from ....types.django_inputs import (
 __all__ = ["tag_anchor_mutation", "tag_mutation"]
 
 
+@bridge_resolver
 def tag_anchor_mutation(
     info: Info, op: OperationType, data: TagAnchorMutationType
 ) -> Optional[TagAnchorType]:
     return TagAnchorBridge.bridges_from_mutation(op, data, info=info)
 
 
+@bridge_resolver
 def tag_mutation(
     info: Info, op: OperationType, data: TagMutationType
 ) -> Optional[TagType]:
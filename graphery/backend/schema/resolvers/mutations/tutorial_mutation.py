@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from strawberry.types import Info
 
-from ....data_bridge import TutorialAnchorBridge, TutorialBridge
+from ....data_bridge import TutorialAnchorBridge, TutorialBridge, bridge_resolver
 from ....types import (
     OperationType,
     TutorialAnchorMutationType,
@@ -14,12 +14,14 @@ from ....types import (
 __all__ = ["tutorial_anchor_mutation", "tutorial_mutation"]
 
 
+@bridge_resolver
 def tutorial_anchor_mutation(
     info: Info, op: OperationType, data: TutorialAnchorMutationType
 ) -> TutorialAnchorType:
     return TutorialAnchorBridge.bridges_from_mutation(op, data, info=info)
 
 
+@bridge_resolver
 def tutorial_mutation(
     info: Info, op: OperationType, data: TutorialMutationType
 ) -> TutorialType:
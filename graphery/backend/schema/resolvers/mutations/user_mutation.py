@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Optional
 
 from strawberry.types import Info
 
-from ....data_bridge import UserBridge
-from ....recaptcha import site_verify_recaptcha
+from ....data_bridge import UserBridge, run_in_bridge_executor
+from ....recaptcha import VerifyResponse, averify_recaptcha, verify_recaptcha
 from ....types import UserMutationType, UserType, OperationType
 
 REGISTER_RECAPTCHA_MIN_SCORE = 0.7
@@ -13,14 +14,67 @@ REGISTER_RECAPTCHA_MIN_SCORE = 0.7
 __all__ = ["register_mutation"]
 
 
+def _passes(recaptcha_response: VerifyResponse) -> bool:
+    return (
+        bool(recaptcha_response.get("success"))
+        and (recaptcha_response.get("score") or 0.0) >= REGISTER_RECAPTCHA_MIN_SCORE
+    )
+
+
+def _register(
+    info: Info, data: UserMutationType, recaptcha_token: Optional[str]
+) -> Optional[UserType]:
+    verification = verify_recaptcha(
+        token=recaptcha_token,
+        remote_ip=info.context.request.META.get("REMOTE_ADDR"),
+    )
+    if verification.done() and not _passes(verification.result()):
+        return None
+
+    # the user is validated while google verifies the token,
+    # and saved once the token passes, so no transaction waits for google
+    UserBridge.validate_new_user(data)
+    if not _passes(verification.result()):
+        return None
+
+    return UserBridge.bridges_from_mutation(OperationType.CREATE, data, info=info)
+
+
+async def _aregister(
+    info: Info, data: UserMutationType, recaptcha_token: Optional[str]
+) -> Optional[UserType]:
+    # the user is validated in the bridge threads while google verifies the token,
+    # and no thread waits for google
+    recaptcha_response, validated = await asyncio.gather(
+        averify_recaptcha(
+            token=recaptcha_token,
+            remote_ip=info.context.request.META.get("REMOTE_ADDR"),
+        ),
+        run_in_bridge_executor(UserBridge.validate_new_user, data),
+        return_exceptions=True,
+    )
+    # a failed verification wins over the validation errors
+    if not _passes(recaptcha_response):
+        return None
+    if isinstance(validated, Exception):
+        raise validated
+
+    return await run_in_bridge_executor(
+        UserBridge.bridges_from_mutation, OperationType.CREATE, data, info=info
+    )
+
+
 def register_mutation(
     info: Info, data: UserMutationType, recaptcha_token: Optional[str] = None
 ) -> Optional[UserType]:
-    recaptcha_response = site_verify_recaptcha(token=recaptcha_token)
-    if (
-        recaptcha_response.get("success")
-        and recaptcha_response.get("score") >= REGISTER_RECAPTCHA_MIN_SCORE
-    ):
-        return UserBridge.bridges_from_mutation(OperationType.CREATE, data, info=info)
-
-    return None
+    """
+    register a user once the recaptcha token passes. in the async endpoint
+    the token is awaited, and in the sync endpoint the wait is bounded
+    by GRAPHERY_RECAPTCHA_TIMEOUT
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return _register(info, data, recaptcha_token)
+
+    return _aregister(info, data, recaptcha_token)
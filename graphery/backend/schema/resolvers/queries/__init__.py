@@ -6,6 +6,7 @@ from typing import List, Optional
 
 from strawberry.types import Info
 
+from ....data_bridge.autosave_buffer import AutosaveBuffer
 from ....models import (
     TutorialAnchor,
     GraphAnchor,
@@ -14,6 +15,9 @@ from ....models import (
     Graph,
     GraphDescription,
     Code,
+    PublishedTutorial,
+    PublishedGraphDescription,
+    first_in_lang,
 )
 from ....types import (
     UserType,
@@ -26,6 +30,8 @@ from ....types import (
     GraphType,
     CodeType,
 )
+from ....types.permissions import get_permissions
+from ....types.utils import remember_listed
 
 __all__ = [
     "resolve_current_user",
@@ -47,46 +53,86 @@ def resolve_current_user(info: Info) -> Optional[UserType]:
 def resolve_tutorial_anchors(
     info: Info, filters: Optional[TutorialAnchorFilter] = None
 ) -> List[TutorialAnchorType]:
-    # TODO privilege check
-    return TutorialAnchor.objects.all()
+    return remember_listed(
+        info,
+        get_permissions(info).filter_visible(TutorialAnchor.objects.all()),
+        TutorialAnchor,
+    )
 
 
 def resolve_graph_anchors(
     info: Info, filters: Optional[GraphAnchorFilter] = None
 ) -> List[GraphAnchorType]:
-    # TODO privilege check
-    return GraphAnchor.objects.all()
+    return remember_listed(
+        info,
+        get_permissions(info).filter_visible(GraphAnchor.objects.all()),
+        GraphAnchor,
+    )
 
 
 def get_tutorial_content(
     info: Info, url: str, lang: LangCode = LangCode.EN
 ) -> Optional[TutorialType]:
-    # TODO privilege check
-    query_set = Tutorial.objects.filter(tutorial_anchor__url=url, lang_code=lang)
-    return query_set[0] if query_set else None
+    if not get_permissions(info).reads_drafts:
+        published = first_in_lang(
+            PublishedTutorial.objects.select_related("tutorial").filter(
+                tutorial_anchor__url=url
+            ),
+            lang,
+        )
+        return published.as_version() if published else None
+
+    tutorial = first_in_lang(
+        Tutorial.objects.filter(tutorial_anchor__url=url, front=None), lang
+    )
+
+    # editors read back what they have autosaved but not flushed yet
+    if tutorial is not None and (
+        autosave_buffer := AutosaveBuffer.from_request(
+            info.context.request, tutorial.tutorial_anchor_id, tutorial.lang_code
+        )
+    ):
+        autosave_buffer.overlay(tutorial)
+
+    return tutorial
 
 
 def get_graph_content(
     info: Info,
-    url: Optional[str],
-    anchor_id: Optional[UUID],
+    url: Optional[str] = None,
+    anchor_id: Optional[UUID] = None,
     lang: LangCode = LangCode.EN,
 ) -> Optional[GraphDescriptionType]:
     if url:
-        return GraphDescription.objects.filter(url=url, lang_code=lang)
+        anchor_filter = {"graph_anchor__url": url}
     elif anchor_id:
-        return GraphDescription.objects.filter(
-            graph_anchor__id=anchor_id, lang_code=lang
-        )
+        anchor_filter = {"graph_anchor__id": anchor_id}
     else:
         return None
 
+    if not get_permissions(info).reads_drafts:
+        published = first_in_lang(
+            PublishedGraphDescription.objects.select_related(
+                "graph_description"
+            ).filter(**anchor_filter),
+            lang,
+        )
+        return published.as_version() if published else None
+
+    return first_in_lang(
+        GraphDescription.objects.filter(**anchor_filter, front=None), lang
+    )
+
 
 def get_graph(
     info: Info,
     anchor_id: UUID,
 ) -> Optional[GraphType]:
-    return Graph.objects.get(graph_anchor__id=anchor_id)
+    return (
+        get_permissions(info)
+        .filter_visible(Graph.objects.with_raw_json())
+        .get(graph_anchor__id=anchor_id)
+    )
 
 
 def get_code(info: Info, code_id: UUID) -> Optional[CodeType]:
@@ -1,5 +1,7 @@
 import pytest
+from asgiref.sync import sync_to_async
 from django.contrib.sessions.middleware import SessionMiddleware
+from django.db import connections
 
 from ..baker_recipes import admin_user_recipe, user_recipe
 from ..models import UserRoles
@@ -10,6 +12,14 @@ def session_middleware():
     return SessionMiddleware(lambda _: None)
 
 
+@pytest.fixture(autouse=True)
+async def close_async_connections():
+    # the connections opened in the thread of sync_to_async are not closed
+    # by the test, and keep the test database from being dropped
+    yield
+    await sync_to_async(connections.close_all)()
+
+
 @pytest.fixture(scope="function")
 def admin_user(transactional_db):
     admin_user = admin_user_recipe.make()
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import json
+from io import StringIO
+
 import pytest
+from django.core.management import call_command
 
 from ..utils import (
     USER_LIST,
@@ -9,13 +13,35 @@ from ..utils import (
     make_request_with_user,
     JSONChecker,
 )
-from ...baker_recipes import execution_result_recipe, code_recipe, graph_anchor_recipe
-from ...data_bridge import ExecutionResultBridge
-from ...models import UserRoles
+from ... import execution_precompute
+from ...baker_recipes import (
+    execution_result_recipe,
+    code_recipe,
+    graph_anchor_recipe,
+    graph_recipe,
+    tutorial_anchor_recipe,
+)
+from ...data_bridge import ExecutionResultBridge, CodeBridge, GraphBridge
+from ...execution_precompute import (
+    PrecomputeStatus,
+    execution_pairs,
+    compute_execution_result,
+    precompute_execution_results,
+)
+from ...jobs import run_pending_jobs
+from ...models import (
+    UserRoles,
+    Code,
+    ExecutionResult,
+    OrderedAnchorTable,
+    raw_json_value,
+)
 from ...types import (
     ExecutionResultMutationType,
     CodeMutationType,
     GraphAnchorMutationType,
+    GraphMutationType,
+    TutorialAnchorMutationType,
 )
 
 
@@ -116,3 +142,188 @@ def test_delete_execution_result(
         is_deleting=True,
         custom_checker=(EXECUTION_RESULT_JSON_CHECKER, EXECUTION_META_JSON_CHECKER),
     )
+
+
+def test_execution_result_segments(rf, settings, admin_user, execution_result_fixture):
+    settings.GRAPHERY_EXECUTION_RESULT_SEGMENT_STEPS = 100
+    steps = [{"line": index, "variables": {"i": index}} for index in range(250)]
+
+    ExecutionResultBridge.bridges_from_model_info(
+        ExecutionResultMutationType(
+            id=execution_result_fixture.id,
+            code=CodeMutationType(id=execution_result_fixture.code.id),
+            graph_anchor=GraphAnchorMutationType(
+                id=execution_result_fixture.graph_anchor.id
+            ),
+            result_json=json.dumps({"result": steps, "version": "1"}),
+        ),
+        request=make_request_with_user(rf, admin_user),
+    )
+
+    execution_result = ExecutionResult.objects.with_raw_json().get(
+        id=execution_result_fixture.id
+    )
+    assert execution_result.step_count == 250
+    assert list(
+        execution_result.segments.order_by("start_step").values_list(
+            "start_step", "step_count"
+        )
+    ) == [(0, 100), (100, 100), (200, 50)]
+    assert json.loads(raw_json_value(execution_result, "result_json")) == {
+        "version": "1"
+    }
+
+    for offset, limit in [(0, 100), (95, 10), (100, 200), (240, 20), (300, 5)]:
+        assert (
+            json.loads(execution_result.get_steps(offset, limit))
+            == steps[offset : offset + limit]
+        )
+    assert json.loads(execution_result.get_result_json()) == {
+        "result": steps,
+        "version": "1",
+    }
+
+    # results without steps have no segments
+    ExecutionResultBridge.bridges_from_model_info(
+        ExecutionResultMutationType(
+            id=execution_result_fixture.id,
+            code=CodeMutationType(id=execution_result_fixture.code.id),
+            graph_anchor=GraphAnchorMutationType(
+                id=execution_result_fixture.graph_anchor.id
+            ),
+            result_json='{"result": []}',
+        ),
+        request=make_request_with_user(rf, admin_user),
+    )
+    execution_result = ExecutionResult.objects.get(id=execution_result_fixture.id)
+    assert execution_result.step_count == 0
+    assert not execution_result.segments.exists()
+    assert execution_result.get_result_json() == {"result": []}
+    assert json.loads(execution_result.get_steps(0, 10)) == []
+
+
+@pytest.fixture
+def precompute_fixture(transactional_db, settings, monkeypatch):
+    settings.GRAPHERY_EXECUTION_RESULT_SEGMENT_STEPS = 2
+    code = code_recipe.make()
+    graphs = [graph_recipe.make(graph_json={"nodes": [{"key": "1"}]}) for _ in range(2)]
+    for graph in graphs:
+        OrderedAnchorTable.objects.create(
+            graph_anchor=graph.graph_anchor, tutorial_anchor=code.tutorial_anchor
+        )
+    # graph anchors without a graph and codes without graphs have no pairs
+    OrderedAnchorTable.objects.create(
+        graph_anchor=graph_anchor_recipe.make(), tutorial_anchor=code.tutorial_anchor
+    )
+    code_recipe.make()
+
+    calls = []
+
+    def run_executor(code_text, graph_json_text, version):
+        calls.append((code_text, json.loads(graph_json_text), version))
+        if code_text == "fail":
+            raise ValueError("failed")
+        return {"result": [{"line": 1}, {"line": 2}, {"line": 3}]}
+
+    monkeypatch.setattr(execution_precompute, "_run_executor", run_executor)
+    monkeypatch.setattr(execution_precompute, "_executor_version", lambda: "1.0")
+
+    return code, graphs, calls
+
+
+def test_precompute_execution_results(precompute_fixture):
+    code, graphs, calls = precompute_fixture
+    pairs = execution_pairs(code_ids=[code.id])
+    assert sorted(pairs) == sorted((code.id, graph.graph_anchor.id) for graph in graphs)
+    assert execution_pairs(everything=True) == pairs
+
+    assert precompute_execution_results(pairs) == {PrecomputeStatus.STORED: 2}
+    assert len(calls) == 2
+    assert calls[0][1:] == ({"nodes": [{"key": "1"}]}, "1.0")
+    execution_result = ExecutionResult.objects.get(
+        code=code, graph_anchor=graphs[0].graph_anchor
+    )
+    assert execution_result.step_count == 3
+    assert json.loads(execution_result.get_steps(1, 5)) == [{"line": 2}, {"line": 3}]
+
+    # results computed from the same code and graph are kept
+    assert precompute_execution_results(pairs) == {PrecomputeStatus.UNCHANGED: 2}
+    assert len(calls) == 2
+    assert precompute_execution_results(pairs, force=True) == {
+        PrecomputeStatus.STORED: 2
+    }
+    assert ExecutionResult.objects.filter(code=code).count() == 2
+
+    # failed executions leave the results as they are
+    Code.objects.filter(id=code.id).update(code="fail")
+    source_hash = ExecutionResult.objects.get(
+        code=code, graph_anchor_id=pairs[0][1]
+    ).source_hash
+    assert compute_execution_result(*pairs[0]) is PrecomputeStatus.FAILED
+    assert ExecutionResult.objects.filter(
+        code=code, graph_anchor_id=pairs[0][1], source_hash=source_hash
+    ).exists()
+
+
+def test_precompute_scheduled_by_code_bridge(
+    rf, settings, admin_user, precompute_fixture
+):
+    code, graphs, calls = precompute_fixture
+    settings.GRAPHERY_EXECUTION_PRECOMPUTE = True
+
+    CodeBridge.bridges_from_model_info(
+        CodeMutationType(
+            id=code.id,
+            tutorial_anchor=TutorialAnchorMutationType(id=code.tutorial_anchor.id),
+            code="print(1)\n",
+        ),
+        request=make_request_with_user(rf, admin_user),
+    )
+    assert not calls
+
+    assert run_pending_jobs() == 2
+    assert len(calls) == 2
+    assert ExecutionResult.objects.filter(code=code).count() == 2
+
+
+def test_precompute_scheduled_on_create(rf, settings, admin_user, precompute_fixture):
+    code, graphs, calls = precompute_fixture
+    settings.GRAPHERY_EXECUTION_PRECOMPUTE = True
+    request = make_request_with_user(rf, admin_user)
+
+    # a new code of a tutorial bound to a graph
+    tutorial_anchor = tutorial_anchor_recipe.make()
+    OrderedAnchorTable.objects.create(
+        graph_anchor=graphs[0].graph_anchor, tutorial_anchor=tutorial_anchor
+    )
+    new_code = CodeBridge.bridges_from_model_info(
+        CodeMutationType(
+            tutorial_anchor=TutorialAnchorMutationType(id=tutorial_anchor.id),
+            code="print(2)\n",
+        ),
+        request=request,
+    ).model_instance
+
+    # a new graph of a graph anchor bound to the tutorial of a code
+    graph_anchor = graph_anchor_recipe.make()
+    OrderedAnchorTable.objects.create(
+        graph_anchor=graph_anchor, tutorial_anchor=code.tutorial_anchor
+    )
+    GraphBridge.bridges_from_model_info(
+        GraphMutationType(
+            graph_anchor=GraphAnchorMutationType(id=graph_anchor.id),
+            graph_json=json.dumps({"nodes": [{"key": "1"}]}),
+        ),
+        request=request,
+    )
+
+    run_pending_jobs()
+    assert sorted(
+        ExecutionResult.objects.values_list("code_id", "graph_anchor_id")
+    ) == sorted([(new_code.id, graphs[0].graph_anchor.id), (code.id, graph_anchor.id)])
+
+
+def test_rebuild_execution_results_command(precompute_fixture):
+    out = StringIO()
+    call_command("rebuild_execution_results", stdout=out)
+    assert "2 pairs" in out.getvalue() and "2 stored" in out.getvalue()
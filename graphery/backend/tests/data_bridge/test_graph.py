@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import base64
+import json
+import struct
+import zlib
+from datetime import timedelta
 from typing import Sequence
 
 import pytest
@@ -19,6 +24,8 @@ from ...baker_recipes import (
     graph_recipe,
     graph_description_recipe,
 )
+from ...baker_recipes.make_test_examples import DEFAULT_GRAPH_JSON
+from ...data_bridge import ValidationError
 from ...data_bridge.graph_bridge import (
     GraphAnchorBridge,
     GraphBridge,
@@ -33,9 +40,22 @@ from ...models import (
     TutorialAnchor,
     OrderedAnchorTable,
     Graph,
+    GraphLayout,
     GraphDescription,
 )
+from ...graph_format import (
+    COMPACT_MAGIC,
+    normalize_graph_json,
+    encode_compact,
+    decode_compact,
+    compute_graph_layouts,
+)
+from ... import graph_layout as graph_layout_module
+from ...graph_layout import update_graph_layouts
+from ...jobs import run_pending_jobs
+from ...json_codec import JSONObject
 from ...types import (
+    JSONType,
     GraphAnchorMutationType,
     OrderedTutorialAnchorBindingType,
     TutorialAnchorMutationType,
@@ -203,6 +223,330 @@ def test_graph(rf, graph_fixture: Graph, get_fixture: User):
         )
 
 
+def test_graph_json_single_pass(rf, graph_fixture: Graph, admin_user: User):
+    request = make_request_with_user(rf, admin_user)
+    graph_json_text = '{"attributes": {"name": "g"}, "nodes": [], "edges": []}'
+
+    GraphBridge.bridges_from_model_info(
+        GraphMutationType(
+            id=graph_fixture.id,
+            graph_anchor=GraphAnchorMutationType(id=graph_fixture.graph_anchor.id),
+            graph_json=graph_json_text,
+        ),
+        request=request,
+    )
+
+    # the text read from the database is kept and sent out as is
+    graph_json = Graph.objects.get(id=graph_fixture.id).graph_json
+    assert isinstance(graph_json, JSONObject)
+    assert graph_json == json.loads(graph_json_text)
+    assert json.loads(JSONType._scalar_definition.serialize(graph_json)) == graph_json
+
+    # and dropped when the object is changed
+    graph_json["nodes"] = [{"key": "1"}]
+    assert json.loads(JSONType._scalar_definition.serialize(graph_json)) == graph_json
+
+    with pytest.raises(ValidationError):
+        GraphBridge.bridges_from_model_info(
+            GraphMutationType(
+                id=graph_fixture.id,
+                graph_anchor=GraphAnchorMutationType(id=graph_fixture.graph_anchor.id),
+                graph_json='{"nodes": [',
+            ),
+            request=request,
+        )
+
+
+def test_normalize_graph_json():
+    graph_json, graph_meta = normalize_graph_json(json.loads(DEFAULT_GRAPH_JSON))
+    assert graph_json == json.loads(DEFAULT_GRAPH_JSON)
+    assert graph_meta == {
+        "node_count": 12,
+        "edge_count": 14,
+        "type": "undirected",
+        "directed": False,
+        "multi": False,
+        "self_loop_count": 0,
+        "degree": {"min": 0, "max": 5, "mean": 28 / 12},
+    }
+
+    graph_json, graph_meta = normalize_graph_json(
+        {
+            "options": {"type": "directed"},
+            "nodes": [{"key": 1}, {"key": "2"}],
+            "edges": [{"source": 1, "target": "2"}, {"source": "2", "target": 1}],
+        }
+    )
+    assert graph_json["nodes"] == [
+        {"key": "1", "attributes": {}},
+        {"key": "2", "attributes": {}},
+    ]
+    assert graph_json["edges"][0] == {"source": "1", "target": "2", "attributes": {}}
+    assert graph_meta["directed"] and graph_meta["edge_count"] == 2
+
+    assert normalize_graph_json({})[1]["node_count"] == 0
+
+
+@pytest.mark.parametrize(
+    "graph_json",
+    [
+        {"nodes": [{"key": "1"}, {"key": "1"}]},
+        {"nodes": [{"key": "1"}], "edges": [{"source": "1", "target": "2"}]},
+        {
+            "options": {"type": "undirected"},
+            "nodes": [{"key": "1"}, {"key": "2"}],
+            "edges": [{"source": "1", "target": "2"}, {"source": "2", "target": "1"}],
+        },
+        {
+            "options": {"allowSelfLoops": False},
+            "nodes": [{"key": "1"}],
+            "edges": [{"source": "1", "target": "1"}],
+        },
+        {"options": {"type": "tree"}},
+        {"nodes": {}},
+    ],
+)
+def test_normalize_graph_json_fail(graph_json):
+    with pytest.raises(ValidationError):
+        normalize_graph_json(graph_json)
+
+
+def test_graph_meta_bridged(rf, graph_fixture: Graph, admin_user: User):
+    GraphBridge.bridges_from_model_info(
+        GraphMutationType(
+            id=graph_fixture.id,
+            graph_anchor=GraphAnchorMutationType(id=graph_fixture.graph_anchor.id),
+            graph_json=DEFAULT_GRAPH_JSON,
+        ),
+        request=make_request_with_user(rf, admin_user),
+    )
+
+    graph_meta = Graph.objects.get(id=graph_fixture.id).graph_meta
+    assert graph_meta["node_count"] == 12
+    assert graph_meta["edge_count"] == 14
+
+
+def _big_graph_json(node_count: int) -> dict:
+    return {
+        "options": {"type": "undirected"},
+        "nodes": [
+            {"key": f"v{index}", "attributes": {"x": index / 7, "size": index % 5}}
+            for index in range(node_count)
+        ],
+        "edges": [
+            {"source": f"v{index}", "target": f"v{index + 1}", "undirected": True}
+            for index in range(node_count - 1)
+        ],
+    }
+
+
+@pytest.mark.parametrize(
+    "graph_json",
+    [
+        {},
+        json.loads(DEFAULT_GRAPH_JSON),
+        normalize_graph_json(_big_graph_json(300))[0],
+    ],
+)
+def test_compact_graph_round_trip(graph_json):
+    assert decode_compact(encode_compact(graph_json)) == graph_json
+
+
+def test_compact_graph_size():
+    graph_json, _ = normalize_graph_json(_big_graph_json(3000))
+    assert len(encode_compact(graph_json)) < len(json.dumps(graph_json)) / 4
+
+
+def _compact_payload(header) -> bytes:
+    header_text = json.dumps(header).encode()
+    return COMPACT_MAGIC + zlib.compress(
+        struct.pack("<I", len(header_text)) + header_text
+    )
+
+
+@pytest.mark.parametrize(
+    "compact",
+    [
+        b"not a compact graph",
+        COMPACT_MAGIC + b"broken",
+        COMPACT_MAGIC + zlib.compress(b""),
+        COMPACT_MAGIC + zlib.compress(b"graph")[:-4],
+        _compact_payload({}),
+        _compact_payload([]),
+        _compact_payload("header"),
+        _compact_payload(
+            {
+                "graph": {},
+                "sections": ["nodes"],
+                "node_keys": ["a"],
+                "nodes": {"fields": {"x": {"array": "Z"}}},
+            }
+        ),
+    ],
+)
+def test_compact_graph_corrupted(compact):
+    with pytest.raises(ValidationError):
+        decode_compact(compact)
+
+
+def test_compact_graph_too_large():
+    compact = COMPACT_MAGIC + zlib.compress(bytes(1024 * 1024))
+    with pytest.raises(ValidationError, match="larger than"):
+        decode_compact(compact, max_size=1024)
+
+
+def test_graph_compact_bridged(rf, settings, graph_fixture: Graph, admin_user: User):
+    settings.GRAPHERY_GRAPH_COMPACT_MIN_NODES = 100
+    graph_json, _ = normalize_graph_json(_big_graph_json(100))
+    request = make_request_with_user(rf, admin_user)
+
+    GraphBridge.bridges_from_model_info(
+        GraphMutationType(
+            id=graph_fixture.id,
+            graph_anchor=GraphAnchorMutationType(id=graph_fixture.graph_anchor.id),
+            graph_json=json.dumps(graph_json),
+        ),
+        request=request,
+    )
+    graph = Graph.objects.get(id=graph_fixture.id)
+    assert graph.graph_json is None
+    assert graph.graph_meta["node_count"] == 100
+    assert graph.get_graph_json() == graph_json
+
+    # the compact form is taken as input as well, and small graphs stay in json
+    GraphBridge.bridges_from_model_info(
+        GraphMutationType(
+            id=graph_fixture.id,
+            graph_anchor=GraphAnchorMutationType(id=graph_fixture.graph_anchor.id),
+            graph_compact=base64.b64encode(
+                encode_compact(json.loads(DEFAULT_GRAPH_JSON))
+            ).decode(),
+        ),
+        request=request,
+    )
+    graph = Graph.objects.get(id=graph_fixture.id)
+    assert graph.graph_compact is None
+    assert graph.graph_json == json.loads(DEFAULT_GRAPH_JSON)
+
+    with pytest.raises(ValidationError):
+        GraphBridge.bridges_from_model_info(
+            GraphMutationType(
+                id=graph_fixture.id,
+                graph_anchor=GraphAnchorMutationType(id=graph_fixture.graph_anchor.id),
+                graph_compact="not base64!",
+            ),
+            request=request,
+        )
+
+    # the json and the compact form can't be set together
+    with pytest.raises(ValidationError, match="same time"):
+        GraphBridge.bridges_from_model_info(
+            GraphMutationType(
+                id=graph_fixture.id,
+                graph_anchor=GraphAnchorMutationType(id=graph_fixture.graph_anchor.id),
+                graph_json=DEFAULT_GRAPH_JSON,
+                graph_compact=base64.b64encode(
+                    encode_compact(json.loads(DEFAULT_GRAPH_JSON))
+                ).decode(),
+            ),
+            request=request,
+        )
+
+
+def _grid_graph_json(side: int) -> dict:
+    return {
+        "nodes": [
+            {"key": f"{x}-{y}", "attributes": {"x": x * 10.0, "y": y * 10.0 + 5}}
+            for x in range(side)
+            for y in range(side)
+        ],
+        "edges": [
+            {"source": f"{x}-{y}", "target": f"{x + 1}-{y}"}
+            for x in range(side - 1)
+            for y in range(side)
+        ],
+    }
+
+
+def test_compute_graph_layouts():
+    graph_json, _ = normalize_graph_json(_grid_graph_json(20))
+    layouts = compute_graph_layouts(
+        graph_json, grid_sizes=(2, 4, 100), min_clustered_nodes=100, precision=2
+    )
+
+    # the 100 grid has as many cells used as nodes, so it's not kept
+    assert [layout["attributes"]["level"] for layout in layouts] == [0, 1, 2]
+    assert [len(layout["nodes"]) for layout in layouts] == [400, 16, 4]
+    assert [layout["attributes"].get("gridSize") for layout in layouts] == [
+        None,
+        4,
+        2,
+    ]
+
+    detail = layouts[0]
+    assert detail["attributes"]["boundingBox"] == [0.0, 5.0, 190.0, 195.0]
+    assert all(
+        0 <= node["attributes"]["x"] <= 1 and 0 <= node["attributes"]["y"] <= 1
+        for node in detail["nodes"]
+    )
+    assert detail["nodes"][1]["attributes"] == {"x": 0.0, "y": 0.05}
+    assert len(detail["edges"]) == 380
+
+    # every node and edge is counted in the coarsest level
+    coarsest = layouts[-1]
+    assert sum(node["attributes"]["size"] for node in coarsest["nodes"]) == 400
+    assert sum(edge["attributes"]["weight"] for edge in coarsest["edges"]) == 20
+
+    assert (
+        len(
+            compute_graph_layouts(
+                graph_json, grid_sizes=(2, 4), min_clustered_nodes=401, precision=2
+            )
+        )
+        == 1
+    )
+
+
+def test_graph_layouts_bridged(rf, settings, graph_fixture: Graph, admin_user: User):
+    settings.GRAPHERY_GRAPH_LAYOUT_GRID_SIZES = (4, 2)
+    settings.GRAPHERY_GRAPH_LAYOUT_MIN_CLUSTERED_NODES = 100
+    graph_json, _ = normalize_graph_json(_grid_graph_json(20))
+
+    # the layouts are computed by a job queued with the graph
+    for _ in range(2):
+        GraphBridge.bridges_from_model_info(
+            GraphMutationType(
+                id=graph_fixture.id,
+                graph_anchor=GraphAnchorMutationType(id=graph_fixture.graph_anchor.id),
+                graph_json=json.dumps(graph_json),
+            ),
+            request=make_request_with_user(rf, admin_user),
+        )
+    assert run_pending_jobs() == 1
+
+    assert list(
+        GraphLayout.objects.filter(graph=graph_fixture)
+        .order_by("level")
+        .values_list("level", "node_count")
+    ) == [(0, 400), (1, 16), (2, 4)]
+
+
+def test_graph_layouts_of_stale_graph(graph_fixture: Graph):
+    assert update_graph_layouts(graph_fixture.id)
+    assert GraphLayout.objects.filter(graph=graph_fixture).count() == 1
+
+    modified_time = Graph.objects.get(id=graph_fixture.id).modified_time
+    Graph.objects.filter(id=graph_fixture.id).update(
+        modified_time=modified_time - timedelta(seconds=1)
+    )
+    layout = GraphLayout.objects.get(graph=graph_fixture)
+    assert layout.source_modified_time == modified_time
+
+    # layouts computed from an older graph are not stored
+    assert not graph_layout_module._store_layouts(graph_fixture.id, modified_time, [])
+    assert GraphLayout.objects.filter(graph=graph_fixture).count() == 1
+
+
 @pytest.mark.parametrize("get_fixture", USER_LIST, indirect=True)
 def test_delete_graph(rf, graph_fixture: Graph, get_fixture):
     request = make_request_with_user(rf, graph_fixture.makers.first())
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from ...jobs import (
+    claim_job,
+    delete_finished_jobs,
+    enqueue_job,
+    requeue_stale_jobs,
+    run_job,
+    run_pending_jobs,
+    task_path,
+)
+from ...management.commands.run_jobs import _work
+from ...models import Job, JobStatus
+
+_calls = []
+
+
+def record_call(name: str, fail: bool = False) -> None:
+    _calls.append(name)
+    if fail:
+        raise ValueError(name)
+
+
+@pytest.fixture
+def calls(db):
+    _calls.clear()
+    yield _calls
+    _calls.clear()
+
+
+def test_task_path():
+    assert task_path(record_call) == f"{__name__}.record_call"
+    with pytest.raises(ValueError):
+        task_path(lambda: None)
+
+
+def test_enqueue_job_with_dedup_key(calls):
+    job = enqueue_job(record_call, dedup_key="key", name="a")
+    assert enqueue_job(record_call, dedup_key="key", name="b").id == job.id
+
+    # the queued job takes the higher priority
+    assert enqueue_job(record_call, dedup_key="key", priority=5).priority == 5
+    assert Job.objects.get(id=job.id).priority == 5
+    assert enqueue_job(record_call, dedup_key="key", priority=1).priority == 5
+
+    assert run_pending_jobs() == 1
+    assert calls == ["a"]
+
+    # the key is free again once the job is no longer queued
+    assert enqueue_job(record_call, dedup_key="key", name="c").id != job.id
+
+
+def test_claim_job_order(calls):
+    enqueue_job(record_call, name="low", priority=-1)
+    enqueue_job(record_call, name="first")
+    enqueue_job(record_call, name="second")
+    enqueue_job(record_call, name="high", priority=1)
+    enqueue_job(
+        record_call, name="later", run_after=timezone.now() + timedelta(hours=1)
+    )
+
+    assert run_pending_jobs() == 4
+    assert calls == ["high", "first", "second", "low"]
+    assert Job.objects.filter(status=JobStatus.QUEUED).count() == 1
+
+    assert claim_job("worker", task_paths=["other.task"]) is None
+
+
+def test_run_job_retries(calls, settings):
+    settings.GRAPHERY_JOB_RETRY_DELAY = 10
+    job = enqueue_job(record_call, name="fail", fail=True, max_attempts=2)
+
+    job = claim_job("worker")
+    assert job.status == JobStatus.RUNNING and job.attempts == 1
+    assert job.locked_by == "worker"
+    assert run_job(job) == JobStatus.QUEUED
+    job.refresh_from_db()
+    assert "ValueError: fail" in job.last_error
+    assert job.locked_by == "" and job.locked_time is None
+    assert job.run_after > timezone.now() + timedelta(seconds=5)
+
+    # the job waits for the delay before it's retried
+    assert claim_job("worker") is None
+    Job.objects.filter(id=job.id).update(run_after=timezone.now())
+    assert run_job(claim_job("worker")) == JobStatus.FAILED
+    assert Job.objects.get(id=job.id).attempts == 2
+    assert calls == ["fail", "fail"]
+
+
+def test_requeue_stale_jobs(transactional_db, calls, settings):
+    settings.GRAPHERY_JOB_TIMEOUT = 60
+    enqueue_job(record_call, name="stale")
+    job = claim_job("gone")
+    assert requeue_stale_jobs() == 0
+
+    Job.objects.filter(id=job.id).update(
+        locked_time=timezone.now() - timedelta(seconds=61)
+    )
+    assert requeue_stale_jobs() == 1
+    job.refresh_from_db()
+    assert job.status == JobStatus.QUEUED and job.locked_by == ""
+
+    assert _work(None, once=True, poll_interval=0) == 1
+    assert calls == ["stale"]
+    assert Job.objects.get(id=job.id).status == JobStatus.DONE
+
+
+def test_claim_job_without_skip_locked(calls, monkeypatch):
+    # the databases without SKIP LOCKED, like SQLite, claim with an update
+    monkeypatch.setattr(connection.features, "has_select_for_update_skip_locked", False)
+    enqueue_job(record_call, name="first")
+    enqueue_job(record_call, name="high", priority=1)
+
+    high, first = claim_job("worker"), claim_job("worker")
+    assert (high.kwargs["name"], first.kwargs["name"]) == ("high", "first")
+    assert high.status == first.status == JobStatus.RUNNING
+    assert high.attempts == first.attempts == 1
+    assert claim_job("worker") is None
+
+
+def test_enqueue_job_after_queued_job_claimed(calls, monkeypatch):
+    queued = enqueue_job(record_call, dedup_key="key", name="a")
+    get = Job.objects.get
+
+    def claimed_before_get(*args, **kwargs):
+        # a worker claims the queued job between the insert and the lookup
+        monkeypatch.setattr(Job.objects, "get", get)
+        claim_job("worker")
+        return get(*args, **kwargs)
+
+    monkeypatch.setattr(Job.objects, "get", claimed_before_get)
+    job = enqueue_job(record_call, dedup_key="key", name="b")
+    assert job.id != queued.id
+    assert Job.objects.filter(dedup_key="key", status=JobStatus.QUEUED).count() == 1
+
+
+def test_delete_finished_jobs(calls, settings):
+    settings.GRAPHERY_JOB_RETENTION = 60
+    for name in ("done", "failed", "queued"):
+        enqueue_job(record_call, name=name)
+    Job.objects.filter(kwargs__name="done").update(status=JobStatus.DONE)
+    Job.objects.filter(kwargs__name="failed").update(status=JobStatus.FAILED)
+    assert delete_finished_jobs() == 0
+
+    Job.objects.update(modified_time=timezone.now() - timedelta(seconds=61))
+    assert delete_finished_jobs() == 2
+    assert list(Job.objects.values_list("status", flat=True)) == [JobStatus.QUEUED]
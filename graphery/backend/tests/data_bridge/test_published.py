@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import pytest
+
+from ..utils import make_request_with_user, make_django_context
+from ...baker_recipes import (
+    tutorial_recipe,
+    tutorial_anchor_recipe,
+    graph_description_recipe,
+    graph_anchor_recipe,
+)
+from ...models import (
+    LangCode,
+    PublishedGraphDescription,
+    PublishedTutorial,
+    Status,
+    Tutorial,
+    compact_version,
+    first_in_lang,
+    first_in_lang_by_anchor,
+    lang_fallbacks,
+)
+from ...schema import schema
+
+BODY = "".join(f"line {i} of the tutorial\n" for i in range(50))
+
+
+def make_version(tutorial_anchor, content: str, status: Status, back=None):
+    return tutorial_recipe.make(
+        tutorial_anchor=tutorial_anchor,
+        lang_code=LangCode.EN,
+        title="title",
+        abstract="abstract",
+        content_markdown=content,
+        item_status=status,
+        back=back,
+    )
+
+
+def published_content(tutorial_anchor) -> str | None:
+    published = PublishedTutorial.objects.filter(
+        tutorial_anchor=tutorial_anchor, lang_code=LangCode.EN
+    ).first()
+    return published and published.content_markdown
+
+
+def test_published_tutorial_follows_versions(transactional_db):
+    tutorial_anchor = tutorial_anchor_recipe.make()
+    other = make_version(tutorial_anchor_recipe.make(), "other", Status.PUBLISHED)
+
+    first = make_version(tutorial_anchor, "first", Status.PUBLISHED)
+    assert published_content(tutorial_anchor) == "first"
+
+    # drafts on top of the published version are not read
+    second = make_version(tutorial_anchor, "second\n" + BODY, Status.DRAFT, back=first)
+    assert published_content(tutorial_anchor) == "first"
+
+    # publishing closes the older published version of the same anchor only
+    second.item_status = Status.PUBLISHED
+    second.save()
+    assert published_content(tutorial_anchor) == "second\n" + BODY
+    assert Tutorial.objects.get(id=first.id).item_status == Status.CLOSED
+    assert Tutorial.objects.get(id=other.id).item_status == Status.PUBLISHED
+
+    # the published texts are kept in full when the version is compacted
+    make_version(tutorial_anchor, "third\n" + BODY, Status.DRAFT, back=second)
+    assert compact_version(Tutorial.objects.get(id=second.id))
+    assert published_content(tutorial_anchor) == "second\n" + BODY
+
+    second = Tutorial.objects.get(id=second.id)
+    second.item_status = Status.DRAFT
+    second.save()
+    assert published_content(tutorial_anchor) is None
+    assert published_content(other.tutorial_anchor) == "other"
+
+
+def test_older_versions_closed_on_status_change(transactional_db):
+    tutorial_anchor = tutorial_anchor_recipe.make()
+    first = make_version(tutorial_anchor, "first", Status.PUBLISHED)
+    # a second published version, like one loaded before the versions were closed
+    second = make_version(tutorial_anchor, "second", Status.DRAFT, back=first)
+    Tutorial.objects.filter(id=second.id).update(item_status=Status.PUBLISHED)
+
+    # editing a published version doesn't close the others
+    first.title = "edited title"
+    first.save()
+    assert Tutorial.objects.get(id=second.id).item_status == Status.PUBLISHED
+
+    # publishing it again does
+    first.item_status = Status.DRAFT
+    first.save()
+    first.item_status = Status.PUBLISHED
+    first.save()
+    assert Tutorial.objects.get(id=second.id).item_status == Status.CLOSED
+
+
+def test_published_graph_description_deleted(transactional_db):
+    graph_description = graph_description_recipe.make(
+        item_status=Status.PUBLISHED, description_markdown="published"
+    )
+    published = PublishedGraphDescription.objects.get(
+        graph_anchor=graph_description.graph_anchor
+    )
+    assert published.as_version().id == graph_description.id
+
+    graph_description.delete()
+    assert not PublishedGraphDescription.objects.exists()
+
+
+tutorial_content_query = """
+    query TutorialContent($url: String!) {
+        tutorialContent(url: $url, lang: EN) {
+            id
+            contentMarkdown
+        }
+    }
+"""
+
+
+@pytest.mark.parametrize(
+    "user_fixture, expected",
+    [("reader_user", "published"), ("editor_user", "draft")],
+)
+def test_tutorial_content_read_from_published(rf, request, user_fixture, expected):
+    user = request.getfixturevalue(user_fixture)
+    tutorial_anchor = tutorial_anchor_recipe.make()
+    published = make_version(tutorial_anchor, "published", Status.PUBLISHED)
+    make_version(tutorial_anchor, "draft", Status.DRAFT, back=published)
+
+    context = make_django_context(make_request_with_user(rf, user))
+    result = schema.execute_sync(
+        tutorial_content_query,
+        variable_values={"url": tutorial_anchor.url},
+        context_value=context,
+    )
+
+    assert result.errors is None
+    assert result.data["tutorialContent"]["contentMarkdown"] == expected
+
+
+def test_lang_fallbacks(settings):
+    settings.GRAPHERY_LANG_FALLBACKS = {"PT_BR": ("EN_GB",)}
+    assert lang_fallbacks("PT_BR") == [
+        LangCode.PT_BR,
+        LangCode.EN_GB,
+        LangCode.PT,
+        LangCode.EN,
+    ]
+    assert lang_fallbacks(LangCode.EN) == [LangCode.EN]
+
+
+@pytest.mark.parametrize(
+    "user_fixture, expected",
+    [("reader_user", "published"), ("editor_user", "draft")],
+)
+def test_tutorial_content_lang_fallback(rf, request, user_fixture, expected):
+    user = request.getfixturevalue(user_fixture)
+    tutorial_anchor = tutorial_anchor_recipe.make()
+    published = make_version(tutorial_anchor, "published", Status.PUBLISHED)
+    make_version(tutorial_anchor, "draft", Status.DRAFT, back=published)
+
+    # the tutorial isn't in the requested language, and english is read instead
+    context = make_django_context(make_request_with_user(rf, user))
+    result = schema.execute_sync(
+        tutorial_content_query.replace("lang: EN", "lang: ZH_HANS"),
+        variable_values={"url": tutorial_anchor.url},
+        context_value=context,
+    )
+
+    assert result.errors is None
+    assert result.data["tutorialContent"]["contentMarkdown"] == expected
+
+
+def test_first_in_lang(transactional_db, settings, django_assert_num_queries):
+    settings.GRAPHERY_LANG_FALLBACKS = {"ZH_HANS": ("ZH_HANT",)}
+    graph_anchors = graph_anchor_recipe.make(_quantity=3)
+    for graph_anchor, lang_codes in zip(
+        graph_anchors, [(LangCode.EN, LangCode.ZH_HANT), (LangCode.EN,), ()]
+    ):
+        for lang_code in lang_codes:
+            graph_description_recipe.make(
+                graph_anchor=graph_anchor,
+                lang_code=lang_code,
+                title=lang_code,
+                item_status=Status.PUBLISHED,
+            )
+
+    published = PublishedGraphDescription.objects.all()
+    with django_assert_num_queries(1):
+        assert (
+            first_in_lang(published.filter(graph_anchor=graph_anchors[0]), "ZH_HANS")
+        ).title == LangCode.ZH_HANT
+    assert (
+        first_in_lang(published.filter(graph_anchor=graph_anchors[1]), "ZH_HANS")
+    ).title == LangCode.EN
+    assert first_in_lang(published.filter(graph_anchor=graph_anchors[2]), "EN") is None
+
+    with django_assert_num_queries(1):
+        rows = first_in_lang_by_anchor(
+            published,
+            "ZH_HANS",
+            "graph_anchor",
+            [graph_anchor.id for graph_anchor in graph_anchors],
+        )
+    assert {anchor_id: row.title for anchor_id, row in rows.items()} == {
+        graph_anchors[0].id: LangCode.ZH_HANT,
+        graph_anchors[1].id: LangCode.EN,
+    }
+
+
+def test_graph_descriptions_of_listing_batched(
+    rf, reader_user, django_assert_num_queries
+):
+    graph_anchors = graph_anchor_recipe.make(_quantity=5, item_status=Status.PUBLISHED)
+    for graph_anchor in graph_anchors:
+        graph_description_recipe.make(
+            graph_anchor=graph_anchor,
+            lang_code=LangCode.EN,
+            title=graph_anchor.anchor_name,
+            item_status=Status.PUBLISHED,
+        )
+
+    context = make_django_context(make_request_with_user(rf, reader_user))
+    # one query for the anchors and one for their descriptions
+    with django_assert_num_queries(2):
+        result = schema.execute_sync(
+            """
+            query {
+                graphAnchors {
+                    anchorName
+                    graphDescription(lang: PT_BR) {
+                        title
+                    }
+                }
+            }
+            """,
+            context_value=context,
+        )
+
+    assert result.errors is None
+    assert all(
+        anchor["graphDescription"]["title"] == anchor["anchorName"]
+        for anchor in result.data["graphAnchors"]
+    )
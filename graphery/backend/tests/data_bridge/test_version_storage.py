@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from io import StringIO
+from typing import List
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+
+from ...baker_recipes import tutorial_recipe, tutorial_anchor_recipe
+from ...models import (
+    Tutorial,
+    make_delta,
+    apply_delta,
+    versioned_text,
+    compact_version_chain,
+    compact_previous_version,
+)
+
+BASE_CONTENT = "".join(f"line {i} of the tutorial\n" for i in range(200))
+
+
+def make_content(version: int) -> str:
+    return BASE_CONTENT + f"appended in version {version}\n"
+
+
+@pytest.fixture
+def tutorial_chain(transactional_db) -> List[Tutorial]:
+    """
+    a version chain of 12 tutorials, the last one is the head
+    """
+    tutorial_anchor = tutorial_anchor_recipe.make()
+    chain = []
+    back = None
+    for version in range(12):
+        back = tutorial_recipe.make(
+            tutorial_anchor=tutorial_anchor,
+            title=f"title {version}",
+            abstract="abstract",
+            content_markdown=make_content(version),
+            back=back,
+        )
+        chain.append(back)
+
+    return chain
+
+
+def test_delta_round_trip():
+    base = make_content(1)
+    target = "first line\n" + make_content(0).replace("line 3", "line three")
+
+    assert apply_delta(base, make_delta(base, target)) == target
+    assert apply_delta("", make_delta("", target)) == target
+    assert apply_delta(base, make_delta(base, "")) == ""
+
+
+def assert_chain_content(chain: List[Tutorial]) -> None:
+    for version, tutorial in enumerate(chain):
+        tutorial = Tutorial.objects.get(id=tutorial.id)
+        assert versioned_text(tutorial, "title") == f"title {version}"
+        assert versioned_text(tutorial, "abstract") == "abstract"
+        assert versioned_text(tutorial, "content_markdown") == make_content(version)
+
+
+@override_settings(GRAPHERY_VERSION_SNAPSHOT_INTERVAL=4)
+def test_compact_version_chain(tutorial_chain):
+    head = tutorial_chain[-1]
+
+    # the head and the one behind it are kept in full, and every 4th is a snapshot
+    assert compact_version_chain(head) == 8
+    compacted = [
+        Tutorial.objects.get(id=tutorial.id).version_delta is not None
+        for tutorial in tutorial_chain
+    ]
+    assert compacted == [True, True, True, False] * 2 + [True, True, False, False]
+    assert_chain_content(tutorial_chain)
+
+    # compacting again is a no-op
+    assert compact_version_chain(head) == 0
+
+
+@override_settings(GRAPHERY_VERSION_SNAPSHOT_INTERVAL=4)
+def test_compact_previous_version(tutorial_chain):
+    head = Tutorial.objects.get(id=tutorial_chain[-1].id)
+    assert compact_previous_version(head)
+    assert Tutorial.objects.get(id=tutorial_chain[-2].id).version_delta is not None
+    assert_chain_content(tutorial_chain)
+
+
+def test_changing_and_deleting_versions(tutorial_chain):
+    compact_version_chain(tutorial_chain[-1])
+
+    # the version behind is expanded before the text it is based on changes
+    changed = Tutorial.objects.get(id=tutorial_chain[9].id)
+    assert changed.version_delta is None
+    changed.content_markdown = "changed"
+    changed.save()
+
+    expanded = Tutorial.objects.get(id=tutorial_chain[8].id)
+    assert expanded.version_delta is None
+    assert expanded.content_markdown == make_content(8)
+
+    # and before the version it is based on is deleted
+    Tutorial.objects.get(id=tutorial_chain[7].id).delete()
+    expanded = Tutorial.objects.get(id=tutorial_chain[6].id)
+    assert expanded.version_delta is None
+    assert versioned_text(expanded, "content_markdown") == make_content(6)
+    assert versioned_text(
+        Tutorial.objects.get(id=tutorial_chain[0].id), "content_markdown"
+    ) == make_content(0)
+
+
+def test_compact_versions_command(tutorial_chain):
+    out = StringIO()
+    call_command("compact_versions", "--benchmark", stdout=out)
+    assert "Tutorial: 9 versions compacted" in out.getvalue()
+    assert_chain_content(tutorial_chain)
+
+    call_command("compact_versions", "--expand", stdout=out)
+    assert all(tutorial.version_delta is None for tutorial in Tutorial.objects.all())
+    assert_chain_content(tutorial_chain)
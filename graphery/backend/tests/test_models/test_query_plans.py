@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import re
+from typing import Type
+
+import pytest
+from django.db import connection, models
+
+from ...baker_recipes.make_scale_examples import anchor_rank
+from ...models import (
+    Code,
+    ExecutionResult,
+    GraphAnchor,
+    GraphDescription,
+    OrderedAnchorTable,
+    Status,
+    Tutorial,
+    TutorialAnchor,
+)
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="the query plans are from PostgreSQL"
+)
+
+ANCHOR_COUNT = 1000
+GRAPH_ANCHOR_COUNT = 10
+VERSION_COUNT = 5
+LANGS = ("en", "zh_CN")
+
+
+def assert_no_seq_scan(query_set: models.QuerySet, model: Type[models.Model]):
+    """
+    fail when the query reads the whole table of the model
+    """
+    plan = query_set.explain()
+    assert not re.search(rf"Seq Scan on {model._meta.db_table}\b", plan), plan
+
+
+@pytest.fixture
+def seeded_db(db):
+    # few items are published, like the drafts and closed versions
+    # piling up behind every published one
+    tutorial_anchors = TutorialAnchor.objects.bulk_create(
+        TutorialAnchor(
+            url=f"tutorial-{i}",
+            anchor_name=f"tutorial anchor {i}",
+            rank=anchor_rank(i),
+            item_status=Status.PUBLISHED if i % 20 == 0 else Status.DRAFT,
+        )
+        for i in range(ANCHOR_COUNT)
+    )
+    graph_anchors = GraphAnchor.objects.bulk_create(
+        GraphAnchor(url=f"graph-{i}", anchor_name=f"graph anchor {i}")
+        for i in range(GRAPH_ANCHOR_COUNT)
+    )
+    codes = Code.objects.bulk_create(
+        Code(tutorial_anchor=anchor, name=anchor.url, code="")
+        for anchor in tutorial_anchors
+    )
+
+    Tutorial.objects.bulk_create(
+        Tutorial(
+            tutorial_anchor=anchor,
+            lang_code=lang,
+            title="title",
+            abstract="",
+            content_markdown="",
+            item_status=Status.PUBLISHED if version == 0 else Status.CLOSED,
+        )
+        for anchor in tutorial_anchors
+        for lang in LANGS
+        for version in range(VERSION_COUNT)
+    )
+    GraphDescription.objects.bulk_create(
+        GraphDescription(
+            graph_anchor=anchor,
+            lang_code=LANGS[i % len(LANGS)],
+            title="title",
+            description_markdown="",
+            item_status=Status.PUBLISHED if i % 100 == 0 else Status.CLOSED,
+        )
+        for anchor in graph_anchors
+        for i in range(ANCHOR_COUNT)
+    )
+    OrderedAnchorTable.objects.bulk_create(
+        OrderedAnchorTable(tutorial_anchor=tutorial_anchor, graph_anchor=graph_anchor)
+        for tutorial_anchor in tutorial_anchors
+        for graph_anchor in graph_anchors
+    )
+    ExecutionResult.objects.bulk_create(
+        ExecutionResult(
+            code=code, graph_anchor=graph_anchor, result_json={}, result_json_meta={}
+        )
+        for code in codes
+        for graph_anchor in graph_anchors
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+    return tutorial_anchors, graph_anchors, codes
+
+
+def test_hot_lookups_use_indexes(seeded_db):
+    tutorial_anchors, graph_anchors, codes = seeded_db
+    anchor = tutorial_anchors[1]
+
+    # tutorials and graph descriptions in a language
+    assert_no_seq_scan(
+        Tutorial.objects.filter(tutorial_anchor__url=anchor.url, lang_code="en"),
+        Tutorial,
+    )
+    assert_no_seq_scan(
+        GraphDescription.objects.filter(
+            graph_anchor__id=graph_anchors[0].id, lang_code="en"
+        ),
+        GraphDescription,
+    )
+
+    # published items
+    assert_no_seq_scan(
+        Tutorial.objects.filter(
+            tutorial_anchor=anchor, lang_code="en", item_status=Status.PUBLISHED
+        ),
+        Tutorial,
+    )
+    assert_no_seq_scan(
+        GraphDescription.objects.filter(
+            graph_anchor=graph_anchors[0], item_status=Status.PUBLISHED
+        ),
+        GraphDescription,
+    )
+    assert_no_seq_scan(
+        TutorialAnchor.objects.filter(item_status=Status.PUBLISHED), TutorialAnchor
+    )
+
+    # the graphs of a tutorial and the results of a graph
+    assert_no_seq_scan(
+        OrderedAnchorTable.objects.filter(tutorial_anchor=anchor).order_by("order"),
+        OrderedAnchorTable,
+    )
+    assert_no_seq_scan(
+        ExecutionResult.objects.filter(graph_anchor=graph_anchors[0], code=codes[0]),
+        ExecutionResult,
+    )
+    assert_no_seq_scan(
+        ExecutionResult.objects.filter(graph_anchor=graph_anchors[0]).values("code"),
+        ExecutionResult,
+    )
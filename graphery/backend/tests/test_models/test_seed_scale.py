@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from ...models import (
+    ExecutionResult,
+    Graph,
+    PublishedTutorial,
+    Status,
+    Tutorial,
+    TutorialAnchor,
+    versioned_text,
+)
+
+SCALE_OPTIONS = dict(
+    users=5,
+    tag_anchors=3,
+    tutorial_anchors=4,
+    graph_anchors=5,
+    versions=3,
+    nodes=30,
+    edges=60,
+    steps=250,
+    batch_size=7,
+)
+
+
+def test_seed_scale(db):
+    call_command("seed_scale", prefix="first", **SCALE_OPTIONS)
+
+    assert TutorialAnchor.objects.count() == 4
+    # a chain in both languages for every anchor, with one published version each
+    assert Tutorial.objects.count() == 4 * 2 * 3
+    assert Tutorial.objects.filter(back=None).count() == 4 * 2
+    assert PublishedTutorial.objects.count() == 4 * 2
+    assert all(
+        published.tutorial.item_status == Status.PUBLISHED
+        and published.tutorial.content_markdown == published.content_markdown
+        for published in PublishedTutorial.objects.select_related("tutorial")
+    )
+
+    # the oldest version of every chain is stored as a delta of the one in front
+    compacted = Tutorial.objects.exclude(version_delta=None).select_related("front")
+    assert {tutorial.back_id for tutorial in compacted} == {None}
+    assert len(compacted) == 4 * 2
+    for tutorial in compacted:
+        assert tutorial.content_markdown == ""
+        assert versioned_text(tutorial, "content_markdown").count("## section") == (
+            tutorial.front.content_markdown.count("## section")
+        )
+
+    for result in ExecutionResult.objects.all():
+        steps = result.get_steps(0, result.step_count)
+        assert result.step_count == len(steps.split('"line"')) - 1
+
+    with pytest.raises(CommandError):
+        call_command("seed_scale", prefix="first", **SCALE_OPTIONS)
+
+    # the same seed makes the same data
+    call_command("seed_scale", prefix="second", **SCALE_OPTIONS)
+    first, second = (
+        [
+            graph.graph_meta
+            for graph in Graph.objects.filter(
+                graph_anchor__url__startswith=f"{prefix}-"
+            ).order_by("graph_anchor__anchor_name")
+        ]
+        for prefix in ("first", "second")
+    )
+    assert first == second
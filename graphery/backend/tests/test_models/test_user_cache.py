@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from django.contrib import auth
+from django.contrib.auth.models import AnonymousUser, Group, Permission
+from django.core.cache import cache
+from django.core.management import call_command
+
+from ...baker_recipes import USER_PASSWORD
+from ...data_bridge import UserBridge
+from ...hashers import HASHERS, password_hashers
+from ...models import cached_user_key
+from ...user_cache import get_cached_user
+
+
+@pytest.fixture
+def session_request(rf, client, reader_user):
+    cache.delete(cached_user_key(reader_user.id))
+    client.force_login(reader_user)
+    request = rf.get("/")
+    request.session = client.session
+    # the session is loaded before the queries are counted
+    request.session.load()
+    return request
+
+
+def test_user_cached(session_request, reader_user, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        assert get_cached_user(session_request) == reader_user
+    with django_assert_num_queries(0):
+        user = get_cached_user(session_request)
+    assert user == reader_user and user.role == reader_user.role
+
+    # saved through the bridge, the user is read again
+    bridge = UserBridge(reader_user.id).get_instance()
+    bridge._model_instance.displayed_name = "renamed"
+    bridge.save()
+    with django_assert_num_queries(1):
+        assert get_cached_user(session_request).displayed_name == "renamed"
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda user, group, permission: user.groups.add(group),
+        lambda user, group, permission: group.user_set.remove(user),
+        lambda user, group, permission: user.user_permissions.add(permission),
+        lambda user, group, permission: permission.user_set.add(user),
+        lambda user, group, permission: group.permissions.add(permission),
+        lambda user, group, permission: group.user_set.clear(),
+        lambda user, group, permission: permission.group_set.clear(),
+    ],
+)
+def test_user_forgotten_on_permission_change(session_request, reader_user, change):
+    group = Group.objects.create(name="cached group")
+    permission = Permission.objects.get(codename="view_user")
+    reader_user.groups.add(group)
+    group.permissions.add(permission)
+    assert get_cached_user(session_request) == reader_user
+    assert cache.get(cached_user_key(reader_user.id)) is not None
+
+    change(reader_user, group, permission)
+    assert cache.get(cached_user_key(reader_user.id)) is None
+
+
+def test_session_ended_by_password_change(session_request, reader_user):
+    assert get_cached_user(session_request) == reader_user
+
+    reader_user.set_password("another password")
+    reader_user.save()
+    # cached again with the new password by another request
+    cache.set(
+        cached_user_key(reader_user.id),
+        type(reader_user).objects.get(id=reader_user.id),
+    )
+
+    assert isinstance(get_cached_user(session_request), AnonymousUser)
+
+
+def test_password_hashers():
+    assert password_hashers("pbkdf2")[:3] == [
+        HASHERS["pbkdf2"],
+        HASHERS["argon2"],
+        HASHERS["scrypt"],
+    ]
+    assert password_hashers("argon2")[0] in HASHERS.values()
+    with pytest.raises(ValueError):
+        password_hashers("md5")
+
+
+def test_password_rehashed_on_login(settings, reader_user):
+    settings.GRAPHERY_PBKDF2_ITERATIONS = 1000
+    settings.PASSWORD_HASHERS = password_hashers("pbkdf2")
+    reader_user.set_password(USER_PASSWORD)
+    reader_user.save()
+    assert reader_user.password.startswith("pbkdf2_sha256$1000$")
+
+    # the costs are raised
+    settings.GRAPHERY_PBKDF2_ITERATIONS = 2000
+    assert auth.authenticate(username=reader_user.username, password=USER_PASSWORD)
+    reader_user.refresh_from_db()
+    assert reader_user.password.startswith("pbkdf2_sha256$2000$")
+
+    # the hasher is changed
+    settings.PASSWORD_HASHERS = password_hashers("scrypt")
+    assert auth.authenticate(username=reader_user.username, password=USER_PASSWORD)
+    reader_user.refresh_from_db()
+    assert reader_user.password.startswith("scrypt$")
+
+
+def test_benchmark_hashers(capsys):
+    call_command("benchmark_hashers", iterations=1, json=True)
+
+    report = json.loads(capsys.readouterr().out)
+    assert "pbkdf2" in report
+    assert sum(times["preferred"] for times in report.values()) == 1
+    assert all(times["hash_ms"] > 0 for times in report.values())
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import json
+
+from django.core.management import call_command
+
+from ...benchmarks import SCENARIOS
+from ...models import ExecutionResult, Tutorial, TutorialAnchor
+
+
+def test_benchmark_command(transactional_db, tmp_path, capsys):
+    report_path = tmp_path / "report.json"
+    call_command("benchmark", scale=3, iterations=3, warmup=1, output=str(report_path))
+
+    report = json.loads(report_path.read_text())
+    assert report["meta"]["scale"] == 3
+    assert [result["name"] for result in report["results"]] == [
+        scenario.name for scenario in SCENARIOS
+    ]
+    for result in report["results"]:
+        latency = result["latency_ms"]
+        assert 0 < latency["min"] <= latency["p50"] <= latency["p99"] <= latency["max"]
+        assert result["peak_memory_kb"] > 0
+    assert all(
+        result["queries"] > 0
+        for result in report["results"]
+        if result["name"] != "execution_request"
+    )
+
+    # the seeded data and the mutated versions are rolled back
+    assert not TutorialAnchor.objects.exists()
+    assert not Tutorial.objects.exists()
+    assert not ExecutionResult.objects.exists()
+
+    call_command(
+        "benchmark",
+        scale=3,
+        iterations=2,
+        scenario=["graph"],
+        output=str(tmp_path / "graph.json"),
+        compare=str(report_path),
+    )
+    assert capsys.readouterr().out.startswith("graph: p50 ")
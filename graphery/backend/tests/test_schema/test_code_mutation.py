@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connections
+
+from .utils import MutationChecker
+from ..utils import ORIGINAL_TEST_CODE, BLACKED_TEST_CODE
+from ...baker_recipes import code_recipe
+from ... import code_formatter
+from ...data_bridge import code_bridge
+from ...code_formatter import format_code
+from ...models import Code
+from ...types import OperationType
+
+code_mutation_string = """
+    mutation MyMutation($op: OperationType!, $data: CodeMutationType!, $autosave: Boolean) {
+        mutateCode(op: $op, data: $data, autosave: $autosave) {
+            id
+            code
+        }
+    }
+"""
+
+
+@pytest.fixture()
+def code():
+    return code_recipe.make()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "autosave, expected_code",
+    [(False, BLACKED_TEST_CODE), (True, ORIGINAL_TEST_CODE)],
+)
+def test_update_code(
+    rf, author_user, code, session_middleware, autosave, expected_code
+):
+    MutationChecker(
+        code_mutation_string,
+        rf,
+        variables={
+            "op": OperationType.UPDATE.name,
+            "data": {
+                "id": str(code.id),
+                "code": ORIGINAL_TEST_CODE,
+                "tutorialAnchor": {"id": str(code.tutorial_anchor.id)},
+            },
+            "autosave": autosave,
+        },
+        user=author_user,
+        session_middleware=session_middleware,
+        has_error=False,
+        count_change=0,
+        model_cls=Code,
+        equals={"code": expected_code},
+    ).set_new_instance().check()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_update_code_concurrent_claim(rf, author_user, code, session_middleware):
+    based_on = code.modified_time.isoformat()
+    edits = [f"print({number})\n" for number in range(2)]
+    barrier = threading.Barrier(len(edits))
+
+    def update_code(edit: str) -> MutationChecker:
+        # both editors start from the same version at the same time
+        barrier.wait()
+        try:
+            return MutationChecker(
+                code_mutation_string,
+                rf,
+                variables={
+                    "op": OperationType.UPDATE.name,
+                    "data": {
+                        "id": str(code.id),
+                        "code": edit,
+                        "tutorialAnchor": {"id": str(code.tutorial_anchor.id)},
+                        "modifiedTime": based_on,
+                    },
+                    "autosave": True,
+                },
+                user=author_user,
+                session_middleware=session_middleware,
+            )
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=len(edits)) as executor:
+        checkers = list(executor.map(update_code, edits))
+
+    # only one of the changes claims the version, the other one is rejected
+    accepted = [checker for checker in checkers if not checker.result.errors]
+    rejected = [checker for checker in checkers if checker.result.errors]
+    assert len(accepted) == len(rejected) == 1
+    assert "changed by someone else" in rejected[0].result.errors[0].message
+    assert Code.objects.get(id=code.id).code == accepted[0].variables["data"]["code"]
+
+
+def test_format_code_memoized(settings, monkeypatch):
+    # only the memoized results of the test code are dropped from the shared cache
+    cache.delete_many(
+        [
+            code_formatter._formatted_key(test_code)
+            for test_code in (ORIGINAL_TEST_CODE, BLACKED_TEST_CODE)
+        ]
+    )
+    assert format_code(ORIGINAL_TEST_CODE) == BLACKED_TEST_CODE
+
+    def black_format_str(_):
+        raise AssertionError("memoized code should not be formatted again")
+
+    # format in this process, so that the formatter can be replaced
+    settings.GRAPHERY_CODE_FORMAT_WORKERS = 0
+    monkeypatch.setattr(code_formatter, "black_format_str", black_format_str)
+
+    assert format_code(ORIGINAL_TEST_CODE) == BLACKED_TEST_CODE
+    assert format_code(BLACKED_TEST_CODE) == BLACKED_TEST_CODE
+
+
+@pytest.mark.django_db
+def test_code_not_formatted_without_permission(
+    rf, reader_user, code, session_middleware, monkeypatch
+):
+    def format_code(_):
+        raise AssertionError("the code should not be formatted for a reader")
+
+    monkeypatch.setattr(code_bridge, "format_code", format_code)
+
+    checker = MutationChecker(
+        code_mutation_string,
+        rf,
+        variables={
+            "op": OperationType.UPDATE.name,
+            "data": {
+                "id": str(code.id),
+                "code": ORIGINAL_TEST_CODE,
+                "tutorialAnchor": {"id": str(code.tutorial_anchor.id)},
+            },
+        },
+        user=reader_user,
+        session_middleware=session_middleware,
+        has_error=True,
+    ).check()
+    assert "permission" in checker.result.errors[0].message
+
+
+def test_format_code_errors(settings, monkeypatch):
+    settings.GRAPHERY_CODE_FORMAT_WORKERS = 0
+    with pytest.raises(ValidationError, match="can't be formatted"):
+        format_code("def broken(:\n")
+
+    class _StuckPool:
+        def submit(self, *_):
+            return Future()
+
+    # the formatting never finishes in a stuck formatter process
+    settings.GRAPHERY_CODE_FORMAT_TIMEOUT = 0.01
+    monkeypatch.setattr(code_formatter, "_get_formatter_pool", _StuckPool)
+    with pytest.raises(ValidationError, match="took too long"):
+        format_code("stuck = 1\n")
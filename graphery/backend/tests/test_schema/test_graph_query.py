@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import base64
+import json
+
+import pytest
+from graphql import GraphQLError
+
+from ..utils import make_request_with_user, make_django_context
+from ...baker_recipes import graph_recipe, code_recipe
+from ...graph_format import normalize_graph_json, encode_compact, decode_compact
+from ...graph_layout import update_graph_layouts
+from ...models import Graph, ExecutionResult, Status
+from ...schema import schema
+
+GRAPH_JSON = {
+    "attributes": {"name": "raw graph"},
+    "nodes": [{"key": "1"}, {"key": "2"}],
+    "edges": [{"key": "1-2", "source": "1", "target": "2"}],
+}
+
+graph_query_string = """
+    query GraphQuery($anchorId: UUID!, $codeId: UUID!) {
+        graph(anchorId: $anchorId) {
+            graphJson
+            graphAnchor {
+                executionResult(codeId: $codeId) {
+                    resultJson
+                    resultJsonMeta
+                }
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture()
+def graph(transactional_db):
+    # the readers only read the published graphs
+    return graph_recipe.make(graph_json=GRAPH_JSON, item_status=Status.PUBLISHED)
+
+
+def test_graph_json_read_as_text(
+    rf, reader_user, graph, django_assert_num_queries, monkeypatch
+):
+    code = code_recipe.make()
+    ExecutionResult.objects.create(
+        code=code,
+        graph_anchor=graph.graph_anchor,
+        result_json={"steps": [{"line": 1}]},
+        result_json_meta={},
+    )
+
+    # the JSON columns are not parsed when they are read as text
+    def from_db_value(*_):
+        raise AssertionError("JSON column should not be parsed")
+
+    monkeypatch.setattr(
+        Graph._meta.get_field("graph_json"), "from_db_value", from_db_value
+    )
+
+    context = make_django_context(make_request_with_user(rf, reader_user))
+    with django_assert_num_queries(3):
+        result = schema.execute_sync(
+            graph_query_string,
+            variable_values={
+                "anchorId": str(graph.graph_anchor.id),
+                "codeId": str(code.id),
+            },
+            context_value=context,
+        )
+
+    assert result.errors is None
+    assert json.loads(result.data["graph"]["graphJson"]) == GRAPH_JSON
+    execution_result = result.data["graph"]["graphAnchor"]["executionResult"]
+    assert json.loads(execution_result["resultJson"]) == {"steps": [{"line": 1}]}
+    assert json.loads(execution_result["resultJsonMeta"]) == {}
+
+
+def test_graph_compact_query(rf, reader_user, graph):
+    graph_json, _ = normalize_graph_json(GRAPH_JSON)
+    Graph.objects.filter(id=graph.id).update(
+        graph_json=None, graph_compact=encode_compact(graph_json)
+    )
+
+    # the format is picked by the field selected, either form can be read
+    result = schema.execute_sync(
+        """
+        query GraphQuery($anchorId: UUID!) {
+            graph(anchorId: $anchorId) {
+                graphJson
+                graphCompact
+            }
+        }
+        """,
+        variable_values={"anchorId": str(graph.graph_anchor.id)},
+        context_value=make_django_context(make_request_with_user(rf, reader_user)),
+    )
+
+    assert result.errors is None
+    assert json.loads(result.data["graph"]["graphJson"]) == graph_json
+    compact = base64.b64decode(result.data["graph"]["graphCompact"])
+    assert decode_compact(compact) == graph_json
+
+
+def test_graph_layout_query(rf, reader_user, graph, settings):
+    settings.GRAPHERY_GRAPH_LAYOUT_MIN_CLUSTERED_NODES = 2
+    settings.GRAPHERY_GRAPH_LAYOUT_GRID_SIZES = (1,)
+    assert update_graph_layouts(graph.id)
+
+    result = schema.execute_sync(
+        """
+        query GraphQuery($anchorId: UUID!) {
+            graph(anchorId: $anchorId) {
+                layoutLevels
+                overview: layout {
+                    level
+                    nodeCount
+                    layoutJson
+                }
+                detail: layout(level: 0) {
+                    nodeCount
+                    edgeCount
+                }
+            }
+        }
+        """,
+        variable_values={"anchorId": str(graph.graph_anchor.id)},
+        context_value=make_django_context(make_request_with_user(rf, reader_user)),
+    )
+
+    assert result.errors is None
+    assert result.data["graph"]["layoutLevels"] == [0, 1]
+    overview = result.data["graph"]["overview"]
+    assert overview["level"] == 1 and overview["nodeCount"] == 1
+    assert json.loads(overview["layoutJson"])["nodes"][0]["attributes"]["size"] == 2
+    assert result.data["graph"]["detail"] == {"nodeCount": 2, "edgeCount": 1}
+
+
+def test_execution_result_steps_query(
+    rf, reader_user, graph, settings, django_assert_num_queries
+):
+    settings.GRAPHERY_EXECUTION_RESULT_SEGMENT_STEPS = 10
+    code = code_recipe.make()
+    execution_result = ExecutionResult.objects.create(
+        code=code, graph_anchor=graph.graph_anchor, result_json={}, result_json_meta={}
+    )
+    steps = [{"line": index} for index in range(35)]
+    execution_result.replace_steps(steps, 10)
+
+    context = make_django_context(make_request_with_user(rf, reader_user))
+    # only the segments in the range are read, in one query
+    with django_assert_num_queries(4):
+        result = schema.execute_sync(
+            """
+            query GraphQuery($anchorId: UUID!, $codeId: UUID!) {
+                graph(anchorId: $anchorId) {
+                    graphAnchor {
+                        executionResult(codeId: $codeId) {
+                            stepCount
+                            steps(offset: 8, limit: 15)
+                        }
+                    }
+                }
+            }
+            """,
+            variable_values={
+                "anchorId": str(graph.graph_anchor.id),
+                "codeId": str(code.id),
+            },
+            context_value=context,
+        )
+
+    assert result.errors is None
+    execution_result = result.data["graph"]["graphAnchor"]["executionResult"]
+    assert execution_result["stepCount"] == 35
+    assert json.loads(execution_result["steps"]) == steps[8:23]
+
+
+def test_execution_result_negative_steps_rejected(rf, reader_user, graph):
+    code = code_recipe.make()
+    ExecutionResult.objects.create(
+        code=code, graph_anchor=graph.graph_anchor, result_json={}, result_json_meta={}
+    )
+
+    result = schema.execute_sync(
+        """
+        query GraphQuery($anchorId: UUID!, $codeId: UUID!) {
+            graph(anchorId: $anchorId) {
+                graphAnchor {
+                    executionResult(codeId: $codeId) {
+                        steps(offset: -1)
+                    }
+                }
+            }
+        }
+        """,
+        variable_values={
+            "anchorId": str(graph.graph_anchor.id),
+            "codeId": str(code.id),
+        },
+        context_value=make_django_context(make_request_with_user(rf, reader_user)),
+    )
+
+    (error,) = result.errors
+    assert error.message == "offset and limit can't be negative"
+    assert isinstance(error.original_error, GraphQLError)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+from django.contrib.auth.models import AnonymousUser, Group, Permission
+
+from ..utils import make_django_context, make_request_with_user
+from ...baker_recipes import (
+    tag_anchor_recipe,
+    tutorial_anchor_recipe,
+    tutorial_recipe,
+)
+from ...models import Status
+from ...schema import schema
+from ...types.permissions import get_permissions, visible_statuses
+
+anchors_query = """
+    query {
+        tutorialAnchors {
+            url
+        }
+        tagAnchors {
+            tutorialAnchors {
+                url
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture
+def anchors(transactional_db):
+    tag_anchor = tag_anchor_recipe.make(item_status=Status.PUBLISHED)
+    return {
+        status: tutorial_anchor_recipe.make(
+            url=f"tutorial-{status.lower()}",
+            rank=f"{index:03}",
+            item_status=status,
+            tag_anchors=[tag_anchor],
+        )
+        for index, status in enumerate(
+            (Status.PUBLISHED, Status.DRAFT, Status.PRIVATE, Status.TRASH)
+        )
+    }
+
+
+@pytest.mark.parametrize(
+    "get_fixture, statuses",
+    [
+        ("reader_user", {Status.PUBLISHED}),
+        ("translator_user", {Status.PUBLISHED, Status.DRAFT, Status.PRIVATE}),
+        (
+            "editor_user",
+            {Status.PUBLISHED, Status.DRAFT, Status.PRIVATE, Status.TRASH},
+        ),
+    ],
+    indirect=["get_fixture"],
+)
+def test_anchors_visible_by_role(
+    rf, anchors, get_fixture, statuses, django_assert_num_queries
+):
+    context = make_django_context(make_request_with_user(rf, get_fixture))
+    expected = sorted(f"tutorial-{status.lower()}" for status in statuses)
+
+    # the anchors, the tag anchors and the anchors of the tag anchor,
+    # with no query for the permissions of the user
+    with django_assert_num_queries(3):
+        result = schema.execute_sync(anchors_query, context_value=context)
+
+    assert result.errors is None
+    assert sorted(anchor["url"] for anchor in result.data["tutorialAnchors"]) == (
+        expected
+    )
+    (tag_anchor,) = result.data["tagAnchors"]
+    assert sorted(anchor["url"] for anchor in tag_anchor["tutorialAnchors"]) == (
+        expected
+    )
+
+
+nested_versions_query = """
+    query {
+        tutorialAnchors {
+            tutorials {
+                title
+                itemStatus
+            }
+        }
+    }
+"""
+
+
+@pytest.mark.parametrize(
+    "user_fixture, statuses",
+    [
+        (None, {Status.PUBLISHED}),
+        ("reader_user", {Status.PUBLISHED}),
+        ("translator_user", {Status.PUBLISHED, Status.DRAFT}),
+    ],
+)
+def test_nested_versions_visible_by_role(
+    rf, request, transactional_db, user_fixture, statuses
+):
+    anchor = tutorial_anchor_recipe.make(item_status=Status.PUBLISHED)
+    for status, lang in ((Status.PUBLISHED, "en"), (Status.DRAFT, "zh-cn")):
+        tutorial_recipe.make(
+            tutorial_anchor=anchor, title=status, lang_code=lang, item_status=status
+        )
+
+    context = make_django_context(
+        make_request_with_user(
+            rf,
+            request.getfixturevalue(user_fixture) if user_fixture else AnonymousUser(),
+        )
+    )
+    result = schema.execute_sync(nested_versions_query, context_value=context)
+
+    assert result.errors is None
+    (tutorial_anchor,) = result.data["tutorialAnchors"]
+    assert {
+        tutorial["itemStatus"] for tutorial in tutorial_anchor["tutorials"]
+    } == statuses
+
+
+def test_visible_statuses():
+    assert visible_statuses(None) == {Status.PUBLISHED}
+
+
+def test_permissions_loaded_once(rf, translator_user, django_assert_num_queries):
+    group = Group.objects.create(name="reviewers")
+    group.permissions.add(Permission.objects.get(codename="change_tutorial"))
+    translator_user.groups.add(group)
+
+    # the permissions only use the context of the info
+    info = SimpleNamespace(
+        context=make_django_context(make_request_with_user(rf, translator_user))
+    )
+
+    # the permissions of the user and of the groups
+    with django_assert_num_queries(2):
+        permissions = get_permissions(info)
+        assert permissions.has_perms("backend.change_tutorial")
+        assert not permissions.has_perms("backend.delete_tutorial")
+        assert get_permissions(info) is permissions
+        assert get_permissions(info).has_perms("backend.change_tutorial")
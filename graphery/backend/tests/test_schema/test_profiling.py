@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import pytest
+
+from ..utils import (
+    make_request_with_user,
+    make_django_context,
+    async_make_django_context,
+)
+from ...baker_recipes import graph_anchor_recipe
+from ...models import Status
+from ...profiling import (
+    OTHER_OPERATIONS,
+    ProfilingMiddleware,
+    operation_stats,
+    reset_operation_stats,
+)
+from ...schema import schema
+from ...types import OperationType
+
+graph_anchors_query = """
+    query GraphAnchors {
+        graphAnchors {
+            url
+            graph {
+                id
+            }
+        }
+    }
+"""
+
+operation_stats_query = """
+    query {
+        operationStats {
+            name
+            count
+            sqlQueries
+            duplicateQueries
+            resolvers {
+                field
+                calls
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture
+def profiling(settings):
+    settings.GRAPHERY_PROFILING = True
+    settings.GRAPHERY_PROFILING_DUPLICATE_QUERIES = 3
+    reset_operation_stats()
+    yield
+    reset_operation_stats()
+
+
+def test_operation_profiled(rf, reader_user, profiling, caplog):
+    graph_anchor_recipe.make(_quantity=4, item_status=Status.PUBLISHED)
+    context = make_django_context(make_request_with_user(rf, reader_user))
+
+    with caplog.at_level(logging.WARNING, logger="backend.profiling"):
+        result = schema.execute_sync(graph_anchors_query, context_value=context)
+    assert result.errors is None
+
+    (stats,) = operation_stats()
+    assert stats.name == "GraphAnchors"
+    assert stats.count == 1
+    # one query for the anchors and one for the graph of each of them
+    assert stats.sql_count == 5
+    assert stats.duplicate_queries == 3
+    assert stats.resolver_calls["GraphAnchorType.graph"] == 4
+    assert stats.max_time <= stats.total_time
+
+    (record,) = caplog.records
+    assert "4 times, 4 of them in graphAnchors.graph" in record.getMessage()
+
+
+tag_anchor_mutation_string = """
+    mutation CreateTagAnchor($op: OperationType!, $data: TagAnchorMutationType!) {
+        mutateTagAnchor(op: $op, data: $data) {
+            id
+        }
+    }
+"""
+
+
+async def test_async_mutation_profiled(rf, editor_user, profiling):
+    context = await async_make_django_context(make_request_with_user(rf, editor_user))
+
+    result = await schema.execute(
+        tag_anchor_mutation_string,
+        variable_values={
+            "op": OperationType.CREATE.name,
+            "data": {"itemStatus": Status.DRAFT.name, "anchorName": "profiled"},
+        },
+        context_value=context,
+    )
+    assert result.errors is None
+
+    # the mutation runs in the bridge thread pool, whose queries are counted too
+    (stats,) = operation_stats()
+    assert stats.name == "CreateTagAnchor"
+    assert stats.sql_count > 0
+
+
+def test_operation_names_bounded(rf, reader_user, profiling, settings):
+    settings.GRAPHERY_PROFILING_MAX_OPERATIONS = 2
+    context = make_django_context(make_request_with_user(rf, reader_user))
+
+    for name in ("First", "Second", "Third", "Fourth"):
+        schema.execute_sync(
+            f"query {name} {{ graphAnchors {{ url }} }}", context_value=context
+        )
+
+    assert {stats.name: stats.count for stats in operation_stats()} == {
+        "First": 1,
+        "Second": 1,
+        OTHER_OPERATIONS: 2,
+    }
+
+
+def test_operation_not_profiled(rf, reader_user, settings):
+    settings.GRAPHERY_PROFILING = False
+    reset_operation_stats()
+    context = make_django_context(make_request_with_user(rf, reader_user))
+
+    assert schema.execute_sync(graph_anchors_query, context_value=context).data
+    assert operation_stats() == []
+
+
+@pytest.mark.parametrize(
+    "user_fixture, allowed", [("admin_user", True), ("editor_user", False)]
+)
+def test_operation_stats_field(rf, request, profiling, user_fixture, allowed):
+    user = request.getfixturevalue(user_fixture)
+    context = make_django_context(make_request_with_user(rf, user))
+    schema.execute_sync(graph_anchors_query, context_value=context)
+
+    result = schema.execute_sync(operation_stats_query, context_value=context)
+    if not allowed:
+        assert result.errors
+        return
+
+    assert result.errors is None
+    assert result.data["operationStats"] == [
+        {
+            "name": "GraphAnchors",
+            "count": 1,
+            "sqlQueries": 1,
+            "duplicateQueries": 0,
+            "resolvers": [{"field": "Query.graphAnchors", "calls": 1}],
+        }
+    ]
+
+
+def test_metrics_endpoint(client, admin_user, profiling, settings, rf):
+    settings.GRAPHERY_PROFILING_METRICS_TOKEN = "scraper token"
+    context = make_django_context(make_request_with_user(rf, admin_user))
+    schema.execute_sync(graph_anchors_query, context_value=context)
+
+    assert client.get("/metrics").status_code == 403
+    assert client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong").status_code == 403
+
+    response = client.get("/metrics", HTTP_AUTHORIZATION="Bearer scraper token")
+    assert response.status_code == 200
+    assert 'graphery_operation_count{operation="GraphAnchors"} 1' in (
+        response.content.decode()
+    )
+
+    client.force_login(admin_user)
+    assert client.get("/metrics").status_code == 200
+
+
+async def test_middleware_async_capable(rf, profiling):
+    async def get_response(request):
+        return request
+
+    # the middleware stays async under asgi instead of being run in a thread
+    middleware = ProfilingMiddleware(get_response)
+    assert asyncio.iscoroutinefunction(middleware)
+    request = rf.get("/")
+    assert await middleware(request) is request
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import pytest
+from graphql import parse
+
+from ..utils import make_django_context, make_request_with_user
+from ...schema import schema
+from ...schema.query_limits import analyze_query, clear_introspection_cache
+
+circular_query = """
+    query Circular {
+        tutorialAnchors {
+            graphAnchors {
+                tutorialAnchors {
+                    tutorialAnchor {
+                        graphAnchors {
+                            url
+                        }
+                    }
+                }
+            }
+        }
+    }
+"""
+
+introspection_query = """
+    query {
+        __schema {
+            queryType {
+                name
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture
+def context(rf, reader_user):
+    return make_django_context(make_request_with_user(rf, reader_user))
+
+
+def test_analyze_query(settings):
+    settings.GRAPHERY_QUERY_LIST_SIZE = 10
+    document = parse(
+        """
+        query Steps($limit: Int!) {
+            code(codeId: "00000000-0000-0000-0000-000000000000") {
+                executionResults {
+                    stepCount
+                    steps(limit: $limit)
+                }
+            }
+            first: tagAnchors { ...Anchor }
+            second: tagAnchors { ...Anchor }
+        }
+
+        fragment Anchor on TagAnchorType {
+            tags { name }
+        }
+        """
+    )
+
+    query_cost = analyze_query(schema._schema, document, "Steps", {"limit": 50})
+    # a code, 10 results with 50 steps each, and twice 10 anchors with 10 tags each
+    assert query_cost.cost == 1 + 10 * (1 + 50) + 2 * 10 * (1 + 10)
+    assert query_cost.depth == 3
+    assert query_cost.aliases == 2
+    assert not query_cost.introspection
+
+    query_cost = analyze_query(schema._schema, parse(introspection_query))
+    assert query_cost.introspection and query_cost.only_introspection
+    assert query_cost.cost == 0
+
+
+def test_page_size_clamped(settings):
+    settings.GRAPHERY_QUERY_LIST_SIZE = 10
+    settings.GRAPHERY_QUERY_MAX_PAGE_SIZE = 1000
+
+    def steps_cost(limit: int) -> int:
+        document = parse(
+            """
+            query {
+                code(codeId: "00000000-0000-0000-0000-000000000000") {
+                    executionResult(graphAnchorId: "00000000-0000-0000-0000-000000000000") {
+                        steps(limit: %d)
+                    }
+                }
+                tagAnchors { tags { name } }
+            }
+            """
+            % limit
+        )
+        return analyze_query(schema._schema, document).cost
+
+    # a negative page size doesn't take the cost of the siblings away
+    assert steps_cost(-1000000) == 1 + 1 + 0 + 10 * (1 + 10)
+    assert steps_cost(10**9) == 1 + 1 + 1000 + 10 * (1 + 10)
+
+
+@pytest.mark.django_db
+def test_negative_page_size_rejected(context, settings):
+    settings.GRAPHERY_QUERY_MAX_COST = 1000
+    query = circular_query.replace(
+        "query Circular {",
+        """query Circular {
+            code(codeId: "00000000-0000-0000-0000-000000000000") {
+                executionResult(graphAnchorId: "00000000-0000-0000-0000-000000000000") {
+                    steps(limit: -1000000)
+                }
+            }""",
+    )
+
+    (error,) = schema.execute_sync(query, context_value=context).errors
+    assert error.message.startswith("the query costs 176422")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "limits, message",
+    [
+        ({"GRAPHERY_QUERY_MAX_DEPTH": 5}, "the query is 6 levels deep"),
+        ({"GRAPHERY_QUERY_MAX_COST": 1000}, "the query costs 176420"),
+        ({"GRAPHERY_QUERY_MAX_ALIASES": 0}, "the query has 1 aliases"),
+    ],
+)
+def test_query_rejected(context, settings, django_assert_num_queries, limits, message):
+    settings.GRAPHERY_QUERY_MAX_COST = 10**8
+    for name, value in limits.items():
+        setattr(settings, name, value)
+
+    query = circular_query.replace("url", "link: url")
+    with django_assert_num_queries(0):
+        result = schema.execute_sync(query, context_value=context)
+
+    assert result.data is None
+    (error,) = result.errors
+    assert error.message.startswith(message)
+
+
+@pytest.mark.django_db
+def test_query_allowed(context):
+    result = schema.execute_sync(
+        "query { tutorialAnchors { url tagAnchors { anchorName } } }",
+        context_value=context,
+    )
+    assert result.errors is None
+
+
+def test_introspection_cached(context, settings):
+    clear_introspection_cache()
+
+    first = schema.execute_sync(introspection_query, context_value=context)
+    assert first.data == {"__schema": {"queryType": {"name": "Query"}}}
+    assert schema.execute_sync(introspection_query, context_value=context).data is (
+        first.data
+    )
+
+    settings.GRAPHERY_GRAPHQL_INTROSPECTION = False
+    (error,) = schema.execute_sync(introspection_query, context_value=context).errors
+    assert error.message == "introspection is disabled"
+    # __typename is not introspection
+    result = schema.execute_sync("query { __typename }", context_value=context)
+    assert result.data == {"__typename": "Query"}
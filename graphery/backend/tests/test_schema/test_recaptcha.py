@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import inspect
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from asgiref.sync import sync_to_async
+
+from ..utils import make_django_context
+from ...baker_recipes import user_recipe
+from ...data_bridge import UserBridge, ValidationError
+from ...models import User
+from ...recaptcha import (
+    averify_recaptcha,
+    shutdown_recaptcha_executor,
+    site_verify_recaptcha,
+    stand_in_recaptcha,
+    verify_recaptcha,
+)
+from ...schema.resolvers import register_mutation
+from ...schema.resolvers.mutations import user_mutation
+
+
+@pytest.fixture
+def recaptcha(settings):
+    settings.G_RECAPTCHA_ON = True
+    settings.G_RECAPTCHA_SECRET = "secret"
+    yield settings
+    shutdown_recaptcha_executor()
+
+
+def test_duplicate_token_not_sent(recaptcha):
+    received = []
+    token = str(uuid.uuid4())
+    with stand_in_recaptcha(received=received) as url:
+        recaptcha.G_RECAPTCHA_URL = url
+
+        first = site_verify_recaptcha(token)
+        second = site_verify_recaptcha(token)
+
+    assert first["success"] and first["score"] == 0.9
+    assert not second["success"]
+    assert second["error_codes"] == ["timeout-or-duplicate"]
+    assert received == [token]
+
+
+def test_verification_timeout(recaptcha):
+    recaptcha.GRAPHERY_RECAPTCHA_TIMEOUT = 0.1
+    with stand_in_recaptcha(latency=1) as url:
+        recaptcha.G_RECAPTCHA_URL = url
+        response = site_verify_recaptcha(str(uuid.uuid4()))
+
+    assert not response["success"]
+    assert response["error_codes"] == ["verification-failed"]
+
+
+async def test_verification_async(recaptcha):
+    with stand_in_recaptcha(latency=0.2) as url:
+        recaptcha.G_RECAPTCHA_URL = url
+        response = await averify_recaptcha(str(uuid.uuid4()))
+
+    assert response["success"]
+
+
+def test_verification_off(settings):
+    settings.G_RECAPTCHA_ON = False
+    assert verify_recaptcha("").result()["success"]
+
+
+@pytest.fixture
+def registration(monkeypatch):
+    """
+    record the verifications and the steps of the registrations in order
+    """
+    calls = []
+    verifications = []
+
+    def recorded_verify_recaptcha(*args, **kwargs):
+        verifications.append(verify_recaptcha(*args, **kwargs))
+        return verifications[-1]
+
+    def validate_new_user(model_info):
+        calls.append(("validate", verifications[-1].done()))
+        return validate(model_info)
+
+    def bridges_from_mutation(*args, **kwargs):
+        calls.append(("save", verifications[-1].done()))
+        return user_recipe.make(username="registered_user")
+
+    validate = UserBridge.validate_new_user
+    monkeypatch.setattr(user_mutation, "verify_recaptcha", recorded_verify_recaptcha)
+    monkeypatch.setattr(UserBridge, "validate_new_user", validate_new_user)
+    monkeypatch.setattr(UserBridge, "bridges_from_mutation", bridges_from_mutation)
+    return calls
+
+
+def _register(rf, token: str):
+    info = SimpleNamespace(context=make_django_context(rf.post("/graphql")))
+    data = SimpleNamespace(username="registered_user", email="user@graphery.org")
+    return register_mutation(info, data=data, recaptcha_token=token)
+
+
+@pytest.mark.parametrize("score, registered", [(0.9, True), (0.1, False)])
+def test_register_verified_concurrently(
+    recaptcha, rf, transactional_db, registration, score, registered
+):
+    with stand_in_recaptcha(score=score, latency=0.3) as url:
+        recaptcha.G_RECAPTCHA_URL = url
+        user = _register(rf, str(uuid.uuid4()))
+
+    # the user is validated while the token is verified,
+    # and only saved after the token passes
+    assert registration == (
+        [("validate", False), ("save", True)] if registered else [("validate", False)]
+    )
+    assert (user is not None) is registered
+    assert User.objects.filter(username="registered_user").exists() is registered
+
+
+def test_register_failed_verification_returns_early(
+    recaptcha, rf, transactional_db, registration
+):
+    # the token is verified already, so the user isn't validated
+    with stand_in_recaptcha() as url:
+        recaptcha.G_RECAPTCHA_URL = url
+        assert _register(rf, "") is None
+
+    assert registration == []
+
+
+def test_register_taken_username(rf, transactional_db):
+    user_recipe.make(username="registered_user")
+    with pytest.raises(ValidationError):
+        UserBridge.validate_new_user(
+            SimpleNamespace(username="registered_user", email="user@graphery.org")
+        )
+
+
+@pytest.mark.parametrize("score, registered", [(0.9, True), (0.1, False)])
+async def test_register_async(
+    recaptcha, rf, transactional_db, monkeypatch, score, registered
+):
+    calls = []
+
+    def bridges_from_mutation(*args, **kwargs):
+        calls.append("save")
+        return user_recipe.make(username="registered_user")
+
+    monkeypatch.setattr(UserBridge, "bridges_from_mutation", bridges_from_mutation)
+
+    with stand_in_recaptcha(score=score, latency=0.3) as url:
+        recaptcha.G_RECAPTCHA_URL = url
+        registration = _register(rf, str(uuid.uuid4()))
+        # the loop isn't blocked while google answers
+        assert inspect.isawaitable(registration)
+        user = await registration
+
+    assert (user is not None) is registered
+    assert calls == (["save"] if registered else [])
+
+
+async def test_register_async_validated(recaptcha, rf, transactional_db):
+    await sync_to_async(user_recipe.make)(username="registered_user")
+
+    with stand_in_recaptcha() as url:
+        recaptcha.G_RECAPTCHA_URL = url
+        with pytest.raises(ValidationError):
+            await _register(rf, str(uuid.uuid4()))
+        # the validation errors aren't shown to the failed verifications
+        assert await _register(rf, "") is None
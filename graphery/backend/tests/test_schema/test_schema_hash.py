@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import hashlib
+import json
+
+import pytest
+from django.core.management import call_command
+from strawberry.printer import print_schema
+
+from ...schema import get_schema_hash, get_schema_sdl, schema
+
+
+def test_schema_sdl_cached():
+    sdl = get_schema_sdl()
+    assert sdl == print_schema(schema)
+    assert get_schema_sdl() is sdl
+    assert get_schema_hash() == hashlib.sha256(sdl.encode()).hexdigest()
+
+
+def test_export_schema(capsys, tmp_path):
+    call_command("export_schema", hash=True)
+    assert capsys.readouterr().out.strip() == get_schema_hash()
+
+    output = tmp_path / "schema.graphql"
+    call_command("export_schema", output=str(output))
+    assert output.read_text() == get_schema_sdl()
+
+
+def test_schema_hash_endpoint(client):
+    response = client.get("/graphql/schema/hash")
+    assert response.status_code == 200
+    assert response.json() == {"hash": get_schema_hash()}
+
+    etag = response["ETag"]
+    assert (
+        client.get("/graphql/schema/hash", HTTP_IF_NONE_MATCH=etag).status_code == 304
+    )
+
+    response = client.get("/graphql/schema")
+    assert response.content.decode() == get_schema_sdl()
+    assert client.get("/graphql/schema", HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", ["/graphql", "/graphql/sync"])
+def test_schema_hash_header(client, settings, url):
+    response = client.post(
+        url,
+        data=json.dumps({"query": "query { me { id } }"}),
+        content_type="application/json",
+    )
+    assert response.status_code == 200
+    assert response[settings.GRAPHERY_SCHEMA_HASH_HEADER] == get_schema_hash()
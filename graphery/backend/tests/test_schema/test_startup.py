@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+from django.core.management import call_command
+
+from ...schema import get_schema, schema
+
+
+def test_schema_built_once():
+    assert schema is get_schema()
+
+
+def test_startup_is_lazy():
+    # a fresh interpreter, since the schema is built in the test process already
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, django\n"
+            "django.setup()\n"
+            "import graphery.urls, backend.schema, backend.execution_precompute\n"
+            "print(backend.schema._schema is None, 'requests' in sys.modules, "
+            "'black' in sys.modules)",
+        ],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        check=True,
+    )
+    assert result.stdout.split() == ["True", "False", "False"]
+
+
+def test_profile_imports(capsys):
+    call_command("profile_imports", runs=1, top=5, json=True)
+
+    report = json.loads(capsys.readouterr().out)
+    assert list(report["phases_ms"]) == [
+        "django.setup",
+        "import graphery.urls",
+        "build schema",
+    ]
+    assert len(report["modules_ms"]) == 5
+    assert report["max_rss_kb"] > 0
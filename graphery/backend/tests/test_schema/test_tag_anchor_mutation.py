@@ -123,6 +123,45 @@ def test_update_tag_anchor(rf, editor_user, tag_anchor, session_middleware):
     ).set_new_instance().check()
 
 
+@pytest.mark.django_db
+def test_update_tag_anchor_version_conflict(
+    rf, editor_user, tag_anchor, session_middleware
+):
+    based_on = tag_anchor.modified_time.isoformat()
+
+    def update_tag_anchor(anchor_name: str, has_error: bool) -> MutationChecker:
+        return MutationChecker(
+            tag_anchor_mutation_string,
+            rf,
+            variables={
+                "op": OperationType.UPDATE.name,
+                "data": {
+                    "id": str(tag_anchor.id),
+                    "anchorName": anchor_name,
+                    "modifiedTime": based_on,
+                },
+            },
+            user=editor_user,
+            session_middleware=session_middleware,
+            has_error=has_error,
+            count_change=0,
+            model_cls=TagAnchor,
+        ).check()
+
+    first = update_tag_anchor("first anchor name", has_error=False)
+    assert first.result.data["mutateTagAnchor"]["modifiedTime"] > based_on
+
+    # the second change is based on the same version, so it's rejected
+    second = update_tag_anchor("second anchor name", has_error=True)
+    assert second.result.errors[0].message.find("changed by someone else") > -1
+    assert TagAnchor.objects.get(id=tag_anchor.id).anchor_name == "first anchor name"
+
+    # and accepted once it is based on the latest version
+    based_on = first.result.data["mutateTagAnchor"]["modifiedTime"]
+    update_tag_anchor("second anchor name", has_error=False)
+    assert TagAnchor.objects.get(id=tag_anchor.id).anchor_name == "second anchor name"
+
+
 @pytest.mark.django_db
 def test_update_tag_anchor_permission_fail(
     rf, reader_user, tag_anchor, session_middleware
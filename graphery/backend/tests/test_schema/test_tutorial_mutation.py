@@ -1,12 +1,24 @@
 from __future__ import annotations
 
+import asyncio
 
 import pytest
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.utils import timezone
 
 from ...baker_recipes import tutorial_anchor_recipe
+from ...data_bridge.autosave_buffer import AutosaveBuffer, flush_staged_autosave
+from ...jobs import run_pending_jobs, task_path
 from .utils import MutationChecker
-from ...models import Tutorial, Status, LangCode
-from ...types import OperationType
+from ..utils import (
+    make_request_with_user,
+    async_save_session_in_request,
+    async_make_django_context,
+)
+from ...models import Job, Tutorial, Status, LangCode
+from ...schema import schema
+from ...types import OperationType, TutorialMutationType
 
 
 @pytest.fixture()
@@ -370,3 +382,241 @@ def test_closing_tutorial(rf, session_middleware, editor_user, tutorial_anchor):
     assert (
         third_check.new_instance.back.item_status == Status.CLOSED
     ), "Tutorial should be closed"
+
+
+tutorial_content_query_string = """\
+query MyQuery($url: String!, $lang: LangCode!) {
+  tutorialContent(url: $url, lang: $lang) {
+    id
+    contentMarkdown
+  }
+}
+"""
+
+
+def _autosave_variables(tutorial_anchor, content: str):
+    return {
+        "op": OperationType.UPDATE.name,
+        "data": {
+            "tutorialAnchor": {"id": str(tutorial_anchor.id)},
+            "title": "new tutorial title",
+            "abstract": "new tutorial description",
+            "contentMarkdown": content,
+            "itemStatus": Status.AUTOSAVE.name,
+            "langCode": LangCode.EN.name,
+        },
+    }
+
+
+def _autosave_twice(rf, session_middleware, user, tutorial_anchor):
+    """
+    flush a first autosave and stage a second one
+    """
+    for content in ("# autosave 1", "# autosave 2"):
+        MutationChecker(
+            tutorial_mutation_string,
+            rf,
+            variables=_autosave_variables(tutorial_anchor, content),
+            user=user,
+            session_middleware=session_middleware,
+        ).check()
+
+
+def test_autosave_buffering(rf, session_middleware, author_user, tutorial_anchor):
+    def autosave_variables(content: str):
+        return _autosave_variables(tutorial_anchor, content)
+
+    # the first autosave in the merge window is flushed to the database
+    first_check = (
+        MutationChecker(
+            tutorial_mutation_string,
+            rf,
+            variables=autosave_variables("# autosave 1"),
+            user=author_user,
+            session_middleware=session_middleware,
+            count_change=1,
+            model_cls=Tutorial,
+            equals={"content_markdown": "# autosave 1"},
+        )
+        .set_new_instance(Tutorial.objects.get(tutorial_anchor=tutorial_anchor))
+        .check()
+    )
+
+    # the following ones are staged and returned without touching the database
+    second_check = (
+        MutationChecker(
+            tutorial_mutation_string,
+            rf,
+            variables=autosave_variables("# autosave 2"),
+            user=author_user,
+            session_middleware=session_middleware,
+            count_change=0,
+            model_cls=Tutorial,
+            equals={"content_markdown": "# autosave 1"},
+        )
+        .set_new_instance(Tutorial.objects.get(tutorial_anchor=tutorial_anchor))
+        .check()
+    )
+
+    assert (
+        second_check.result.data["mutateTutorial"]["contentMarkdown"] == "# autosave 2"
+    )
+
+    # the editor reads the staged content back
+    checker = MutationChecker(
+        tutorial_content_query_string,
+        rf,
+        variables={"url": tutorial_anchor.url, "lang": LangCode.EN.name},
+        user=author_user,
+        session_middleware=session_middleware,
+    ).check()
+    assert checker.result.data["tutorialContent"]["contentMarkdown"] == "# autosave 2"
+
+    # an explicit save flushes the staged content with it
+    MutationChecker(
+        tutorial_mutation_string,
+        rf,
+        variables={
+            "op": OperationType.UPDATE.name,
+            "data": {
+                "tutorialAnchor": {"id": str(tutorial_anchor.id)},
+                "itemStatus": Status.DRAFT.name,
+                "langCode": LangCode.EN.name,
+            },
+        },
+        user=author_user,
+        session_middleware=session_middleware,
+        count_change=1,
+        model_cls=Tutorial,
+        equals={
+            "content_markdown": "# autosave 2",
+            "back": first_check.new_instance,
+        },
+    ).set_new_instance(Tutorial.objects.get(item_status=Status.DRAFT)).check()
+
+
+def test_autosave_flushed_when_window_ends(
+    rf, session_middleware, author_user, tutorial_anchor
+):
+    _autosave_twice(rf, session_middleware, author_user, tutorial_anchor)
+
+    # the staged content is written through by a job at the end of the window
+    job = Job.objects.get(task=task_path(flush_staged_autosave))
+    assert job.run_after > timezone.now()
+    Job.objects.filter(id=job.id).update(run_after=timezone.now())
+    assert run_pending_jobs() == 1
+
+    head = Tutorial.objects.get(tutorial_anchor=tutorial_anchor, front=None)
+    assert head.content_markdown == "# autosave 2"
+    assert (
+        AutosaveBuffer(author_user.id, tutorial_anchor.id, LangCode.EN).staged() is None
+    )
+
+
+def test_stale_autosave_not_overlaid(
+    rf, session_middleware, author_user, tutorial_anchor
+):
+    _autosave_twice(rf, session_middleware, author_user, tutorial_anchor)
+
+    # someone else saves the head after the content is staged
+    head = Tutorial.objects.get(tutorial_anchor=tutorial_anchor, front=None)
+    head.content_markdown = "# saved by someone else"
+    head.save()
+
+    checker = MutationChecker(
+        tutorial_content_query_string,
+        rf,
+        variables={"url": tutorial_anchor.url, "lang": LangCode.EN.name},
+        user=author_user,
+        session_middleware=session_middleware,
+    ).check()
+    assert (
+        checker.result.data["tutorialContent"]["contentMarkdown"]
+        == "# saved by someone else"
+    )
+    assert (
+        AutosaveBuffer(author_user.id, tutorial_anchor.id, LangCode.EN).staged() is None
+    )
+
+    # and the job doesn't write the dropped content
+    flush_staged_autosave(
+        str(author_user.id), str(tutorial_anchor.id), LangCode.EN.value
+    )
+    head.refresh_from_db()
+    assert head.content_markdown == "# saved by someone else"
+
+
+def test_autosave_needs_edit_permission(
+    rf, session_middleware, reader_user, tutorial_anchor
+):
+    Tutorial.objects.create(
+        tutorial_anchor=tutorial_anchor,
+        lang_code=LangCode.EN,
+        title="published",
+        abstract="published",
+        content_markdown="# published",
+        item_status=Status.PUBLISHED,
+    )
+    autosave_buffer = AutosaveBuffer(reader_user.id, tutorial_anchor.id, LangCode.EN)
+
+    # autosaves are checked before they are staged
+    for content in ("# autosave 1", "# autosave 2"):
+        MutationChecker(
+            tutorial_mutation_string,
+            rf,
+            variables=_autosave_variables(tutorial_anchor, content),
+            user=reader_user,
+            session_middleware=session_middleware,
+            has_error=True,
+        ).check()
+        assert autosave_buffer.staged() is None
+    assert not autosave_buffer.flushed()
+    assert not Job.objects.filter(task=task_path(flush_staged_autosave)).exists()
+
+    # and staged content is written as the user who staged it
+    autosave_buffer.stage(TutorialMutationType(content_markdown="# autosave 3"))
+    with pytest.raises(ValidationError):
+        flush_staged_autosave(
+            str(reader_user.id), str(tutorial_anchor.id), LangCode.EN.value
+        )
+    assert autosave_buffer.staged() is None
+    assert list(
+        Tutorial.objects.filter(tutorial_anchor=tutorial_anchor).values_list(
+            "item_status", "content_markdown"
+        )
+    ) == [(Status.PUBLISHED, "# published")]
+
+
+@pytest.mark.django_db
+async def test_add_tutorial_async(rf, session_middleware, author_user):
+    tutorial_anchors = await sync_to_async(tutorial_anchor_recipe.make)(_quantity=2)
+    request = make_request_with_user(rf, author_user)
+    await async_save_session_in_request(request, session_middleware)
+    context = await async_make_django_context(request)
+
+    results = await asyncio.gather(
+        *(
+            schema.execute(
+                tutorial_mutation_string,
+                variable_values={
+                    "op": OperationType.UPDATE.name,
+                    "data": {
+                        "tutorialAnchor": {"id": str(tutorial_anchor.id)},
+                        "title": f"async tutorial {i}",
+                        "abstract": "async tutorial description",
+                        "contentMarkdown": "# async tutorial content",
+                        "itemStatus": Status.AUTOSAVE.name,
+                        "langCode": LangCode.EN.name,
+                    },
+                },
+                context_value=context,
+            )
+            for i, tutorial_anchor in enumerate(tutorial_anchors)
+        )
+    )
+
+    for i, result in enumerate(results):
+        assert result.errors is None
+        assert result.data["mutateTutorial"]["title"] == f"async tutorial {i}"
+
+    assert await sync_to_async(Tutorial.objects.count)() == 2
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import enum
+from datetime import datetime
 from typing import Optional, List
 
 import strawberry
@@ -54,6 +55,8 @@ class UserMutationType:
 @graphql_input(TagAnchor, inject_mixin_fields=[UUIDMixin, StatusMixin], partial=True)
 class TagAnchorMutationType:
     anchor_name: str
+    # the modified time of the version the change is based on
+    modified_time: datetime
 
 
 @graphql_input(
@@ -71,6 +74,7 @@ class TagMutationType:
 class TutorialAnchorMutationType:
     url: str
     anchor_name: str
+    modified_time: datetime
     tag_anchors: List[Optional[TagAnchorMutationType]]
     # related fields
     graph_anchors: List[Optional[OrderedGraphAnchorBindingType]]
@@ -91,6 +95,7 @@ class TutorialMutationType:
 class GraphAnchorMutationType:
     url: str
     anchor_name: str
+    modified_time: datetime
     tag_anchors: List[Optional[TagAnchorMutationType]]
     default_order: int
     tutorial_anchors: List[Optional[OrderedTutorialAnchorBindingType]]
@@ -112,6 +117,9 @@ class OrderedGraphAnchorBindingType:
 class GraphMutationType:
     graph_anchor: GraphAnchorMutationType
     graph_json: str
+    # base64 of the compact form, which is taken instead of graph_json
+    graph_compact: str
+    modified_time: datetime
     makers: List[Optional[UserMutationType]]
 
 
@@ -135,6 +143,7 @@ class GraphDescriptionMutationType:
 class CodeMutationType:
     name: str
     code: str
+    modified_time: datetime
     tutorial_anchor: TutorialAnchorMutationType
 
 
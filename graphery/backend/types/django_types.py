@@ -1,14 +1,20 @@
 from __future__ import annotations
 
-import json
+import base64
 from typing import List, Optional, NewType, Mapping
 from uuid import UUID
 
 import strawberry
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from graphql import GraphQLError
 from strawberry.types import Info
 
 from . import graphql_type
+from .permissions import get_permissions, visible_queryset
+from .utils import context_cache, listed_ids
+
+from ..json_codec import RawJSON, JSONObject, loads, dumps, to_json_object, to_json_text
 
 from ..models import (
     TagAnchor,
@@ -18,11 +24,17 @@ from ..models import (
     GraphAnchor,
     OrderedAnchorTable,
     Graph,
+    GraphLayout,
     GraphDescription,
+    PublishedTutorial,
+    PublishedGraphDescription,
     Code,
     ExecutionResult,
     Uploads,
     LangCode,
+    versioned_text,
+    raw_json_value,
+    first_in_lang_by_anchor,
 )
 
 __all__ = [
@@ -33,6 +45,7 @@ __all__ = [
     "TutorialType",
     "GraphAnchorType",
     "GraphType",
+    "GraphLayoutType",
     "OrderedGraphAnchorType",
     "GraphDescriptionType",
     "CodeType",
@@ -43,22 +56,31 @@ __all__ = [
 
 
 def _serialize_for_json_type(obj: Mapping | str) -> str:
+    """
+    text read from a JSON column and objects carrying their text are sent out
+    as is, other objects are serialized once
+    """
     try:
-        if isinstance(obj, str):
-            json.loads(obj)
+        if isinstance(obj, (RawJSON, JSONObject)):
+            return to_json_text(obj)
+        elif isinstance(obj, str):
+            loads(obj)
             return obj
         else:
-            return json.dumps(obj)
+            return dumps(obj)
     except Exception as e:
         raise TypeError(f"{obj} is not a valid type for json")
 
 
 def _parse_for_json_type(obj: str | Mapping) -> Mapping:
+    """
+    JSON text is parsed once, and objects are taken as is,
+    since they are decoded from JSON variables already
+    """
     try:
         if isinstance(obj, str):
-            return json.loads(obj)
+            return to_json_object(obj)
         else:
-            json.dumps(obj)
             return obj
     except Exception as e:
         raise TypeError(f"{obj} is not a valid type for json")
@@ -85,6 +107,34 @@ class UserType:
     graph_descriptions: List[GraphDescriptionType]
 
 
+def _published_in_lang(
+    info: Info, anchor, lang: LangCode, published_model_cls, anchor_field: str
+):
+    """
+    the published version of an anchor in a language, or in its fallbacks.
+    the anchors listed in the request are loaded with it in one query,
+    so a listing takes a query per language instead of one per anchor
+    """
+    cache = context_cache(info, (published_model_cls, lang))
+    if anchor.pk not in cache:
+        anchor_ids = [
+            anchor.pk,
+            *(pk for pk in listed_ids(info, type(anchor)) if pk not in cache),
+        ]
+        published_rows = first_in_lang_by_anchor(
+            published_model_cls.objects.select_related(
+                published_model_cls._version_field
+            ),
+            lang,
+            anchor_field,
+            anchor_ids,
+        )
+        cache.update({pk: published_rows.get(pk) for pk in anchor_ids})
+
+    published = cache[anchor.pk]
+    return published.as_version() if published else None
+
+
 @graphql_type(TagAnchor)
 class TagAnchorType:
     anchor_name: str
@@ -93,6 +143,8 @@ class TagAnchorType:
     tutorial_anchors: List[TutorialAnchorType]
     graph_anchors: List[GraphAnchorType]
 
+    get_queryset = visible_queryset
+
 
 @graphql_type(Tag)
 class TagType:
@@ -100,6 +152,8 @@ class TagType:
     tag_anchor: TagAnchorType
     description: str
 
+    get_queryset = visible_queryset
+
 
 @graphql_type(TutorialAnchor)
 class TutorialAnchorType:
@@ -112,14 +166,36 @@ class TutorialAnchorType:
     code: Optional[CodeType]
     uploads: List[UploadsType]
 
+    get_queryset = visible_queryset
+
+    @strawberry.field
+    def tutorial(
+        self, info: Info, lang: LangCode = LangCode.EN
+    ) -> Optional[TutorialType]:
+        return _published_in_lang(
+            info, self, lang, PublishedTutorial, "tutorial_anchor"
+        )
+
 
 @graphql_type(Tutorial)
 class TutorialType:
     tutorial_anchor: TutorialAnchorType
     authors: List[UserType]
-    title: str
-    abstract: str
-    content_markdown: str
+
+    # the readers only list the published versions
+    get_queryset = visible_queryset
+
+    @strawberry.field
+    def title(self) -> str:
+        return versioned_text(self, "title")
+
+    @strawberry.field
+    def abstract(self) -> str:
+        return versioned_text(self, "abstract")
+
+    @strawberry.field
+    def content_markdown(self) -> str:
+        return versioned_text(self, "content_markdown")
 
 
 @graphql_type(GraphAnchor)
@@ -130,23 +206,31 @@ class GraphAnchorType:
     default_order: int
     tutorial_anchors: List[OrderedGraphAnchorType]
     # reverse relations
-    graph: Optional[GraphType]
     graph_descriptions: List[GraphDescriptionType]
-    execution_results: List[ExecutionResultType]
     uploads: List[UploadsType]
 
+    get_queryset = visible_queryset
+
+    @strawberry.field
+    def graph(self, info: Info) -> Optional[GraphType]:
+        return (
+            get_permissions(info)
+            .filter_visible(Graph.objects.with_raw_json())
+            .filter(graph_anchor=self)
+            .first()
+        )
+
+    @strawberry.field
+    def execution_results(self, info: Info) -> List[ExecutionResultType]:
+        return self.execution_results.with_raw_json()
+
     @strawberry.field
     def graph_description(
         self, info: Info, lang: LangCode = LangCode.EN
     ) -> Optional[GraphDescriptionType]:
-        if qs := GraphDescription.objects.filter(graph_anchor=self, lang_code=lang):
-            return qs[0]
-        elif qs := GraphDescription.objects.filter(
-            graph_anchor=self, lang_code=LangCode.EN
-        ):
-            return qs[0]
-        else:
-            return None
+        return _published_in_lang(
+            info, self, lang, PublishedGraphDescription, "graph_anchor"
+        )
 
     @strawberry.field
     def execution_result(
@@ -155,7 +239,7 @@ class GraphAnchorType:
         return (
             qs[0]
             if (
-                qs := ExecutionResult.objects.filter(
+                qs := ExecutionResult.objects.with_raw_json().filter(
                     graph_anchor=self, code__id=code_id
                 )
             )
@@ -173,16 +257,63 @@ class OrderedGraphAnchorType:
 @graphql_type(Graph)
 class GraphType:
     graph_anchor: GraphAnchorType
-    graph_json: JSONType
     makers: List[UserType]
 
+    @strawberry.field
+    def graph_json(self) -> JSONType:
+        if self.graph_compact is not None:
+            return self.get_graph_json()
+        return raw_json_value(self, "graph_json")
+
+    @strawberry.field(description="base64 of the compact form of the graph")
+    def graph_compact(self) -> Optional[str]:
+        if (compact := self.get_graph_compact()) is None:
+            return None
+        return base64.b64encode(compact).decode()
+
+    @strawberry.field
+    def graph_meta(self) -> JSONType:
+        return raw_json_value(self, "graph_meta")
+
+    @strawberry.field
+    def layout_levels(self) -> List[int]:
+        return list(self.layouts.order_by("level").values_list("level", flat=True))
+
+    @strawberry.field(
+        description="the layout at a level of detail, the coarsest one by default"
+    )
+    def layout(self, level: Optional[int] = None) -> Optional[GraphLayoutType]:
+        layouts = self.layouts.with_raw_json()
+        if level is None:
+            return layouts.order_by("-level").first()
+        return layouts.filter(level=level).first()
+
+
+@graphql_type(GraphLayout)
+class GraphLayoutType:
+    level: int
+    node_count: int
+    edge_count: int
+
+    @strawberry.field
+    def layout_json(self) -> JSONType:
+        return raw_json_value(self, "layout_json")
+
 
 @graphql_type(GraphDescription)
 class GraphDescriptionType:
     graph_anchor: GraphAnchorType
     authors: List[UserType]
-    title: str
-    description_markdown: str
+
+    get_queryset = visible_queryset
+
+    @strawberry.field
+    def title(self) -> str:
+        return versioned_text(self, "title")
+
+    @strawberry.field
+    def description_markdown(self) -> str:
+        return versioned_text(self, "description_markdown")
 
 
 @graphql_type(Code)
@@ -190,8 +321,11 @@ class CodeType:
     name: str
     code: str
     tutorial_anchor: TutorialAnchorType
+
     # reverse relation
-    execution_results: List[ExecutionResultType]
+    @strawberry.field
+    def execution_results(self, info: Info) -> List[ExecutionResultType]:
+        return self.execution_results.with_raw_json()
 
     @strawberry.field
     def execution_result(
@@ -200,7 +334,7 @@ class CodeType:
         return (
             qs[0]
             if (
-                qs := ExecutionResult.objects.filter(
+                qs := ExecutionResult.objects.with_raw_json().filter(
                     code=self, graph_anchor__id=graph_anchor_id
                 )
             )
@@ -212,8 +346,23 @@ class CodeType:
 class ExecutionResultType:
     code: CodeType
     graph_anchor: GraphAnchorType
-    result_json: JSONType
-    result_json_meta: JSONType
+    step_count: int
+
+    @strawberry.field
+    def result_json(self) -> JSONType:
+        return self.get_result_json()
+
+    @strawberry.field(description="a range of the steps in the result")
+    def steps(self, offset: int = 0, limit: int = 100) -> JSONType:
+        if offset < 0 or limit < 0:
+            raise GraphQLError("offset and limit can't be negative")
+        return self.get_steps(
+            offset, min(limit, settings.GRAPHERY_EXECUTION_RESULT_MAX_STEPS)
+        )
+
+    @strawberry.field
+    def result_json_meta(self) -> JSONType:
+        return raw_json_value(self, "result_json_meta")
 
 
 @graphql_type(Uploads)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from functools import cached_property
+from typing import FrozenSet, Optional
+
+from django.db import models
+from strawberry.types import Info
+
+from .utils import context_cache
+from ..models import Status, User, UserRoles
+
+__all__ = [
+    "visible_statuses",
+    "RequestPermissions",
+    "get_permissions",
+    "visible_queryset",
+]
+
+
+def visible_statuses(role: Optional[int]) -> FrozenSet[Status]:
+    """
+    the statuses of the items a role can read. the editors read everything,
+    the writers everything but the trash, and everyone else the published items
+    :param role: None for the anonymous users
+    :return:
+    """
+    if role is None or role < UserRoles.TRANSLATOR:
+        return frozenset({Status.PUBLISHED})
+    if role < UserRoles.EDITOR:
+        return frozenset(Status) - {Status.TRASH}
+    return frozenset(Status)
+
+
+class RequestPermissions:
+    """
+    the role and the permissions of the user of a request, which are loaded
+    once and shared by every resolver of the request
+    """
+
+    def __init__(self, user: Optional[User]):
+        self.user = user
+        self.role: Optional[int] = user.role if user is not None else None
+
+    @cached_property
+    def permissions(self) -> FrozenSet[str]:
+        # the permissions of the user and of the groups, in two queries
+        if self.user is None or not self.user.is_active:
+            return frozenset()
+        return frozenset(self.user.get_all_permissions())
+
+    @cached_property
+    def visible_statuses(self) -> FrozenSet[Status]:
+        return visible_statuses(self.role)
+
+    @property
+    def reads_drafts(self) -> bool:
+        """
+        the writers read the newest versions, and everyone else reads
+        the published ones
+        """
+        return self.has_role(UserRoles.TRANSLATOR)
+
+    def has_role(self, role: int) -> bool:
+        return self.role is not None and self.role >= role
+
+    def has_perms(self, *perms: str) -> bool:
+        if self.user is not None and self.user.is_active and self.user.is_superuser:
+            return True
+        return self.permissions.issuperset(perms)
+
+    def filter_visible(self, queryset: models.QuerySet) -> models.QuerySet:
+        """
+        keep the items whose status the user can read, as a filter of the query
+        instead of a check of every item
+        :param queryset: of a model with item_status
+        :return:
+        """
+        if self.visible_statuses == frozenset(Status):
+            return queryset
+        return queryset.filter(item_status__in=self.visible_statuses)
+
+
+def get_permissions(info: Info) -> RequestPermissions:
+    """
+    the permissions of the user of the request, which are kept on the context
+    :param info:
+    :return:
+    """
+    cache = context_cache(info, RequestPermissions)
+    if (permissions := cache.get("current")) is None:
+        request = getattr(info.context, "request", None)
+        user = getattr(request, "user", None)
+        permissions = cache["current"] = RequestPermissions(
+            user if user is not None and user.is_authenticated else None
+        )
+    return permissions
+
+
+def visible_queryset(
+    field, queryset: models.QuerySet, info: Info, **kwargs
+) -> models.QuerySet:
+    """
+    the `get_queryset` of the types with a status, which strawberry_django
+    calls with the query set of every list of them, nested ones included
+    :param field: the strawberry_django field listing the items
+    :param queryset:
+    :param info:
+    :return:
+    """
+    return get_permissions(info).filter_visible(queryset)
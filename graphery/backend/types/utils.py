@@ -1,12 +1,24 @@
-from typing import Sequence
+from typing import Dict, Hashable, Iterable, List, Sequence, Type, TypeVar
 
 import strawberry_django.filters
+from django.db import models
 from strawberry import UNSET
+from strawberry.types import Info
 from strawberry_django.type import process_type
 
 from ..models import MixinBase
 
-__all__ = ["graphql_type", "graphql_input", "graphql_mutation", "mixin_filter"]
+__all__ = [
+    "graphql_type",
+    "graphql_input",
+    "graphql_mutation",
+    "mixin_filter",
+    "context_cache",
+    "remember_listed",
+    "listed_ids",
+]
+
+_ITERABLE = TypeVar("_ITERABLE", bound=Iterable[models.Model])
 
 
 def graphql_type(
@@ -55,3 +67,43 @@ def mixin_filter(model, *, inject_mixin_fields=True, name=None, lookups=False):
         return strawberry_django.filters.filter(model, name=name, lookups=lookups)(cls)
 
     return wrapper
+
+
+def context_cache(info: Info, key: Hashable) -> Dict:
+    """
+    a dict kept on the context of a request, shared by the resolvers of the request
+    :param info:
+    :param key: the key of the dict
+    :return:
+    """
+    if (caches := getattr(info.context, "graphery_cache", None)) is None:
+        caches = {}
+        setattr(info.context, "graphery_cache", caches)
+    return caches.setdefault(key, {})
+
+
+def remember_listed(
+    info: Info, instances: _ITERABLE, model_cls: Type[models.Model]
+) -> _ITERABLE:
+    """
+    remember the instances of a listing, so that the fields of every instance
+    can be loaded together when the field of the first one is resolved
+    :param info:
+    :param instances: a query set is evaluated and keeps its results
+    :param model_cls:
+    :return: the instances
+    """
+    context_cache(info, ("listed", model_cls)).update(
+        dict.fromkeys(instance.pk for instance in instances)
+    )
+    return instances
+
+
+def listed_ids(info: Info, model_cls: Type[models.Model]) -> List:
+    """
+    the ids of the instances listed in the request
+    :param info:
+    :param model_cls:
+    :return:
+    """
+    return list(context_cache(info, ("listed", model_cls)))
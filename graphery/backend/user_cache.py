@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpRequest
+from django.utils.crypto import constant_time_compare
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
+
+from .models import User, cached_user_key
+
+__all__ = ["get_cached_user", "CachedUserMiddleware"]
+
+
+def get_cached_user(request: HttpRequest) -> User | AnonymousUser:
+    """
+    the user of the session of a request, which is read from the cache
+    instead of the database when it's there. the users are dropped
+    from the cache when they are saved, by the UserBridge or anything else,
+    and when their groups or permissions change
+    :param request:
+    :return:
+    """
+    try:
+        user_id = auth._get_user_session_key(request)
+        backend_path = request.session[auth.BACKEND_SESSION_KEY]
+    except KeyError:
+        return AnonymousUser()
+
+    if backend_path not in settings.AUTHENTICATION_BACKENDS:
+        return AnonymousUser()
+
+    key = cached_user_key(user_id)
+    user = cache.get(key)
+    if user is not None:
+        # the session is checked like django does, so the sessions
+        # are still ended when the password changes
+        session_hash = request.session.get(auth.HASH_SESSION_KEY)
+        if session_hash and constant_time_compare(
+            session_hash, user.get_session_auth_hash()
+        ):
+            return user
+        cache.delete(key)
+
+    user = auth.get_user(request)
+    if user.is_authenticated:
+        cache.set(key, user, settings.GRAPHERY_USER_CACHE_TIMEOUT)
+    return user
+
+
+class CachedUserMiddleware(MiddlewareMixin):
+    """
+    replace the user set by the AuthenticationMiddleware, before it is loaded,
+    with one read from the cache, so a request with a session doesn't query
+    the users table. it goes right after the AuthenticationMiddleware
+    """
+
+    def process_request(self, request: HttpRequest) -> None:
+        request.user = SimpleLazyObject(lambda: get_cached_user(request))
@@ -1,3 +1,92 @@
-from django.shortcuts import render
+import hmac
 
-# Create your views here.
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.views.decorators.http import condition, require_GET
+from strawberry.django.views import AsyncGraphQLView, GraphQLView
+
+from .models import UserRoles
+from .profiling import prometheus_text
+
+
+class _LazySchemaMixin:
+    """
+    take the schema when a request is handled instead of when the urls
+    are loaded, since the system checks of every management command
+    load the urls and would build the schema for nothing
+    """
+
+    def __init__(self, **kwargs):
+        from .schema import get_schema
+
+        super().__init__(schema=get_schema(), **kwargs)
+
+    def _create_response(self, response_data, sub_response):
+        from .schema import get_schema_hash
+
+        response = super()._create_response(response_data, sub_response)
+        response[settings.GRAPHERY_SCHEMA_HASH_HEADER] = get_schema_hash()
+        return response
+
+
+class GrapheryGraphQLView(_LazySchemaMixin, GraphQLView):
+    pass
+
+
+class GrapheryAsyncGraphQLView(_LazySchemaMixin, AsyncGraphQLView):
+    pass
+
+
+def _can_read_metrics(request: HttpRequest) -> bool:
+    user = request.user
+    if user.is_authenticated and user.role >= UserRoles.ADMINISTRATOR:
+        return True
+
+    token = settings.GRAPHERY_PROFILING_METRICS_TOKEN
+    scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+    return (
+        token is not None
+        and scheme.lower() == "bearer"
+        and hmac.compare_digest(credentials.encode(), token.encode())
+    )
+
+
+@require_GET
+def metrics(request: HttpRequest) -> HttpResponse:
+    """
+    the profiled operations in the Prometheus text format, for admins
+    and for scrapers with the GRAPHERY_PROFILING_METRICS_TOKEN bearer token
+    """
+    if not _can_read_metrics(request):
+        return HttpResponse(status=403)
+
+    return HttpResponse(
+        prometheus_text(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+def _schema_etag(request: HttpRequest) -> str:
+    from .schema import get_schema_hash
+
+    return get_schema_hash()
+
+
+@require_GET
+@condition(etag_func=_schema_etag)
+def schema_hash(request: HttpRequest) -> HttpResponse:
+    """
+    the hash of the schema, so clients can tell whether their generated types
+    and stored queries are stale without an introspection query
+    """
+    return JsonResponse({"hash": _schema_etag(request)})
+
+
+@require_GET
+@condition(etag_func=_schema_etag)
+def schema_sdl(request: HttpRequest) -> HttpResponse:
+    """
+    the SDL of the schema, which is only sent again when the hash changed
+    """
+    from .schema import get_schema_sdl
+
+    return HttpResponse(get_schema_sdl(), content_type="text/plain; charset=utf-8")
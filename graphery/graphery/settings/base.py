@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/4.0/ref/settings/
 
 from pathlib import Path
 
+from backend.hashers import password_hashers
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -59,6 +61,8 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "backend.user_cache.CachedUserMiddleware",
+    "backend.profiling.ProfilingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -138,6 +142,22 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "backend.User"
 
+# the hasher of new passwords: argon2, scrypt or pbkdf2. argon2 needs argon2-cffi
+# and falls back to scrypt. the passwords of the other hashers or costs are hashed
+# again when the users log in. `manage.py benchmark_hashers` times the costs below
+GRAPHERY_PASSWORD_HASHER = "argon2"
+GRAPHERY_ARGON2_TIME_COST = 2
+GRAPHERY_ARGON2_MEMORY_COST = 19456
+GRAPHERY_ARGON2_PARALLELISM = 1
+GRAPHERY_SCRYPT_WORK_FACTOR = 2**14
+GRAPHERY_PBKDF2_ITERATIONS = 320000
+# set it again with the hasher after changing GRAPHERY_PASSWORD_HASHER
+PASSWORD_HASHERS = password_hashers(GRAPHERY_PASSWORD_HASHER)
+
+# the users of the sessions are cached for this many seconds,
+# and dropped from the cache when they are saved
+GRAPHERY_USER_CACHE_TIMEOUT = 60 * 5
+
 CSRF_COOKIE_SAMESITE = "strict"
 
 CORS_ALLOW_METHODS = [
@@ -154,10 +174,19 @@ USER_IS_VERIFIED_DEFAULT = True
 USER_EMAIL_OPT_IN_DEFAULT = True
 
 GRAPHERY_EXECUTOR_URL = "http://localhost:7590/run"
+# the seconds a run in the executor may take, for the users and the precompute
+GRAPHERY_EXECUTOR_TIMEOUT = 60
 GRAPHERY_EXECUTOR_ACCESS_INTERVAL_SECONDS = 5
 
 G_RECAPTCHA_SECRET = None
 G_RECAPTCHA_ON = False
+G_RECAPTCHA_URL = "https://www.google.com/recaptcha/api/siteverify"
+# the tokens are verified in these threads, with a pooled connection to google
+GRAPHERY_RECAPTCHA_WORKERS = 4
+GRAPHERY_RECAPTCHA_TIMEOUT = 5
+# a token seen in this many seconds fails without asking google again,
+# which rejects the tokens it has seen anyway
+GRAPHERY_RECAPTCHA_TOKEN_TTL = 120
 
 CACHES = {
     "default": {
@@ -167,3 +196,84 @@ CACHES = {
 }
 
 SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+
+# every n-th version in a version chain keeps its full text,
+# the others are stored as deltas against the newer version
+GRAPHERY_VERSION_SNAPSHOT_INTERVAL = 10
+GRAPHERY_VERSION_CACHE_SIZE = 512
+
+# the number of threads running mutations for the async endpoint
+GRAPHERY_BRIDGE_MAX_WORKERS = 4
+
+# the number of processes formatting code with black, 0 formats in the server process
+GRAPHERY_CODE_FORMAT_WORKERS = 2
+GRAPHERY_CODE_FORMAT_TIMEOUT = 10
+# formatted code is cached by the hash of the code
+GRAPHERY_CODE_FORMAT_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+# graphs with at least this many nodes are stored in the compact binary form
+GRAPHERY_GRAPH_COMPACT_MIN_NODES = 1000
+# the most bytes a compact graph decompresses to
+GRAPHERY_GRAPH_COMPACT_MAX_SIZE = 64 * 1024 * 1024
+
+# layouts and level of detail variants of graphs are computed in jobs
+# each size is the number of cells on a side of a grid which clusters the nodes
+GRAPHERY_GRAPH_LAYOUT_GRID_SIZES = (64, 16, 4)
+GRAPHERY_GRAPH_LAYOUT_MIN_CLUSTERED_NODES = 200
+GRAPHERY_GRAPH_LAYOUT_PRECISION = 4
+
+# the steps of execution results are stored in segments of this many steps
+GRAPHERY_EXECUTION_RESULT_SEGMENT_STEPS = 100
+# the most steps one query can read from an execution result
+GRAPHERY_EXECUTION_RESULT_MAX_STEPS = 1000
+
+# execution results of every code and graph pair are computed in the background
+# when codes, graphs or their bindings change, which needs a running executor
+GRAPHERY_EXECUTION_PRECOMPUTE = False
+# the most executions running at the same time
+GRAPHERY_EXECUTION_PRECOMPUTE_WORKERS = 4
+
+# the number of processes `manage.py run_jobs` runs jobs in
+GRAPHERY_JOB_WORKERS = 2
+GRAPHERY_JOB_MAX_ATTEMPTS = 3
+# failed jobs are retried after this many seconds, doubled on every attempt
+GRAPHERY_JOB_RETRY_DELAY = 30
+# running jobs are queued again when they are not finished in this many seconds
+GRAPHERY_JOB_TIMEOUT = 60 * 30
+# the seconds a worker waits before looking for jobs again when there is none
+GRAPHERY_JOB_POLL_INTERVAL = 1
+# done and failed jobs are deleted this many seconds after they finish
+GRAPHERY_JOB_RETENTION = 60 * 60 * 24 * 7
+
+# the languages read when a text is not in the requested language, before English.
+# a regional language falls back to its base language, like PT_BR to PT, by itself
+GRAPHERY_LANG_FALLBACKS = {
+    "ZH_HANT": ("ZH_HANS",),
+    "ZH_HANS": ("ZH_HANT",),
+}
+
+# profile the GraphQL operations, which are read through the operationStats field
+# and the /metrics endpoint
+GRAPHERY_PROFILING = False
+# a query run this many times in an operation is logged as a likely N+1 query
+GRAPHERY_PROFILING_DUPLICATE_QUERIES = 5
+# the most operation names kept apart, the others are counted as <other>
+GRAPHERY_PROFILING_MAX_OPERATIONS = 200
+# the bearer token for scraping /metrics, which admins can read without it
+GRAPHERY_PROFILING_METRICS_TOKEN = None
+
+# the response header with the hash of the schema, added to the GraphQL responses
+GRAPHERY_SCHEMA_HASH_HEADER = "X-Graphery-Schema-Hash"
+
+# the operations are rejected before they run when they are deeper, cost more
+# or have more aliases than these. a list field costs the objects it could return,
+# which is its limit argument or GRAPHERY_QUERY_LIST_SIZE, times their selections
+GRAPHERY_QUERY_MAX_DEPTH = 10
+GRAPHERY_QUERY_MAX_COST = 5000
+GRAPHERY_QUERY_MAX_ALIASES = 20
+GRAPHERY_QUERY_LIST_SIZE = 20
+# the page sizes are counted between 0 and this, the most any field returns
+GRAPHERY_QUERY_MAX_PAGE_SIZE = GRAPHERY_EXECUTION_RESULT_MAX_STEPS
+# answer introspection queries, whose results are cached in every process
+GRAPHERY_GRAPHQL_INTROSPECTION = True
+GRAPHERY_INTROSPECTION_CACHE_SIZE = 16
@@ -18,5 +18,7 @@ DATABASES = {
         "PASSWORD": "graphery",
         "HOST": "127.0.0.1",
         "PORT": "5432",
+        # keep connections open, so that the mutation threads reuse them
+        "CONN_MAX_AGE": 60,
     }
 }
@@ -16,13 +16,19 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path
 
-from strawberry.django.views import AsyncGraphQLView, GraphQLView
-
-# noinspection PyUnresolvedReferences
-from backend.schema import schema
+from backend.views import (
+    GrapheryAsyncGraphQLView,
+    GrapheryGraphQLView,
+    metrics,
+    schema_hash,
+    schema_sdl,
+)
 
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("graphql", AsyncGraphQLView.as_view(schema=schema)),
-    path("graphql/sync", GraphQLView.as_view(schema=schema)),
+    path("graphql", GrapheryAsyncGraphQLView.as_view()),
+    path("graphql/sync", GrapheryGraphQLView.as_view()),
+    path("graphql/schema", schema_sdl),
+    path("graphql/schema/hash", schema_hash),
+    path("metrics", metrics),
 ]
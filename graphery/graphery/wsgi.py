@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "graphery.settings.prod")
 
 application = get_wsgi_application()
+
+# the schema is built when the server loads the application, before the workers
+# are forked when the app is preloaded, instead of on the first request
+from backend.schema import get_schema  # noqa: E402
+
+get_schema()